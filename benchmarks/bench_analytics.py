@@ -0,0 +1,73 @@
+"""
+Request analytics benchmark: Python loops over request dicts vs numpy columns
+
+Fills a request log with N requests spread over 20 routes and builds the
+same post-test report (p50/p95/p99 per route and counts per status) both
+ways.
+    
+    python benchmarks/bench_analytics.py [entries]
+"""
+
+import random
+import sys
+import time
+
+from harness import percentile, print_table
+
+from src.core.analytics import RequestAnalytics, columns_from_logger
+from src.core.request_logger import RequestLogger
+from src.core.route_index import route_id
+
+ENTRIES = int(sys.argv[1]) if len(sys.argv) > 1 else 1000000
+ROUTES = [f"GET /api/items/{i}" for i in range(20)]
+
+def fill() -> RequestLogger:
+    rng = random.Random(7)
+    logger = RequestLogger(ENTRIES)
+    ids = [route_id(label) for label in ROUTES]
+    now = time.time() - ENTRIES / 1000
+    for i in range(ENTRIES):
+        r = i % len(ROUTES)
+        logger.log_request("GET", f"http://127.0.0.1:8000/api/items/{r}", None,
+                           500 if rng.random() < 0.01 else 200, rng.lognormvariate(-6, 0.5),
+                           now + i / 1000, route_id=ids[r])
+    return logger
+
+def python_report(logger: RequestLogger, labels) -> dict:
+    """The report as it had to be built before: dicts and per-route lists"""
+    by_route = {}
+    by_status = {}
+    for request in logger.get_recent_requests():
+        route = labels.get(request["url"].rsplit("/", 1)[-1])
+        by_route.setdefault(route, []).append(request["response_time_ms"])
+        by_status[request["status_code"]] = by_status.get(request["status_code"], 0) + 1
+    report = {}
+    for route, latencies in by_route.items():
+        latencies.sort()
+        report[route] = [percentile(latencies, p) for p in (50, 95, 99)]
+    return {"by_route": report, "by_status": by_status}
+
+def main():
+    logger = fill()
+    labels = {label.rsplit("/", 1)[-1]: label for label in ROUTES}
+    route_labels = {route_id(label): label for label in ROUTES}
+    
+    start = time.perf_counter()
+    python_report(logger, labels)
+    python_s = time.perf_counter() - start
+    
+    start = time.perf_counter()
+    columns = columns_from_logger(logger)
+    snapshot_s = time.perf_counter() - start
+    analytics = RequestAnalytics(columns, route_labels)
+    analytics.by_route()
+    analytics.by_status()
+    numpy_s = time.perf_counter() - start
+    
+    print_table(f"Per-route report over {ENTRIES} requests", [
+        ("python dicts", {"snapshot_ms": 0.0, "total_ms": python_s * 1000}),
+        ("numpy columns", {"snapshot_ms": snapshot_s * 1000, "total_ms": numpy_s * 1000}),
+    ])
+
+if __name__ == "__main__":
+    main()
\ No newline at end of file
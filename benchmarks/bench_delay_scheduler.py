@@ -0,0 +1,56 @@
+"""
+Concurrent simulated-delay benchmark: asyncio.sleep vs DelayScheduler
+
+Parks N requests on a lognormal latency model at once and measures the
+wall time to schedule and wake them all, how late the wakeups are and how
+many timers the event loop had to carry.
+    
+    python benchmarks/bench_delay_scheduler.py
+"""
+
+import asyncio
+import random
+import time
+
+from harness import percentile, print_table
+
+from src.core.latency import DelayScheduler, LognormalLatency
+
+COUNTS = [1000, 10000, 50000]
+
+async def run(count: int, sleep) -> dict:
+    rng = random.Random(7)
+    model = LognormalLatency(median_ms=50, sigma=0.5, max_ms=500)
+    delays = [model.sample(rng) for _ in range(count)]
+    loop = asyncio.get_running_loop()
+    lateness = []
+    
+    async def delayed(delay: float):
+        due = loop.time() + delay
+        await sleep(delay)
+        lateness.append(loop.time() - due)
+    
+    start = time.perf_counter()
+    tasks = [asyncio.ensure_future(delayed(delay)) for delay in delays]
+    await asyncio.sleep(0)
+    timers = len(loop._scheduled)
+    await asyncio.gather(*tasks)
+    elapsed = time.perf_counter() - start
+    
+    lateness.sort()
+    return {
+        "wall_ms": elapsed * 1000,
+        "loop_timers": timers,
+        "late_p50_ms": percentile(lateness, 50) * 1000,
+        "late_p99_ms": percentile(lateness, 99) * 1000,
+    }
+
+async def main():
+    rows = []
+    for count in COUNTS:
+        rows.append((f"asyncio.sleep x{count}", await run(count, asyncio.sleep)))
+        rows.append((f"DelayScheduler x{count}", await run(count, DelayScheduler().sleep)))
+    print_table("Concurrent simulated delays", rows)
+
+if __name__ == "__main__":
+    asyncio.run(main())
\ No newline at end of file
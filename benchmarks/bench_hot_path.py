@@ -0,0 +1,206 @@
+"""
+Hot-path micro-benchmark suite with per-machine baselines
+
+Times each piece a request goes through in isolation, then whole requests
+through the in-process ASGI client, and compares every component with the
+baseline saved for this machine. Exits with status 1 when a component got
+slower than its baseline by more than the threshold, so performance work
+can be accepted (and regressions caught) with numbers.
+
+Each component runs ROUNDS rounds after a warm-up round; the median round
+is reported, which keeps one noisy round from failing the check.
+    
+    python benchmarks/bench_hot_path.py                  # compare with this machine's baseline
+    python benchmarks/bench_hot_path.py --save           # record or refresh the baseline
+    python benchmarks/bench_hot_path.py --only pipeline --only end_to_end --threshold 0.3
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import platform
+import re
+import statistics
+import sys
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, List, NamedTuple
+
+from harness import asgi_request, get_template, make_config, print_table
+
+from src.core.middleware import RequestPipelineMiddleware
+from src.core.route_index import TemplateDispatcher
+from src.core.server_engine import ServerEngine
+
+BASELINE_DIR = Path(__file__).resolve().parent / "baselines"
+# Allowed slowdown before a component fails, as a fraction of its baseline
+THRESHOLD = 0.2
+ROUNDS = 5
+TEMPLATE = "Instagram API"
+PATH = "/api/instagram/posts"
+WEBSOCKET_CLIENTS = 10
+
+class Component(NamedTuple):
+    """One timed piece of the request path"""
+    name: str
+    fn: Callable[[], Any]
+    iterations: int
+    is_async: bool
+
+class FakeWebSocket:
+    """A client on a fast local link: sends complete immediately"""
+    
+    async def send(self, message: Dict[str, Any]):
+        pass
+
+async def empty_app(scope, receive, send):
+    """Innermost app for timing the pipeline on its own"""
+    await send({"type": "http.response.start", "status": 200, "headers": []})
+    await send({"type": "http.response.body", "body": b""})
+
+def build_components(engine: ServerEngine) -> List[Component]:
+    """Every hot-path component, smallest first"""
+    config = engine.config
+    logger = engine.request_logger
+    monitor = engine.performance_monitor
+    route = engine.route_table.match("GET", PATH)[0]
+    headers = [(b"host", b"127.0.0.1:8000"), (b"user-agent", b"bench")]
+    url = f"http://127.0.0.1:8000{PATH}"
+    pipeline = RequestPipelineMiddleware(empty_app, engine)
+    dispatcher = TemplateDispatcher(engine)
+    message = {"user": "bench", "message": "hello", "timestamp": "2024-01-01T00:00:00"}
+    
+    async def broadcast():
+        await engine._broadcast_message(message)
+        # Let the writer tasks deliver it, so delivery is part of the cost
+        await asyncio.sleep(0)
+    
+    def http(app):
+        async def request():
+            status, _ = await asgi_request(app, "GET", PATH)
+            assert status == 200, status
+        return request
+    
+    return [
+        Component("config.get", lambda: config.get("simulation.error_rate", 0.0), 100000, False),
+        Component("config.settings", lambda: config.settings.error_rate, 100000, False),
+        Component("monitor.update_request_count", monitor.update_request_count, 100000, False),
+        Component("monitor.record_request",
+                  lambda: monitor.record_request(route.label, "GET", 200, 0.001, time.time()), 50000, False),
+        Component("request_logger.log_request",
+                  lambda: logger.log_request("GET", url, headers, 200, 0.001, time.time(),
+                                             route_id=route.route_id), 50000, False),
+        # Reference point: the in-process client and an app that does nothing
+        Component("asgi_client", http(empty_app), 5000, True),
+        Component("pipeline", http(pipeline), 5000, True),
+        Component("template_dispatch", http(dispatcher), 5000, True),
+        Component(f"broadcast_{WEBSOCKET_CLIENTS}_clients", broadcast, 5000, True),
+        Component("end_to_end", http(engine.app), 5000, True),
+    ]
+
+async def time_component(component: Component, rounds: int) -> float:
+    """Median microseconds per call over ``rounds`` rounds, after one warm-up round"""
+    results = []
+    for round_number in range(rounds + 1):
+        start = time.perf_counter()
+        if component.is_async:
+            for _ in range(component.iterations):
+                await component.fn()
+        else:
+            fn = component.fn
+            for _ in range(component.iterations):
+                fn()
+        if round_number:
+            results.append((time.perf_counter() - start) / component.iterations * 1e6)
+    return statistics.median(results)
+
+def machine_id() -> str:
+    """Baseline file name: host, architecture and Python version"""
+    name = f"{platform.node()}-{platform.system()}-{platform.machine()}-py{sys.version_info[0]}{sys.version_info[1]}"
+    return re.sub(r"[^A-Za-z0-9_.-]", "_", name.lower())
+
+def machine_info() -> Dict[str, Any]:
+    return {
+        "node": platform.node(),
+        "platform": platform.platform(),
+        "processor": platform.processor(),
+        "cpu_count": os.cpu_count(),
+        "python": platform.python_version()
+    }
+
+def compare(results: Dict[str, float], baseline: Dict[str, float], threshold: float) -> List[str]:
+    """Print results against the baseline; returns the components that regressed"""
+    rows = []
+    regressed = []
+    for name, now in results.items():
+        base = baseline.get(name)
+        if base is None:
+            rows.append((name, {"baseline_us": float("nan"), "now_us": now, "change_pct": float("nan")}))
+            continue
+        change = (now - base) / base
+        rows.append((name, {"baseline_us": base, "now_us": now, "change_pct": change * 100}))
+        if change > threshold:
+            regressed.append(f"{name}: {base:.2f} -> {now:.2f} us ({change * 100:+.1f}%)")
+    print_table(f"Hot path vs baseline (fails above {threshold * 100:+.0f}%)", rows)
+    return regressed
+
+async def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--save", action="store_true", help="Save the results as this machine's baseline")
+    parser.add_argument("--threshold", type=float, default=THRESHOLD,
+                        help=f"Allowed slowdown as a fraction (default: {THRESHOLD})")
+    parser.add_argument("--rounds", type=int, default=ROUNDS, help=f"Measured rounds (default: {ROUNDS})")
+    parser.add_argument("--only", action="append", default=[], metavar="NAME",
+                        help="Run only components whose name starts with NAME; repeatable")
+    parser.add_argument("--baseline-dir", default=str(BASELINE_DIR),
+                        help="Directory of per-machine baselines (default: benchmarks/baselines)")
+    args = parser.parse_args()
+    
+    config = make_config()
+    config.update({"simulation.enable_cors": False, "storage.journal_enabled": False}, save=False)
+    engine = ServerEngine(config)
+    engine.load_template(TEMPLATE, get_template(TEMPLATE))
+    for _ in range(WEBSOCKET_CLIENTS):
+        engine.websocket_hub.add(FakeWebSocket())
+    
+    components = [c for c in build_components(engine)
+                  if not args.only or any(c.name.startswith(prefix) for prefix in args.only)]
+    results = {}
+    for component in components:
+        results[component.name] = round(await time_component(component, args.rounds), 3)
+    
+    path = Path(args.baseline_dir) / f"{machine_id()}.json"
+    baseline = json.loads(path.read_text(encoding="utf-8")) if path.exists() else None
+    
+    regressed = []
+    if baseline is not None:
+        regressed = compare(results, baseline["results"], args.threshold)
+    else:
+        print_table("Hot path (us per call)", [(name, {"us": us}) for name, us in results.items()])
+        print(f"\nNo baseline for this machine yet ({path.name}); run with --save to record one")
+    
+    if args.save:
+        # Keep components that were not run this time
+        saved = dict(baseline["results"]) if baseline is not None else {}
+        saved.update(results)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(json.dumps({
+            "machine": machine_info(),
+            "saved_at": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "results": saved
+        }, indent=2), encoding="utf-8")
+        print(f"\nSaved baseline to {path}")
+        return 0
+    
+    if regressed:
+        print("\nFAIL: slower than baseline beyond the threshold:")
+        for line in regressed:
+            print(f"  {line}")
+        return 1
+    if baseline is not None:
+        print("\nOK")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(asyncio.run(main()))
\ No newline at end of file
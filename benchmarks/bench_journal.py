@@ -0,0 +1,69 @@
+"""
+Request journal benchmark: request-path cost and writer throughput
+
+Serves the same template routes with the journal off and on (writer thread
+running), then measures the raw append cost and how fast the writer turns a
+queued backlog into segment files.
+    
+    python benchmarks/bench_journal.py
+"""
+
+import asyncio
+import tempfile
+import time
+
+from harness import asgi_request, bench_async, bench_sync, get_template, make_config, print_table
+
+from src.core.journal import RequestJournal
+from src.core.server_engine import ServerEngine
+
+ITERATIONS = 5000
+PATHS = ["/api/instagram/users/me", "/api/instagram/posts"]
+BACKLOG = 100000
+
+async def pipeline_rows():
+    config = make_config()
+    config.update({
+        "simulation.enable_cors": False,
+        "storage.data_directory": tempfile.mkdtemp(prefix="simuserver_bench_")
+    }, save=False)
+    engine = ServerEngine(config)
+    engine.load_template("Instagram API", get_template("Instagram API"))
+    counter = {"i": 0}
+    
+    async def request():
+        counter["i"] += 1
+        status, _ = await asgi_request(engine.app, "GET", PATHS[counter["i"] % len(PATHS)])
+        assert status == 200, status
+    
+    rows = []
+    await bench_async(request, ITERATIONS // 10)  # warm-up
+    rows.append(("journal off", await bench_async(request, ITERATIONS)))
+    engine.open_journal()
+    rows.append(("journal on", await bench_async(request, ITERATIONS)))
+    engine.close_journal()
+    return rows
+
+def writer_rows():
+    headers = [(b"host", b"127.0.0.1:8000"), (b"accept", b"application/json")]
+    journal = RequestJournal(tempfile.mkdtemp(prefix="simuserver_bench_"), capacity=BACKLOG)
+    now = time.time()
+    append_s = bench_sync(
+        lambda: journal.append("GET", "http://127.0.0.1:8000/api/items/1", headers, 200, 0.0012, now),
+        BACKLOG
+    )
+    start = time.perf_counter()
+    journal.close()
+    elapsed = time.perf_counter() - start
+    return [("append + write", {
+        "append_us": append_s * 1e6,
+        "written_per_second": journal.written / elapsed,
+        "MB": journal.bytes_written / 1e6
+    })]
+
+def main():
+    print_table("Request pipeline", asyncio.run(pipeline_rows()))
+    print_table(f"Journal writer ({BACKLOG} queued requests)", writer_rows())
+
+if __name__ == "__main__":
+    main()
\ No newline at end of file
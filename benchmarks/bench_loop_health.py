@@ -0,0 +1,49 @@
+"""
+Event-loop health overhead benchmark
+
+Times in-process requests with and without the heartbeat, watchdog and GC
+timing attached, and the cost the GC callback adds to a young collection.
+    
+    python benchmarks/bench_loop_health.py
+"""
+
+import asyncio
+import gc
+
+from harness import asgi_request, bench_async, bench_sync, get_template, make_config, print_table
+
+from src.core.loop_health import LoopHealth
+from src.core.server_engine import ServerEngine
+
+PATH = "/api/instagram/posts"
+
+async def main():
+    config = make_config()
+    config.update({"storage.journal_enabled": False}, save=False)
+    engine = ServerEngine(config)
+    engine.load_template("Instagram API", get_template("Instagram API"))
+    loop_health = engine.performance_monitor.loop_health
+    
+    async def request():
+        status, _ = await asgi_request(engine.app, "GET", PATH)
+        assert status == 200, status
+    
+    await request()
+    rows = [("detached", await bench_async(request, 5000))]
+    loop_health.attach()
+    rows.append(("attached", await bench_async(request, 5000)))
+    loop_health.detach()
+    print_table(f"GET {PATH}", rows)
+    
+    plain = bench_sync(lambda: gc.collect(0), 20000)
+    timed = LoopHealth()
+    gc.callbacks.append(timed._on_gc)
+    with_callback = bench_sync(lambda: gc.collect(0), 20000)
+    gc.callbacks.remove(timed._on_gc)
+    print_table("Young collection", [
+        ("no callback", {"us": plain * 1e6}),
+        ("timed", {"us": with_callback * 1e6}),
+    ])
+
+if __name__ == "__main__":
+    asyncio.run(main())
\ No newline at end of file
@@ -0,0 +1,53 @@
+"""
+/metrics rendering benchmark: full render, incremental render and cached scrape
+
+Fills the monitor with 50 routes of traffic, then times a render after every
+route changed, a render after one route changed, and a scrape served from
+the render cache.
+    
+    python benchmarks/bench_metrics.py
+"""
+
+import random
+import time
+
+from harness import bench_sync, make_config, print_table
+
+from src.core.prometheus import MetricsExporter
+from src.core.server_engine import ServerEngine
+
+ROUTES = [f"GET /api/items/{i}/{{id}}" for i in range(50)]
+
+def main():
+    engine = ServerEngine(make_config())
+    monitor = engine.performance_monitor
+    rng = random.Random(7)
+    now = time.time()
+    for i in range(100000):
+        monitor.record_request(ROUTES[i % len(ROUTES)], "GET", 200 if i % 50 else 503,
+                               rng.lognormvariate(-6, 0.8), now)
+    
+    def touch_all():
+        for route in ROUTES:
+            monitor.record_request(route, "GET", 200, 0.001, now)
+    
+    uncached = MetricsExporter(engine, cache_seconds=0)
+    
+    def full():
+        touch_all()
+        uncached.render()
+    
+    def incremental():
+        monitor.record_request(ROUTES[0], "GET", 200, 0.001, now)
+        uncached.render()
+    
+    cached = MetricsExporter(engine)
+    cached.render()
+    print_table(f"Render /metrics ({len(ROUTES)} routes, {len(cached.render())} bytes)", [
+        ("all routes changed", {"us": bench_sync(full, 200) * 1e6}),
+        ("one route changed", {"us": bench_sync(incremental, 200) * 1e6}),
+        ("cached scrape", {"us": bench_sync(cached.render, 2000) * 1e6}),
+    ])
+
+if __name__ == "__main__":
+    main()
\ No newline at end of file
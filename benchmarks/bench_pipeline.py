@@ -0,0 +1,78 @@
+"""
+Request pipeline benchmark: BaseHTTPMiddleware logger vs pure ASGI middleware
+
+Both apps serve the same Instagram template routes and do the same logging
+and metrics work; only the middleware implementation differs.
+    
+    python benchmarks/bench_pipeline.py
+"""
+
+import asyncio
+import time
+from datetime import datetime
+
+from harness import asgi_request, bench_async, get_template, make_config, print_table
+
+from fastapi import FastAPI, Request
+
+from src.core.server_engine import ServerEngine
+
+ITERATIONS = 5000
+PATHS = ["/api/instagram/users/me", "/api/instagram/posts"]
+
+def build_legacy_app(engine: ServerEngine) -> FastAPI:
+    """Rebuild the previous @app.middleware("http") pipeline on the engine's routes"""
+    app = FastAPI()
+    app.router.routes = engine.app.router.routes
+    
+    @app.middleware("http")
+    async def log_requests(request: Request, call_next):
+        start_time = time.time()
+        
+        delay = engine.config.get("simulation.default_delay_ms", 0)
+        if delay > 0:
+            await asyncio.sleep(delay / 1000)
+        
+        error_rate = engine.config.get("simulation.error_rate", 0.0)
+        if error_rate > 0 and time.time() % 1 < error_rate:
+            raise RuntimeError("error injection is disabled for this benchmark")
+        
+        response = await call_next(request)
+        process_time = time.time() - start_time
+        
+        engine.request_logger.log_request(
+            method=request.method,
+            url=str(request.url),
+            headers=dict(request.headers),
+            status_code=response.status_code,
+            response_time=process_time,
+            timestamp=datetime.now()
+        )
+        engine.performance_monitor.update_request_count()
+        return response
+    
+    return app
+
+async def main():
+    config = make_config()
+    config.update({"simulation.enable_cors": False}, save=False)
+    engine = ServerEngine(config)
+    engine.load_template("Instagram API", get_template("Instagram API"))
+    legacy_app = build_legacy_app(engine)
+    
+    rows = []
+    for name, app in (("BaseHTTPMiddleware", legacy_app), ("pure ASGI", engine.app)):
+        counter = {"i": 0}
+        
+        async def request(app=app, counter=counter):
+            counter["i"] += 1
+            status, _ = await asgi_request(app, "GET", PATHS[counter["i"] % len(PATHS)])
+            assert status == 200, status
+        
+        await bench_async(request, ITERATIONS // 10)  # warm-up
+        rows.append((name, await bench_async(request, ITERATIONS)))
+    
+    print_table("Request pipeline (same template routes)", rows)
+
+if __name__ == "__main__":
+    asyncio.run(main())
\ No newline at end of file
@@ -0,0 +1,84 @@
+"""
+Request rate accounting benchmark: lost increments and per-request cost
+
+Counts requests from one thread while another thread reads the rate the way
+the monitor loop does, first with the old read-and-reset counter, then with
+the per-second RateCounter, and compares each total with the true count.
+The interpreter's switch interval is shortened to make thread switches
+inside the read-and-reset as likely as possible; how many increments it
+loses depends on the interpreter (a build without the GIL loses the most).
+    
+    python benchmarks/bench_rate_counter.py
+"""
+
+import sys
+import threading
+import time
+
+from harness import bench_sync, print_table
+
+from src.core.rate_counter import RateCounter
+
+REQUESTS = 2000000
+
+class ResetCounter:
+    """The previous scheme: an int the monitor thread reads and zeroes"""
+    
+    def __init__(self):
+        self.count = 0
+        self.seen = 0
+    
+    def add(self, now: float):
+        self.count += 1
+    
+    def read(self):
+        self.seen += self.count
+        self.count = 0
+
+def run(counter, read):
+    """Count REQUESTS on this thread while another thread keeps reading"""
+    stop = threading.Event()
+    
+    def reader():
+        while not stop.is_set():
+            read()
+    
+    interval = sys.getswitchinterval()
+    sys.setswitchinterval(1e-6)
+    thread = threading.Thread(target=reader)
+    thread.start()
+    add = counter.add
+    for _ in range(REQUESTS):
+        add(time.time())
+    stop.set()
+    thread.join()
+    sys.setswitchinterval(interval)
+
+def main():
+    old = ResetCounter()
+    run(old, old.read)
+    old.read()
+    
+    new = RateCounter()
+    run(new, lambda: new.rates(time.time()))
+    
+    print_table(f"Totals after {REQUESTS} requests with a concurrent reader", [
+        ("read-and-reset int", {"counted": old.seen, "lost": REQUESTS - old.seen}),
+        ("RateCounter", {"counted": new.total, "lost": REQUESTS - new.total}),
+    ])
+    
+    counter = RateCounter()
+    plain = {"count": 0}
+    
+    def increment():
+        plain["count"] += 1
+    
+    now = time.time()
+    print_table("Cost", [
+        ("int increment", {"us": bench_sync(increment, 500000) * 1e6}),
+        ("RateCounter.add", {"us": bench_sync(lambda: counter.add(time.time()), 500000) * 1e6}),
+        ("rates 1s/10s/60s", {"us": bench_sync(lambda: counter.rates(now), 20000) * 1e6}),
+    ])
+
+if __name__ == "__main__":
+    main()
\ No newline at end of file
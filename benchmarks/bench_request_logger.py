@@ -0,0 +1,102 @@
+"""
+Request log storage benchmark: dict-per-request deque vs compact ring
+
+Measures append cost with few and many request headers, and the memory
+held by a full log. The legacy logger is measured at a smaller size and
+scaled up, since a million dicts would take gigabytes.
+    
+    python benchmarks/bench_request_logger.py [entries]
+"""
+
+import sys
+import time
+import tracemalloc
+from collections import deque
+from datetime import datetime
+
+from harness import bench_sync, print_table
+
+from src.core.request_logger import RequestLogger
+
+ENTRIES = int(sys.argv[1]) if len(sys.argv) > 1 else 1000000
+LEGACY_ENTRIES = min(ENTRIES, 100000)
+APPENDS = 100000
+
+class LegacyRequestLogger:
+    """The previous logger: one dict, ISO timestamp and header copy per request"""
+    
+    def __init__(self, max_entries: int):
+        self.requests = deque(maxlen=max_entries)
+        self.total_requests = 0
+    
+    def log_request(self, method, url, headers, status_code, response_time, timestamp):
+        self.requests.append({
+            "id": self.total_requests + 1,
+            "method": method,
+            "url": url,
+            "headers": {key.decode("latin-1"): value.decode("latin-1") for key, value in headers},
+            "status_code": status_code,
+            "response_time_ms": round(response_time * 1000, 2),
+            "timestamp": timestamp.isoformat(),
+            "request_body": None,
+            "response_body": None
+        })
+        self.total_requests += 1
+
+def make_headers(count: int):
+    return [(b"host", b"127.0.0.1:8000")] + [
+        (f"x-header-{i}".encode(), f"value-{i}-abcdefgh".encode()) for i in range(count - 1)
+    ]
+
+def append_cost(logger, headers, legacy: bool) -> float:
+    urls = [f"http://127.0.0.1:8000/api/items/{i % 500}" for i in range(1000)]
+    counter = {"i": 0}
+    
+    def append():
+        i = counter["i"] = counter["i"] + 1
+        if legacy:
+            logger.log_request("GET", urls[i % 1000], headers, 200, 0.0012, datetime.now())
+        else:
+            logger.log_request("GET", urls[i % 1000], headers, 200, 0.0012, time.time())
+    
+    return bench_sync(append, APPENDS)
+
+def fill_memory(make_logger, count: int, legacy: bool) -> float:
+    """Bytes allocated to create a logger and hold count entries"""
+    headers = make_headers(8)
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    logger = make_logger(count)
+    for i in range(count):
+        # Fresh header lists, as each ASGI request has its own
+        request_headers = list(headers)
+        url = f"http://127.0.0.1:8000/api/items/{i % 500}"
+        if legacy:
+            logger.log_request("GET", url, request_headers, 200, 0.0012, datetime.now())
+        else:
+            logger.log_request("GET", url, request_headers, 200, 0.0012, time.time())
+    used = tracemalloc.get_traced_memory()[0] - before
+    tracemalloc.stop()
+    return used
+
+def main():
+    rows = []
+    for header_count in (4, 40):
+        headers = make_headers(header_count)
+        rows.append((f"legacy, {header_count} headers", {
+            "append_us": append_cost(LegacyRequestLogger(10000), headers, True) * 1e6
+        }))
+        rows.append((f"ring, {header_count} headers", {
+            "append_us": append_cost(RequestLogger(10000), headers, False) * 1e6
+        }))
+    print_table("Append cost", rows)
+    
+    legacy_bytes = fill_memory(LegacyRequestLogger, LEGACY_ENTRIES, True)
+    ring_bytes = fill_memory(RequestLogger, ENTRIES, False)
+    print_table(f"Memory for {ENTRIES} entries", [
+        ("legacy (scaled)", {"MB": legacy_bytes * ENTRIES / LEGACY_ENTRIES / 1e6}),
+        ("ring", {"MB": ring_bytes / 1e6}),
+    ])
+
+if __name__ == "__main__":
+    main()
\ No newline at end of file
@@ -0,0 +1,63 @@
+"""
+Before/after benchmark for pre-serialized template responses
+
+Compares building a JSONResponse per request against replaying a
+CompiledResponse for the Instagram posts feed.
+    
+    python benchmarks/bench_response_cache.py
+"""
+
+import asyncio
+
+from harness import asgi_request, bench_async, get_template, make_config, make_scope, print_table
+
+from starlette.responses import JSONResponse
+
+from src.core.response_cache import PrecompiledResponse, ResponseCache
+
+ITERATIONS = 20000
+
+async def _null_receive():
+    return {"type": "http.request", "body": b"", "more_body": False}
+
+async def _null_send(message):
+    pass
+
+async def main():
+    template = get_template("Instagram API")
+    route = next(r for r in template["routes"]
+                 if r["method"] == "GET" and r["path"] == "/api/instagram/posts")
+    payload = route["response"]
+    scope = make_scope("GET", "/api/instagram/posts")
+    
+    cache = ResponseCache()
+    compiled = cache.compile(payload)
+    
+    async def before():
+        await JSONResponse(content=payload)(scope, _null_receive, _null_send)
+    
+    async def after():
+        await PrecompiledResponse(compiled)(scope, _null_receive, _null_send)
+    
+    rows = [
+        ("JSONResponse per request", await bench_async(before, ITERATIONS)),
+        ("PrecompiledResponse", await bench_async(after, ITERATIONS)),
+    ]
+    
+    # End to end through the engine's FastAPI app
+    from src.core.server_engine import ServerEngine
+    
+    engine = ServerEngine(make_config())
+    engine.load_template("Instagram API", template)
+    
+    async def engine_request():
+        await asgi_request(engine.app, "GET", "/api/instagram/posts")
+    
+    rows.append(("ServerEngine /posts", await bench_async(engine_request, ITERATIONS // 4)))
+    print_table("Template response encoding", rows)
+    
+    speedup = rows[0][1]["mean_us"] / rows[1][1]["mean_us"]
+    print(f"\nSpeedup: {speedup:.1f}x  cache stats: {cache.get_stats()}")
+
+if __name__ == "__main__":
+    asyncio.run(main())
\ No newline at end of file
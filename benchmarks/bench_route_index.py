@@ -0,0 +1,102 @@
+"""
+Template dispatch scaling benchmark: RouteIndex trie vs Starlette route scan
+
+Generates N template routes (half literal, half with a {param} segment) and
+measures per-request dispatch cost at 10, 1k and 10k routes. The trie should
+stay flat while the linear regex scan grows with N.
+    
+    python benchmarks/bench_route_index.py
+"""
+
+import asyncio
+import random
+
+from harness import asgi_request, bench_async, bench_sync, make_config, print_table
+
+from starlette.routing import Match, Route
+
+from src.core.route_index import RouteIndex, TemplateRoute
+from src.core.response_cache import ResponseCache
+from src.core.server_engine import ServerEngine
+
+SIZES = [10, 1000, 10000]
+LOOKUPS = 2000
+
+def generate_routes(count: int):
+    """Generate (method, pattern, concrete path) triples"""
+    routes = []
+    for i in range(count):
+        if i % 2:
+            routes.append(("GET", f"/api/gen{i}/items/{{item_id}}", f"/api/gen{i}/items/{i * 7}"))
+        else:
+            routes.append(("POST", f"/api/gen{i}/items", f"/api/gen{i}/items"))
+    return routes
+
+async def _endpoint(request):
+    return None
+
+def starlette_lookup(routes, scope) -> None:
+    """What Starlette's router does: scan routes in order until a full match"""
+    for route in routes:
+        match, _ = route.matches(scope)
+        if match == Match.FULL:
+            return
+
+async def main():
+    rng = random.Random(42)
+    cache = ResponseCache()
+    compiled = cache.compile({"ok": True})
+    rows = []
+    
+    for size in SIZES:
+        routes = generate_routes(size)
+        samples = [rng.choice(routes) for _ in range(LOOKUPS)]
+        
+        index = RouteIndex()
+        for method, pattern, _ in routes:
+            index.add(TemplateRoute(method, pattern, compiled))
+        
+        starlette_routes = [Route(pattern, _endpoint, methods=[method]) for method, pattern, _ in routes]
+        scopes = [{"type": "http", "method": method, "path": path} for method, _, path in samples]
+        
+        lookups = [(method, path) for method, _, path in samples]
+        position = {"trie": 0, "scan": 0}
+        
+        def trie_lookup():
+            position["trie"] += 1
+            index.match(*lookups[position["trie"] % LOOKUPS])
+        
+        def scan_lookup():
+            position["scan"] += 1
+            starlette_lookup(starlette_routes, scopes[position["scan"] % LOOKUPS])
+        
+        trie_s = bench_sync(trie_lookup, LOOKUPS)
+        # The scan is linear in N, so keep its total runtime bounded
+        scan_s = bench_sync(scan_lookup, max(20, LOOKUPS // max(1, size // 100)))
+        
+        engine = ServerEngine(make_config())
+        engine.load_template("Generated", {"routes": [
+            {"method": method, "path": pattern, "response": {"ok": True}}
+            for method, pattern, _ in routes
+        ]})
+        counter = {"i": 0}
+        
+        async def request():
+            method, _, path = samples[counter["i"] % LOOKUPS]
+            counter["i"] += 1
+            status, _ = await asgi_request(engine.app, method, path)
+            assert status == 200, status
+        
+        e2e = await bench_async(request, LOOKUPS // 2)
+        
+        rows.append((f"{size} routes", {
+            "trie_match_us": trie_s * 1e6,
+            "starlette_scan_us": scan_s * 1e6,
+            "engine_e2e_us": e2e["mean_us"],
+            "engine_p99_us": e2e["p99_us"],
+        }))
+    
+    print_table("Template dispatch cost per request", rows)
+
+if __name__ == "__main__":
+    asyncio.run(main())
\ No newline at end of file
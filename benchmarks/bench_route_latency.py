@@ -0,0 +1,47 @@
+"""
+Per-route latency histogram benchmark: recording cost and report cost
+
+Records lognormal latencies over 50 routes, then times the per-request cost
+against the bare request counter and the cost of building the 10s/1m/run
+report that /api/status and the performance tab ask for.
+    
+    python benchmarks/bench_route_latency.py
+"""
+
+import random
+import time
+
+from harness import bench_sync, print_table
+
+from src.core.histogram import RouteLatency
+
+RECORDS = 500000
+ROUTES = [f"GET /api/items/{i}/{{id}}" for i in range(50)]
+
+def main():
+    rng = random.Random(7)
+    samples = [(ROUTES[i % len(ROUTES)], rng.lognormvariate(-6, 0.8)) for i in range(10000)]
+    latency = RouteLatency()
+    counter = {"i": 0, "count": 0}
+    
+    def count():
+        counter["count"] += 1
+    
+    def record():
+        i = counter["i"] = (counter["i"] + 1) % len(samples)
+        route, seconds = samples[i]
+        latency.record(route, seconds, time.time())
+    
+    rows = [
+        ("counter only", {"us_per_request": bench_sync(count, RECORDS) * 1e6}),
+        ("route histogram", {"us_per_request": bench_sync(record, RECORDS) * 1e6}),
+    ]
+    print_table("Recording", rows)
+    
+    now = time.time()
+    print_table(f"Report over {len(ROUTES)} routes", [
+        ("summary", {"ms": bench_sync(lambda: latency.summary(now), 20) * 1000}),
+    ])
+
+if __name__ == "__main__":
+    main()
\ No newline at end of file
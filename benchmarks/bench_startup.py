@@ -0,0 +1,59 @@
+"""
+Cold-start budget check for the headless entry point
+
+Imports the headless CLI and builds a ServerEngine in a fresh interpreter,
+fails if that takes longer than the budget or pulls in any GUI module.
+    
+    python benchmarks/bench_startup.py [--budget 0.75]
+"""
+
+import argparse
+import json
+import subprocess
+import sys
+
+from harness import ROOT
+
+GUI_MODULES = ("tkinter", "customtkinter", "matplotlib", "PIL")
+
+PROBE = """
+import json, sys, time
+start = time.perf_counter()
+from src.cli import build_parser
+from src.core.config import Config
+from src.core.server_engine import ServerEngine
+ServerEngine(Config("__startup_probe__.json"))
+elapsed = time.perf_counter() - start
+loaded = sorted(m for m in sys.modules if m.split(".")[0] in {gui} or m.startswith("src.gui"))
+print(json.dumps({{"seconds": elapsed, "gui_modules": loaded}}))
+"""
+
+def probe() -> dict:
+    """Measure one cold start in a fresh interpreter"""
+    code = PROBE.format(gui=set(GUI_MODULES))
+    output = subprocess.run([sys.executable, "-c", code], cwd=ROOT,
+                            capture_output=True, text=True, check=True).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--budget", type=float, default=0.75, help="Maximum cold start in seconds")
+    parser.add_argument("--runs", type=int, default=5, help="Number of cold starts (best is reported)")
+    args = parser.parse_args()
+    
+    results = [probe() for _ in range(args.runs)]
+    best = min(result["seconds"] for result in results)
+    gui_modules = sorted(set(m for result in results for m in result["gui_modules"]))
+    
+    print(f"Headless cold start: best {best * 1000:.0f} ms over {args.runs} runs (budget {args.budget * 1000:.0f} ms)")
+    if gui_modules:
+        print(f"FAIL: GUI modules imported: {', '.join(gui_modules)}")
+        return 1
+    if best > args.budget:
+        print("FAIL: startup budget exceeded")
+        return 1
+    print("OK")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
\ No newline at end of file
@@ -0,0 +1,47 @@
+"""
+/api/status benchmark: inline psutil sampling vs the monitor's snapshot
+
+Times the system metrics part of a status call the old way (cpu_percent,
+virtual_memory and disk_usage on the calling thread) against formatting the
+monitor thread's latest snapshot, then times whole /api/status requests
+through the ASGI app.
+    
+    python benchmarks/bench_status.py
+"""
+
+import asyncio
+
+import psutil
+
+from harness import asgi_request, bench_async, bench_sync, make_config, print_table
+
+from src.core.server_engine import ServerEngine
+
+def inline_sample():
+    """What get_current_metrics used to do on every call"""
+    psutil.cpu_percent(interval=None)
+    psutil.virtual_memory()
+    psutil.disk_usage("/")
+    psutil.cpu_count()
+
+async def main():
+    engine = ServerEngine(make_config())
+    monitor = engine.performance_monitor
+    monitor.start()
+    try:
+        print_table("System metrics per status call", [
+            ("inline psutil", {"us": bench_sync(inline_sample, 5000) * 1e6}),
+            ("snapshot", {"us": bench_sync(monitor.get_current_metrics, 5000) * 1e6}),
+        ])
+        
+        async def status():
+            code, _ = await asgi_request(engine.app, "GET", "/api/status")
+            assert code == 200, code
+        
+        await status()
+        print_table("GET /api/status", [("snapshot", await bench_async(status, 2000))])
+    finally:
+        monitor.stop()
+
+if __name__ == "__main__":
+    asyncio.run(main())
\ No newline at end of file
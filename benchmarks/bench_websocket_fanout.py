@@ -0,0 +1,140 @@
+"""
+WebSocket fan-out benchmark: one slow client among many fast ones
+
+Broadcasts chat messages on a fixed schedule to FAST_CLIENTS clients whose
+sends complete at once plus one client whose every send takes SLOW_SEND,
+and reports how long the fast clients waited for each message, counted from
+when it was due. First with the previous broadcast, which awaited each
+client's send in turn and encoded the message per recipient, then with the
+WebSocketHub under each overflow policy.
+    
+    python benchmarks/bench_websocket_fanout.py
+"""
+
+import asyncio
+import json
+import time
+from typing import Any, Dict, List
+
+from harness import bench_async, make_config, percentile, print_table
+
+from src.core.websocket_hub import OVERFLOW_POLICIES, WebSocketHub
+
+FAST_CLIENTS = 50
+SLOW_SEND = 0.02
+MESSAGES = 100
+INTERVAL = 0.01
+QUEUE_SIZE = 20
+
+class FakeWebSocket:
+    """Stands in for Starlette's WebSocket; records when each message arrives"""
+    
+    def __init__(self, dues: List[float], send_time: float = 0.0):
+        self.dues = dues
+        self.send_time = send_time
+        self.latencies: List[float] = []
+        self.closed = False
+    
+    async def send(self, message: Dict[str, Any]):
+        if self.send_time:
+            await asyncio.sleep(self.send_time)
+        # Messages arrive in order, so the n-th one was due at dues[n]
+        self.latencies.append(time.perf_counter() - self.dues[len(self.latencies)])
+    
+    async def send_text(self, data: str):
+        await self.send({"type": "websocket.send", "text": data})
+    
+    async def send_json(self, data: Any):
+        await self.send_text(json.dumps(data, separators=(",", ":"), ensure_ascii=False))
+    
+    async def close(self, code: int = 1000):
+        self.closed = True
+
+async def legacy_broadcast(connections: List[FakeWebSocket], message: Any):
+    """The previous _broadcast_message: one client after another"""
+    for websocket in connections:
+        if isinstance(message, str):
+            await websocket.send_text(message)
+        else:
+            await websocket.send_json(message)
+
+def make_clients(dues: List[float]):
+    slow = FakeWebSocket(dues, SLOW_SEND)
+    fast = [FakeWebSocket(dues) for _ in range(FAST_CLIENTS)]
+    return slow, fast
+
+async def run(broadcast, dues: List[float]):
+    """Broadcast MESSAGES on schedule, filling ``dues`` as they fall due"""
+    start = time.perf_counter()
+    for n in range(MESSAGES):
+        due = start + n * INTERVAL
+        delay = due - time.perf_counter()
+        if delay > 0:
+            await asyncio.sleep(delay)
+        dues.append(due)
+        await broadcast({"user": "bench", "message": f"message {n}", "timestamp": "2024-01-01T00:00:00"})
+
+def result(slow: FakeWebSocket, fast: List[FakeWebSocket], **extra) -> Dict[str, float]:
+    latencies = sorted(latency for client in fast for latency in client.latencies)
+    return {
+        "fast_p50_ms": percentile(latencies, 50) * 1000,
+        "fast_p99_ms": percentile(latencies, 99) * 1000,
+        "fast_max_ms": latencies[-1] * 1000,
+        "slow_received": len(slow.latencies),
+        **extra
+    }
+
+async def run_legacy() -> Dict[str, float]:
+    dues: List[float] = []
+    slow, fast = make_clients(dues)
+    # The slow client joined first, so everyone else waits behind it
+    connections = [slow] + fast
+    await run(lambda message: legacy_broadcast(connections, message), dues)
+    return result(slow, fast, dropped=0, disconnected=0)
+
+async def run_hub(policy: str) -> Dict[str, float]:
+    config = make_config()
+    config.update({"server.websocket_queue_size": QUEUE_SIZE, "server.websocket_overflow": policy}, save=False)
+    hub = WebSocketHub(config)
+    dues: List[float] = []
+    slow, fast = make_clients(dues)
+    clients = [hub.add(websocket) for websocket in [slow] + fast]
+    
+    async def broadcast(message):
+        hub.broadcast(message)
+    
+    await run(broadcast, dues)
+    # Give the fast clients' writers time to finish, then stop everything
+    while any(len(websocket.latencies) < MESSAGES for websocket in fast):
+        await asyncio.sleep(INTERVAL)
+    await asyncio.sleep(SLOW_SEND * 2)
+    for client in clients:
+        hub.remove(client)
+    return result(slow, fast, dropped=hub.dropped, disconnected=hub.disconnected)
+
+async def main():
+    rows = [("sequential (previous)", await run_legacy())]
+    for policy in OVERFLOW_POLICIES:
+        rows.append((f"hub, {policy}", await run_hub(policy)))
+    print_table(f"{MESSAGES} broadcasts, {FAST_CLIENTS} fast clients + one taking "
+                f"{SLOW_SEND * 1000:g} ms per send, queue size {QUEUE_SIZE}", rows)
+    
+    # Cost of a broadcast itself with fast clients only
+    dues = [0.0] * 10000
+    connections = [FakeWebSocket(dues) for _ in range(FAST_CLIENTS)]
+    hub = WebSocketHub(make_config())
+    for websocket in [FakeWebSocket(dues) for _ in range(FAST_CLIENTS)]:
+        hub.add(websocket)
+    message = {"user": "bench", "message": "hello", "timestamp": "2024-01-01T00:00:00"}
+    
+    async def hub_broadcast():
+        hub.broadcast(message)
+        await asyncio.sleep(0)
+    
+    print_table(f"Broadcast to {FAST_CLIENTS} fast clients, including delivery", [
+        ("sequential (previous)", await bench_async(lambda: legacy_broadcast(connections, message), 2000)),
+        ("hub", await bench_async(hub_broadcast, 2000)),
+    ])
+
+if __name__ == "__main__":
+    asyncio.run(main())
\ No newline at end of file
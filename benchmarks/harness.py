@@ -0,0 +1,116 @@
+"""
+Shared helpers for SimuServer benchmarks
+"""
+
+import asyncio
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+ROOT = Path(__file__).resolve().parent.parent
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+def get_template(template_name: str) -> Dict[str, Any]:
+    """Load a built-in template without touching the presets directory"""
+    from src.templates.template_manager import TemplateManager
+    
+    manager = TemplateManager(tempfile.mkdtemp(prefix="simuserver_bench_"))
+    template_data = manager.get_template(template_name)
+    if template_data is None:
+        raise ValueError(f"Unknown template: {template_name}")
+    return template_data
+
+def make_config():
+    """Create a Config backed by a throwaway file"""
+    from src.core.config import Config
+    
+    return Config(str(Path(tempfile.mkdtemp(prefix="simuserver_bench_")) / "config.json"))
+
+def make_scope(method: str, path: str, headers: Optional[List[Tuple[bytes, bytes]]] = None) -> Dict[str, Any]:
+    """Build a minimal HTTP scope for driving an ASGI app in-process"""
+    path, _, query = path.partition("?")
+    return {
+        "type": "http",
+        "asgi": {"version": "3.0"},
+        "http_version": "1.1",
+        "method": method,
+        "scheme": "http",
+        "path": path,
+        "raw_path": path.encode("latin-1"),
+        "root_path": "",
+        "query_string": query.encode("latin-1"),
+        "headers": [(b"host", b"127.0.0.1:8000")] + list(headers or []),
+        "client": ("127.0.0.1", 50000),
+        "server": ("127.0.0.1", 8000),
+    }
+
+async def asgi_request(app, method: str, path: str,
+                       headers: Optional[List[Tuple[bytes, bytes]]] = None,
+                       body: bytes = b"") -> Tuple[int, bytes]:
+    """Send one request through an ASGI app and return (status, body)"""
+    scope = make_scope(method, path, headers)
+    sent = False
+    status = 0
+    chunks = []
+    
+    async def receive():
+        nonlocal sent
+        if not sent:
+            sent = True
+            return {"type": "http.request", "body": body, "more_body": False}
+        await asyncio.sleep(3600)
+        return {"type": "http.disconnect"}
+    
+    async def send(message):
+        nonlocal status
+        if message["type"] == "http.response.start":
+            status = message["status"]
+        elif message["type"] == "http.response.body":
+            chunks.append(message.get("body", b""))
+    
+    await app(scope, receive, send)
+    return status, b"".join(chunks)
+
+def percentile(sorted_values: List[float], pct: float) -> float:
+    """Nearest-rank percentile of an already sorted list"""
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, max(0, int(round(pct / 100 * len(sorted_values))) - 1))
+    return sorted_values[index]
+
+def bench_sync(fn: Callable[[], Any], iterations: int) -> float:
+    """Run fn iterations times and return seconds per call"""
+    start = time.perf_counter()
+    for _ in range(iterations):
+        fn()
+    return (time.perf_counter() - start) / iterations
+
+async def bench_async(fn: Callable[[], Any], iterations: int) -> Dict[str, float]:
+    """Await fn iterations times and return throughput and latency percentiles"""
+    latencies = []
+    start = time.perf_counter()
+    for _ in range(iterations):
+        t0 = time.perf_counter()
+        await fn()
+        latencies.append(time.perf_counter() - t0)
+    elapsed = time.perf_counter() - start
+    latencies.sort()
+    return {
+        "requests_per_second": iterations / elapsed,
+        "mean_us": elapsed / iterations * 1e6,
+        "p50_us": percentile(latencies, 50) * 1e6,
+        "p99_us": percentile(latencies, 99) * 1e6,
+    }
+
+def print_table(title: str, rows: List[Tuple[str, Dict[str, float]]]):
+    """Print benchmark results as an aligned table"""
+    print(f"\n{title}")
+    if not rows:
+        return
+    columns = list(rows[0][1].keys())
+    print(f"{'case':<28}" + "".join(f"{c:>22}" for c in columns))
+    for name, values in rows:
+        print(f"{name:<28}" + "".join(f"{values[c]:>22.2f}" for c in columns))
\ No newline at end of file
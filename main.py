@@ -3,32 +3,41 @@
 SimuServer - Universal API Simulation Tool
 Created by: QumPlus
 A lightweight, modern server simulator for testing and development
+
+Usage:
+    python main.py                          # GUI
+    python main.py serve -t "Instagram API" # headless server
 """
 
 import sys
-import os
-import threading
-import customtkinter as ctk
-from pathlib import Path
-
-# Add src directory to path for imports
-sys.path.append(os.path.join(os.path.dirname(__file__), 'src'))
 
-from gui.main_window import SimuServerGUI
-from core.config import Config
+from src.cli import build_parser, run
 
-def main():
-    """Main entry point for SimuServer"""
+def run_gui(config_file: str):
+    """Launch the customtkinter GUI"""
+    # GUI dependencies are only imported here so headless runs never load Tk
+    import customtkinter as ctk
+    
+    from src.core.config import Config
+    from src.gui.main_window import SimuServerGUI
+    
     # Set appearance mode and theme
     ctk.set_appearance_mode("dark")
     ctk.set_default_color_theme("blue")
     
     # Initialize configuration
-    config = Config()
+    config = Config(config_file)
     
     # Create and run the GUI
     app = SimuServerGUI(config)
     app.run()
 
+def main():
+    """Main entry point for SimuServer"""
+    args = build_parser().parse_args()
+    if args.command:
+        sys.exit(run(args))
+    run_gui(args.config)
+
 if __name__ == "__main__":
     main() 
\ No newline at end of file
@@ -0,0 +1,305 @@
+"""
+Headless command-line entry point for SimuServer
+
+Starts ServerEngine straight from Config without importing anything GUI
+related, so it runs on CI runners and in containers without a display.
+"""
+
+import argparse
+import json
+import os
+import signal
+import socket
+import subprocess
+import sys
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+from urllib.parse import urlsplit
+
+from .core.config import Config
+
+MAIN_SCRIPT = Path(__file__).resolve().parent.parent / "main.py"
+LOCAL_HOSTS = ("127.0.0.1", "localhost", "::1")
+# Seconds to wait for a server started by ``bench`` to answer /health
+SERVER_START_TIMEOUT = 30.0
+
+def build_parser() -> argparse.ArgumentParser:
+    """Build the command-line parser"""
+    parser = argparse.ArgumentParser(
+        prog="simuserver",
+        description="SimuServer - Universal API Simulation Tool"
+    )
+    parser.add_argument("--config", default="simuserver_config.json",
+                        help="Configuration file (default: simuserver_config.json)")
+    
+    subparsers = parser.add_subparsers(dest="command")
+    
+    serve = subparsers.add_parser("serve", help="Run the server without the GUI")
+    serve.add_argument("-t", "--template", action="append", default=[], metavar="NAME_OR_PATH",
+                       help="Template to preload, by name (e.g. 'Instagram API') or JSON file path; repeatable")
+    serve.add_argument("--host", help="Override server.host")
+    serve.add_argument("--port", type=int, help="Override server.port")
+    serve.add_argument("--workers", type=int, help="Override server.workers")
+    serve.add_argument("--seed", type=int, help="Override simulation.seed for replayable latency and faults")
+    serve.add_argument("-q", "--quiet", action="store_true", help="Do not print server log messages")
+    
+    bench = subparsers.add_parser("bench", help="Load test a local SimuServer with the routes of its templates")
+    bench.add_argument("-t", "--template", action="append", default=[], metavar="NAME_OR_PATH",
+                       help="Template whose routes to drive; loaded into a server started for the run; repeatable")
+    bench.add_argument("--url", help="Drive an already running local instance (e.g. http://127.0.0.1:8000) "
+                                     "instead; its active templates are discovered from /api/status")
+    bench.add_argument("-c", "--connections", type=int, default=16, help="Keep-alive connections (default: 16)")
+    bench.add_argument("--rate", type=float,
+                       help="Open loop: send this many requests per second on a fixed schedule and count "
+                            "latency from when each was due (default: closed loop)")
+    bench.add_argument("-d", "--duration", type=float, default=10.0, help="Measured seconds (default: 10)")
+    bench.add_argument("--warmup", type=float, default=2.0, help="Unmeasured seconds first (default: 2)")
+    bench.add_argument("--timeout", type=float, default=10.0, help="Per-request timeout in seconds (default: 10)")
+    bench.add_argument("--workers", type=int, help="server.workers of the started server")
+    bench.add_argument("--seed", type=int, help="simulation.seed of the started server")
+    bench.add_argument("-o", "--output", help="Save the JSON report here instead of printing it")
+    bench.add_argument("--compare", nargs="+", metavar="REPORT",
+                       help="Compare the run with a saved report; given two reports, compare them without running")
+    
+    return parser
+
+def resolve_template(spec: str) -> Tuple[str, Dict[str, Any]]:
+    """Resolve a template given by file path or by name"""
+    path = Path(spec)
+    if path.suffix.lower() == ".json" or path.is_file():
+        with open(path, 'r') as f:
+            template_data = json.load(f)
+        return template_data.get("name", path.stem), template_data
+    
+    from .templates.template_manager import TemplateManager
+    
+    template_data = TemplateManager().get_template(spec)
+    if template_data is None:
+        raise ValueError(f"Unknown template: {spec}")
+    return spec, template_data
+
+def load_templates(engine, specs: List[str]):
+    """Load templates given by file path or by name into an engine"""
+    for spec in specs:
+        template_name, template_data = resolve_template(spec)
+        if not engine.load_template(template_name, template_data):
+            raise ValueError(f"Could not load template {template_name!r}")
+
+def serve(config: Config, templates: List[str], quiet: bool = False) -> int:
+    """Run the server in the foreground until interrupted"""
+    from .core.server_engine import ServerEngine
+    
+    log_callback = None if quiet else (lambda message: print(message, flush=True))
+    engine = ServerEngine(config, log_callback)
+    if quiet:
+        engine.server_log_level = "warning"
+    
+    load_templates(engine, templates)
+    
+    if not engine.start_server():
+        print("Failed to start server")
+        return 1
+    
+    status = 0
+    try:
+        while engine.is_running:
+            time.sleep(0.5)
+            # The server thread (or every worker) exits on its own if e.g. the port is taken
+            if not engine.is_serving():
+                print("Server stopped unexpectedly")
+                status = 1
+                break
+    except KeyboardInterrupt:
+        pass
+    finally:
+        engine.stop_server()
+    
+    return status
+
+def local_address(url: str) -> Tuple[str, int]:
+    """Host and port of a URL, which must point at this machine"""
+    parts = urlsplit(url if "://" in url else f"http://{url}")
+    if parts.scheme != "http" or parts.hostname not in LOCAL_HOSTS:
+        raise ValueError(f"bench only drives a local http:// instance, not {url}")
+    return parts.hostname, parts.port or 80
+
+def fetch_active_templates(host: str, port: int) -> List[str]:
+    """Names of the templates a running server has loaded"""
+    import urllib.request
+    
+    with urllib.request.urlopen(f"http://{host}:{port}/api/status", timeout=5) as response:
+        return json.load(response).get("active_templates", [])
+
+def start_local_server(args: argparse.Namespace, port: int) -> subprocess.Popen:
+    """Start a headless server in a child process and wait until it answers"""
+    import urllib.request
+    
+    command = [sys.executable, str(MAIN_SCRIPT), "--config", args.config, "serve", "-q",
+               "--host", "127.0.0.1", "--port", str(port)]
+    for spec in args.template:
+        command += ["-t", spec]
+    if args.workers:
+        command += ["--workers", str(args.workers)]
+    if args.seed is not None:
+        command += ["--seed", str(args.seed)]
+    process = subprocess.Popen(command)
+    
+    deadline = time.time() + SERVER_START_TIMEOUT
+    while time.time() < deadline:
+        if process.poll() is not None:
+            raise OSError(f"Server exited with code {process.returncode}")
+        try:
+            with urllib.request.urlopen(f"http://127.0.0.1:{port}/health", timeout=1):
+                return process
+        except OSError:
+            time.sleep(0.2)
+    stop_local_server(process)
+    raise OSError(f"Server did not answer on port {port} within {SERVER_START_TIMEOUT:.0f}s")
+
+def stop_local_server(process: subprocess.Popen):
+    """Stop a server started by start_local_server, letting it shut its workers down"""
+    if process.poll() is None:
+        if os.name == "nt":
+            process.terminate()
+        else:
+            process.send_signal(signal.SIGINT)
+    try:
+        process.wait(timeout=10)
+    except subprocess.TimeoutExpired:
+        process.kill()
+        process.wait()
+
+def free_port() -> int:
+    """A TCP port on 127.0.0.1 that nothing is listening on"""
+    with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+def load_report(path: str) -> Dict[str, Any]:
+    """Read a report saved by ``bench --output``"""
+    with open(path, 'r') as f:
+        return json.load(f)
+
+def print_summary(report: Dict[str, Any], file=sys.stdout):
+    """One-screen summary of a bench report"""
+    latency = report["latency_ms"]
+    mode = "closed loop" if report["mode"] == "closed" else f"open loop at {report['rate']:g} req/s"
+    print(f"{report['target']}: {mode}, {report['connections']} connections, {report['routes']} routes", file=file)
+    print(f"  {report['requests']} requests in {report['elapsed']:.1f}s = {report['throughput_rps']:.1f} req/s, "
+          f"{report['error_rate'] * 100:.2f}% errors", file=file)
+    print("  latency ms: " + "  ".join(f"{name} {value:.2f}" for name, value in latency.items()), file=file)
+    if report["max_backlog"]:
+        print(f"  up to {report['max_backlog']} requests waited for a free connection", file=file)
+    if report["client_cpu_percent"] >= 90:
+        print(f"  note: the load generator used {report['client_cpu_percent']:.0f}% of a CPU, "
+              f"so throughput is a lower bound for the server", file=file)
+
+def print_comparison(base: Dict[str, Any], new: Dict[str, Any], file=sys.stdout):
+    """Table of metric changes between two bench reports"""
+    from .core.load_generator import compare_reports
+    
+    shape = ("mode", "connections", "rate", "routes")
+    if any(base.get(key) != new.get(key) for key in shape):
+        print("note: the runs used different load shapes: "
+              + ", ".join(f"{key} {base.get(key)} -> {new.get(key)}" for key in shape if base.get(key) != new.get(key)),
+              file=file)
+    print(f"{'metric':<18}{'base':>14}{'new':>14}{'change':>10}", file=file)
+    for row in compare_reports(base, new):
+        change = f"{row['change_percent']:+.1f}%" if row["change_percent"] is not None else "-"
+        verdict = {True: "  better", False: "  worse", None: ""}[row["better"]]
+        print(f"{row['metric']:<18}{row['base']:>14g}{row['new']:>14g}{change:>10}{verdict}", file=file)
+
+def bench(config: Config, args: argparse.Namespace) -> int:
+    """Load test a local server and report throughput, latency and errors as JSON"""
+    compare = args.compare or []
+    if len(compare) > 2:
+        raise ValueError("--compare takes one saved report, or two to compare without running")
+    if len(compare) == 2:
+        print_comparison(load_report(compare[0]), load_report(compare[1]))
+        return 0
+    
+    import asyncio
+    
+    from .core.load_generator import LoadGenerator, build_targets, routes_from_engine
+    from .core.server_engine import ServerEngine
+    
+    # Routes come from an engine holding the same templates as the server under test
+    engine = ServerEngine(config)
+    load_templates(engine, args.template)
+    
+    process = None
+    if args.url:
+        host, port = local_address(args.url)
+        for template_name in fetch_active_templates(host, port):
+            if template_name not in engine.active_templates:
+                try:
+                    engine.load_template(*resolve_template(template_name))
+                except ValueError:
+                    print(f"Skipping template {template_name!r}: pass its JSON file with -t", file=sys.stderr)
+    elif not args.template:
+        raise ValueError("Give the templates to load with -t, or the --url of a running local server")
+    else:
+        host, port = "127.0.0.1", free_port()
+        process = start_local_server(args, port)
+    
+    try:
+        targets = build_targets(routes_from_engine(engine), host, port)
+        generator = LoadGenerator(host, port, targets, args.connections, args.rate, args.timeout)
+        report = asyncio.run(generator.run(args.duration, args.warmup))
+    finally:
+        if process is not None:
+            stop_local_server(process)
+    
+    print_summary(report, file=sys.stderr)
+    if compare:
+        print_comparison(load_report(compare[0]), report, file=sys.stderr)
+    
+    text = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, 'w') as f:
+            f.write(text)
+    else:
+        print(text)
+    return 0
+
+def run(args: argparse.Namespace) -> int:
+    """Run a parsed headless command"""
+    config = Config(args.config)
+    
+    if args.command == "bench":
+        try:
+            return bench(config, args)
+        except (OSError, ValueError) as e:
+            print(f"Error: {e}")
+            return 1
+    
+    # Command-line overrides apply to this run only and are not saved
+    overrides = {}
+    if args.host:
+        overrides["server.host"] = args.host
+    if args.port:
+        overrides["server.port"] = args.port
+    if args.workers:
+        overrides["server.workers"] = args.workers
+    if args.seed is not None:
+        overrides["simulation.seed"] = args.seed
+    config.update(overrides, save=False)
+    
+    try:
+        return serve(config, args.template, quiet=args.quiet)
+    except (OSError, ValueError) as e:
+        print(f"Error: {e}")
+        return 1
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Headless entry point"""
+    parser = build_parser()
+    args = parser.parse_args(argv)
+    if not args.command:
+        parser.print_help()
+        return 2
+    return run(args)
+
+if __name__ == "__main__":
+    raise SystemExit(main())
\ No newline at end of file
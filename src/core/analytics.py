@@ -0,0 +1,223 @@
+"""
+Vectorized request analytics for SimuServer
+"""
+
+from typing import Dict, List, Any, NamedTuple, Optional, Sequence
+
+import numpy as np
+
+from .histogram import UNMATCHED_ROUTE, WINDOWS
+from .worker_pool import BUCKET, HEADER, RATE_BUCKETS, URL_BYTES
+
+PERCENTILES = (50, 95, 99)
+# Upper bound on timeline buckets; the width grows to stay under it
+MAX_BUCKETS = 10000
+
+# numpy view of a worker_pool.RECORD, field for field
+SHARED_RECORD = np.dtype([
+    ("timestamp", "<f8"),
+    ("response_time", "<f4"),
+    ("delay", "<f4"),
+    ("status", "<u2"),
+    ("route", "<u4"),
+    ("method", "S8"),
+    ("url", f"S{URL_BYTES}"),
+])
+
+class RequestColumns(NamedTuple):
+    """Columnar snapshot of the request log, oldest first"""
+    timestamps: np.ndarray
+    routes: np.ndarray
+    methods: np.ndarray
+    statuses: np.ndarray
+    latencies: np.ndarray
+    method_names: Sequence[str]
+
+def columns_from_logger(logger) -> RequestColumns:
+    """Copy the visible part of a RequestLogger's ring into numpy columns
+    
+    The ring's arrays are viewed without copying and gathered into
+    chronological order; entries the writer overwrote during the copy are
+    dropped, as in ``RequestLogger._read``.
+    """
+    visible = logger._visible_range(logger.total_requests)
+    slots = np.arange(visible.start, visible.stop) % logger.ring_size
+    
+    def column(values, dtype) -> np.ndarray:
+        return np.frombuffer(values, dtype=dtype)[slots]
+    
+    columns = [
+        column(logger._timestamps, np.float64),
+        column(logger._routes, np.uint32),
+        column(logger._methods, np.uint8),
+        column(logger._statuses, np.uint16),
+        column(logger._response_times, np.float32),
+    ]
+    overwritten = logger._visible_range(logger.total_requests).start - visible.start
+    if overwritten > 0:
+        columns = [values[overwritten:] for values in columns]
+    return RequestColumns(*columns, method_names=list(logger._method_names))
+
+def columns_from_shared(metrics) -> RequestColumns:
+    """Merge the shared-memory rings of all pool workers into numpy columns"""
+    ring_offset = HEADER.size + RATE_BUCKETS * BUCKET.size
+    parts = []
+    for worker_id in range(metrics.workers):
+        base = metrics._slot(worker_id)
+        index = HEADER.unpack_from(metrics.shm.buf, base)[1]
+        ring = np.frombuffer(metrics.shm.buf, dtype=SHARED_RECORD, count=metrics.ring_size,
+                             offset=base + ring_offset)
+        first = max(0, index - metrics.ring_size + 1)
+        records = ring[np.arange(first, index) % metrics.ring_size]
+        overwritten = HEADER.unpack_from(metrics.shm.buf, base)[1] - metrics.ring_size + 1 - first
+        parts.append(records[max(0, overwritten):])
+    
+    records = np.concatenate(parts) if parts else np.empty(0, dtype=SHARED_RECORD)
+    records = records[np.argsort(records["timestamp"], kind="stable")]
+    method_names, methods = np.unique(records["method"], return_inverse=True)
+    return RequestColumns(
+        records["timestamp"].copy(),
+        records["route"].copy(),
+        methods.astype(np.uint8),
+        records["status"].copy(),
+        records["response_time"].copy(),
+        method_names=[name.decode("ascii", "replace") for name in method_names]
+    )
+
+class RequestAnalytics:
+    """Group-by, percentile and time-bucket queries over a request snapshot
+    
+    Every query is a handful of numpy operations over whole columns, so a
+    report over a million requests takes milliseconds.
+    """
+    
+    def __init__(self, columns: RequestColumns, route_labels: Optional[Dict[int, str]] = None,
+                 since: Optional[float] = None):
+        if since is not None:
+            keep = columns.timestamps >= since
+            columns = RequestColumns(*(values[keep] for values in columns[:5]),
+                                     method_names=columns.method_names)
+        self.columns = columns
+        self.route_labels = route_labels or {}
+    
+    def __len__(self) -> int:
+        return len(self.columns.timestamps)
+    
+    def _route_label(self, route_id: int) -> str:
+        if route_id == 0:
+            return UNMATCHED_ROUTE
+        return self.route_labels.get(route_id, f"route {route_id:08x}")
+    
+    @staticmethod
+    def _percentiles(latencies: np.ndarray, percentiles: Sequence[float]) -> Dict[str, float]:
+        """Nearest-rank percentiles in milliseconds, by partial sort (linear time)"""
+        count = len(latencies)
+        if not count:
+            return {f"p{p}": 0.0 for p in percentiles}
+        ranks = np.clip(np.ceil(np.asarray(percentiles) / 100 * count).astype(np.int64) - 1, 0, count - 1)
+        values = np.partition(latencies, ranks)[ranks]
+        return {f"p{p}": round(float(value) * 1000, 3) for p, value in zip(percentiles, values)}
+    
+    def latency_percentiles(self, percentiles: Sequence[float] = PERCENTILES) -> Dict[str, float]:
+        """Overall latency percentiles in milliseconds"""
+        return self._percentiles(self.columns.latencies, percentiles)
+    
+    def by_route(self, percentiles: Sequence[float] = PERCENTILES) -> List[Dict[str, Any]]:
+        """Request count, error count and latency percentiles per route, busiest first"""
+        columns = self.columns
+        if not len(self):
+            return []
+        # Dense route codes; a stable sort on small ints is a radix sort
+        route_ids, codes = np.unique(columns.routes, return_inverse=True)
+        codes = codes.ravel()
+        counts = np.bincount(codes, minlength=len(route_ids))
+        starts = np.concatenate(([0], np.cumsum(counts)[:-1]))
+        error_counts = np.bincount(codes, weights=columns.statuses >= 400, minlength=len(route_ids))
+        latency_sums = np.bincount(codes, weights=columns.latencies, minlength=len(route_ids))
+        small = np.uint16 if len(route_ids) <= 65536 else np.int64
+        latencies = columns.latencies[np.argsort(codes.astype(small), kind="stable")]
+        
+        report = []
+        for route_id, start, count, error_count, latency_sum in zip(
+                route_ids, starts, counts, error_counts, latency_sums):
+            entry = {
+                "route": self._route_label(int(route_id)),
+                "count": int(count),
+                "errors": int(error_count),
+                "mean_ms": round(float(latency_sum) / int(count) * 1000, 3)
+            }
+            entry.update(self._percentiles(latencies[start:start + count], percentiles))
+            report.append(entry)
+        report.sort(key=lambda entry: entry["count"], reverse=True)
+        return report
+    
+    def by_status(self) -> Dict[int, int]:
+        """Request count per status code"""
+        statuses, counts = np.unique(self.columns.statuses, return_counts=True)
+        return {int(status): int(count) for status, count in zip(statuses, counts)}
+    
+    def by_method(self) -> Dict[str, int]:
+        """Request count per HTTP method"""
+        codes, counts = np.unique(self.columns.methods, return_counts=True)
+        names = self.columns.method_names
+        return {names[code] if code < len(names) else str(code): int(count)
+                for code, count in zip(codes, counts)}
+    
+    def time_buckets(self, width: float = 1.0) -> Dict[str, Any]:
+        """Requests and errors per ``width``-second bucket, from the oldest request"""
+        timestamps = self.columns.timestamps
+        if not len(timestamps) or width <= 0:
+            return {"start": None, "width": width, "counts": [], "errors": []}
+        width = max(width, float(timestamps.max() - timestamps.min()) / MAX_BUCKETS)
+        start = float(np.floor(timestamps.min() / width) * width)
+        buckets = ((timestamps - start) // width).astype(np.int64)
+        counts = np.bincount(buckets)
+        errors = np.bincount(buckets, weights=self.columns.statuses >= 400, minlength=len(counts))
+        return {
+            "start": start,
+            "width": width,
+            "counts": counts.tolist(),
+            "errors": errors.astype(np.int64).tolist()
+        }
+    
+    def summary(self, bucket_width: float = 1.0) -> Dict[str, Any]:
+        """Full report: totals, percentiles and the group-bys"""
+        timestamps = self.columns.timestamps
+        return {
+            "requests": len(self),
+            "first": float(timestamps.min()) if len(self) else None,
+            "last": float(timestamps.max()) if len(self) else None,
+            "latency_ms": self.latency_percentiles(),
+            "by_route": self.by_route(),
+            "by_status": self.by_status(),
+            "by_method": self.by_method(),
+            "timeline": self.time_buckets(bucket_width)
+        }
+
+def route_latency_windows(columns: RequestColumns, route_labels: Dict[int, str],
+                          now: float) -> Dict[str, Dict[str, Any]]:
+    """Per-route latency windows in the shape of ``RouteLatency.summary``
+    
+    Used in worker-pool mode, where each process only sees its own
+    histograms; "run" then covers what the shared rings still hold.
+    """
+    windows = {name: RequestAnalytics(columns, route_labels, now - seconds)
+               for name, seconds in WINDOWS.items()}
+    windows["run"] = RequestAnalytics(columns, route_labels)
+    
+    report: Dict[str, Dict[str, Any]] = {}
+    for name, analytics in windows.items():
+        for entry in analytics.by_route((50, 95, 99, 100)):
+            report.setdefault(entry["route"], {})[name] = {
+                "count": entry["count"],
+                "p50": entry["p50"],
+                "p95": entry["p95"],
+                "p99": entry["p99"],
+                "max": entry["p100"]
+            }
+    
+    empty = {"count": 0, "p50": 0.0, "p95": 0.0, "p99": 0.0, "max": 0.0}
+    return {
+        route: {name: route_windows.get(name, dict(empty)) for name in windows}
+        for route, route_windows in sorted(report.items(), key=lambda item: -item[1]["run"]["count"])
+    }
\ No newline at end of file
@@ -4,15 +4,63 @@ Configuration management for SimuServer
 
 import json
 import os
+import threading
 from pathlib import Path
-from typing import Dict, Any, Optional
+from typing import Dict, List, Any, Optional, Callable, NamedTuple
+
+from .websocket_hub import OVERFLOW_POLICIES
+
+class Settings(NamedTuple):
+    """Immutable, typed view of the configuration used at runtime"""
+    host: str
+    port: int
+    workers: int
+    enable_websockets: bool
+    default_delay_ms: float
+    error_rate: float
+    seed: Optional[int]
+    enable_cors: bool
+    max_log_entries: int
+    update_interval: float
+    websocket_queue_size: int
+    websocket_overflow: str
+
+# Settings field -> dotted configuration key and default
+SETTINGS_KEYS = {
+    "host": ("server.host", "127.0.0.1"),
+    "port": ("server.port", 8000),
+    "workers": ("server.workers", 1),
+    "enable_websockets": ("server.enable_websockets", True),
+    "default_delay_ms": ("simulation.default_delay_ms", 0.0),
+    "error_rate": ("simulation.error_rate", 0.0),
+    "seed": ("simulation.seed", None),
+    "enable_cors": ("simulation.enable_cors", True),
+    "max_log_entries": ("logging.max_entries", 1000),
+    "update_interval": ("performance.update_interval", 1.0),
+    "websocket_queue_size": ("server.websocket_queue_size", 100),
+    "websocket_overflow": ("server.websocket_overflow", "drop_oldest"),
+}
+
+# Allowed values of settings fields that take one of a fixed set
+SETTINGS_CHOICES = {
+    "websocket_overflow": OVERFLOW_POLICIES,
+}
 
 class Config:
-    """Configuration manager for SimuServer"""
+    """Configuration manager for SimuServer
+    
+    Runtime code reads ``config.settings``: a snapshot rebuilt whenever the
+    configuration changes through ``set``, ``update``, ``load`` or
+    ``publish_settings`` and swapped in as one reference, so readers never
+    see a half-applied change and never parse dotted keys per request.
+    """
     
     def __init__(self, config_file: str = "simuserver_config.json"):
         self.config_file = Path(config_file)
         self.data = self._load_default_config()
+        self._lock = threading.RLock()
+        self._subscribers: List[Callable[[Settings, Settings], None]] = []
+        self.settings = self._build_settings()
         self.load()
     
     def _load_default_config(self) -> Dict[str, Any]:
@@ -22,12 +70,17 @@ class Config:
                 "host": "127.0.0.1",
                 "port": 8000,
                 "auto_start": False,
-                "enable_websockets": True
+                "enable_websockets": True,
+                "workers": 1,
+                "websocket_queue_size": 100,
+                "websocket_overflow": "drop_oldest"
             },
             "storage": {
                 "data_directory": str(Path.home() / "SimuServer_Data"),
                 "auto_create": True,
-                "max_file_size_mb": 100
+                "max_file_size_mb": 100,
+                "journal_enabled": False,
+                "journal_max_segments": 10
             },
             "performance": {
                 "update_interval": 1.0,
@@ -46,6 +99,7 @@ class Config:
             "simulation": {
                 "default_delay_ms": 0,
                 "error_rate": 0.0,
+                "seed": None,
                 "enable_cors": True
             }
         }
@@ -56,7 +110,9 @@ class Config:
             try:
                 with open(self.config_file, 'r') as f:
                     file_data = json.load(f)
+                with self._lock:
                     self.data.update(file_data)
+                    self.publish_settings()
             except Exception as e:
                 print(f"Warning: Could not load config file: {e}")
     
@@ -81,14 +137,68 @@ class Config:
     
     def set(self, key: str, value: Any) -> None:
         """Set configuration value using dot notation"""
-        keys = key.split('.')
-        data = self.data
-        for k in keys[:-1]:
-            if k not in data:
-                data[k] = {}
-            data = data[k]
-        data[keys[-1]] = value
-        self.save()
+        self.update({key: value})
+    
+    def update(self, values: Dict[str, Any], save: bool = True) -> None:
+        """Set several dotted keys at once, publishing a single new snapshot"""
+        with self._lock:
+            for key, value in values.items():
+                keys = key.split('.')
+                data = self.data
+                for k in keys[:-1]:
+                    if k not in data:
+                        data[k] = {}
+                    data = data[k]
+                data[keys[-1]] = value
+            self.publish_settings()
+            if save:
+                self.save()
+    
+    def subscribe(self, callback: Callable[[Settings, Settings], None]) -> None:
+        """Call callback(old, new) whenever a new settings snapshot is published"""
+        self._subscribers.append(callback)
+    
+    def unsubscribe(self, callback: Callable[[Settings, Settings], None]) -> None:
+        """Stop notifying a subscriber"""
+        if callback in self._subscribers:
+            self._subscribers.remove(callback)
+    
+    def publish_settings(self) -> None:
+        """Rebuild the settings snapshot from ``data``; call after editing ``data`` directly"""
+        with self._lock:
+            old = self.settings
+            self.settings = self._build_settings()
+            if self.settings == old:
+                return
+            for callback in list(self._subscribers):
+                try:
+                    callback(old, self.settings)
+                except Exception as e:
+                    print(f"Warning: settings subscriber failed: {e}")
+    
+    def _build_settings(self) -> Settings:
+        """Build a typed snapshot, falling back to defaults for missing or invalid values"""
+        values = {}
+        for field, (key, default) in SETTINGS_KEYS.items():
+            value = self.get(key, default)
+            kind = Settings.__annotations__[field]
+            try:
+                if field == "seed":
+                    value = None if value is None else int(value)
+                elif kind in (int, float):
+                    value = kind(value)
+                elif kind is bool:
+                    value = bool(value)
+                else:
+                    value = str(value)
+            except (TypeError, ValueError):
+                value = default
+            choices = SETTINGS_CHOICES.get(field)
+            if choices is not None and value not in choices:
+                print(f"Warning: {key} must be one of {', '.join(choices)}; using {default}")
+                value = default
+            values[field] = value
+        return Settings(**values)
     
     def get_data_directory(self) -> Path:
         """Get the configured data directory"""
@@ -0,0 +1,160 @@
+"""
+Seeded fault injection for SimuServer
+"""
+
+import bisect
+import random
+from typing import Dict, List, Any, Optional, Tuple
+
+from .response_cache import CompiledResponse, ResponseCache
+
+class FaultRule:
+    """A compiled fault rule: how often to fail, with which statuses and for how long
+    
+    ``rate`` is the chance that a request starts a fault; a burst of N makes
+    that request and the next N-1 matched by the same rule fail with the
+    same status.
+    """
+    
+    __slots__ = ("rate", "statuses", "cumulative", "responses", "burst")
+    
+    def __init__(self, rate: float, statuses: Dict[int, float], burst: int = 1,
+                 cache: Optional[ResponseCache] = None, body: Any = None):
+        if not 0.0 <= rate <= 1.0:
+            raise ValueError("fault rate must be between 0.0 and 1.0")
+        if burst < 1:
+            raise ValueError("fault burst must be at least 1")
+        if not statuses or any(weight <= 0 for weight in statuses.values()):
+            raise ValueError("fault statuses need positive weights")
+        
+        cache = cache or ResponseCache()
+        self.rate = rate
+        self.burst = burst
+        self.statuses = tuple(statuses)
+        self.cumulative: List[float] = []
+        total = 0.0
+        for weight in statuses.values():
+            total += weight
+            self.cumulative.append(total)
+        self.responses = tuple(
+            cache.compile(body if body is not None else {"error": f"Simulated {status} error"},
+                          status_code=status)
+            for status in self.statuses
+        )
+    
+    def pick(self, rng: random.Random) -> CompiledResponse:
+        """Pick a fault response according to the status weights"""
+        if len(self.responses) == 1:
+            return self.responses[0]
+        return self.responses[bisect.bisect_right(self.cumulative, rng.random() * self.cumulative[-1])]
+    
+    def describe(self) -> Dict[str, Any]:
+        """Describe the rule for status output"""
+        total = self.cumulative[-1]
+        weights = [self.cumulative[0]] + [b - a for a, b in zip(self.cumulative, self.cumulative[1:])]
+        return {
+            "rate": self.rate,
+            "burst": self.burst,
+            "statuses": {status: round(weight / total, 4) for status, weight in zip(self.statuses, weights)}
+        }
+
+def parse_fault_rule(spec: Any, cache: Optional[ResponseCache] = None) -> Optional[FaultRule]:
+    """Build a fault rule from a template's ``faults`` entry
+    
+    Accepts a number (rate of 500 errors) or a dict such as
+    ``{"rate": 0.05, "statuses": {"500": 3, "503": 1}, "burst": 5}``.
+    ``"status": 503`` is shorthand for a single status.
+    """
+    if spec is None:
+        return None
+    if isinstance(spec, (int, float)):
+        return FaultRule(float(spec), {500: 1.0}, cache=cache)
+    if not isinstance(spec, dict):
+        raise ValueError(f"Invalid faults spec: {spec!r}")
+    
+    if "statuses" in spec:
+        statuses = {int(status): float(weight) for status, weight in spec["statuses"].items()}
+    else:
+        statuses = {int(spec.get("status", 500)): 1.0}
+    if any(not 400 <= status <= 599 for status in statuses):
+        raise ValueError("fault statuses must be 4xx or 5xx codes")
+    
+    return FaultRule(float(spec.get("rate", 0.0)), statuses, int(spec.get("burst", 1)),
+                     cache=cache, body=spec.get("body"))
+
+def _fault_rng(seed: Optional[int]) -> random.Random:
+    """RNG for fault draws, on a stream independent of the latency RNG seeded alike"""
+    # With the same seed, fault draws would equal latency draws: faults would
+    # always hit the fastest (or slowest) requests
+    return random.Random(None if seed is None else f"{seed}:faults")
+
+class FaultInjector:
+    """Decides which requests fail, from a seeded RNG so runs can be replayed
+    
+    Rules are resolved when templates load, so the per-request cost is one
+    lookup for an ongoing burst and one random draw. Everything runs on the
+    server's event loop, so no locking is needed.
+    """
+    
+    def __init__(self, cache: ResponseCache, seed: Optional[int] = None):
+        self.cache = cache
+        self.seed = seed
+        self.rng = _fault_rng(seed)
+        self._bursts: Dict[FaultRule, List[Any]] = {}
+        self._global_rate = 0.0
+        self._global_rule: Optional[FaultRule] = None
+        self.total_injected = 0
+        self.by_status: Dict[int, int] = {}
+        self.by_route: Dict[str, int] = {}
+    
+    def global_rule(self, error_rate: float) -> Optional[FaultRule]:
+        """Rule for ``simulation.error_rate``, rebuilt only when the rate changes"""
+        if error_rate != self._global_rate:
+            self._global_rate = error_rate
+            self._global_rule = None
+            if error_rate > 0:
+                self._global_rule = FaultRule(min(1.0, error_rate), {500: 1.0}, cache=self.cache)
+        return self._global_rule
+    
+    def responses(self) -> Tuple[CompiledResponse, ...]:
+        """Compiled responses of the current global rule"""
+        rule = self._global_rule
+        return rule.responses if rule is not None else ()
+    
+    def check(self, rule: FaultRule, label: str = "*") -> Optional[CompiledResponse]:
+        """Return the fault response for this request, or None to serve it normally"""
+        burst = self._bursts.get(rule)
+        if burst is not None:
+            response = burst[1]
+            burst[0] -= 1
+            if burst[0] <= 0:
+                del self._bursts[rule]
+        elif rule.rate and self.rng.random() < rule.rate:
+            response = rule.pick(self.rng)
+            if rule.burst > 1:
+                self._bursts[rule] = [rule.burst - 1, response]
+        else:
+            return None
+        
+        self.total_injected += 1
+        self.by_status[response.status_code] = self.by_status.get(response.status_code, 0) + 1
+        self.by_route[label] = self.by_route.get(label, 0) + 1
+        return response
+    
+    def reset(self, seed: Optional[int] = None):
+        """Reseed and clear counters and bursts to replay a run"""
+        self.seed = seed
+        self.rng = _fault_rng(seed)
+        self._bursts.clear()
+        self.total_injected = 0
+        self.by_status.clear()
+        self.by_route.clear()
+    
+    def get_stats(self) -> Dict[str, Any]:
+        """Get injected fault counters"""
+        return {
+            "seed": self.seed,
+            "injected": self.total_injected,
+            "by_status": dict(self.by_status),
+            "by_route": dict(self.by_route)
+        }
\ No newline at end of file
@@ -0,0 +1,156 @@
+"""
+Log-bucketed latency histograms for SimuServer
+"""
+
+import math
+from typing import Dict, List, Any, Optional
+
+# Values below 2**SUB_BITS microseconds get exact buckets; above that each
+# power of two is split into 2**(SUB_BITS - 1) buckets, so a bucket is never
+# wider than ~3% of its value, however large the value.
+SUB_BITS = 6
+SUB_COUNT = 1 << SUB_BITS
+# Sliding windows reported per route, in seconds
+WINDOWS = {"10s": 10, "1m": 60}
+UNMATCHED_ROUTE = "(unmatched)"
+
+def bucket_index(micros: int) -> int:
+    """Bucket of a latency in whole microseconds"""
+    if micros < SUB_COUNT:
+        return micros
+    shift = micros.bit_length() - SUB_BITS
+    return (shift << (SUB_BITS - 1)) + (micros >> shift)
+
+def bucket_value(index: int) -> float:
+    """Midpoint in microseconds of the values that land in a bucket"""
+    if index < SUB_COUNT:
+        return float(index)
+    shift = (index >> (SUB_BITS - 1)) - 1
+    lower = (index - (shift << (SUB_BITS - 1))) << shift
+    return lower + ((1 << shift) - 1) / 2
+
+class LatencyHistogram:
+    """HDR-style histogram: sparse counts per log bucket
+    
+    Recording is one index computation and one dict update. Histograms of
+    the same layout merge by adding counts, which is how windows are built
+    from per-second slots.
+    """
+    
+    __slots__ = ("counts", "total", "sum", "max_micros", "second")
+    
+    def __init__(self, second: int = 0):
+        self.counts: Dict[int, int] = {}
+        self.total = 0
+        self.sum = 0.0
+        self.max_micros = 0
+        self.second = second
+    
+    def record(self, seconds: float):
+        """Record one latency given in seconds"""
+        micros = int(seconds * 1e6)
+        index = bucket_index(micros) if micros > 0 else 0
+        counts = self.counts
+        counts[index] = counts.get(index, 0) + 1
+        self.total += 1
+        self.sum += seconds
+        if micros > self.max_micros:
+            self.max_micros = micros
+    
+    def merge(self, other: "LatencyHistogram"):
+        """Add another histogram's counts to this one"""
+        # Copy first: the other histogram may be recording on the server thread
+        for index, count in dict(other.counts).items():
+            self.counts[index] = self.counts.get(index, 0) + count
+        self.total += other.total
+        self.sum += other.sum
+        self.max_micros = max(self.max_micros, other.max_micros)
+    
+    def percentiles(self, percentiles: List[float]) -> List[float]:
+        """Nearest-rank percentiles in milliseconds, one pass over the buckets"""
+        results = [0.0] * len(percentiles)
+        if not self.total:
+            return results
+        ranks = sorted((max(1, math.ceil(p / 100 * self.total)), i) for i, p in enumerate(percentiles))
+        seen = 0
+        position = 0
+        for index in sorted(self.counts):
+            seen += self.counts[index]
+            while position < len(ranks) and ranks[position][0] <= seen:
+                results[ranks[position][1]] = min(bucket_value(index), self.max_micros) / 1000
+                position += 1
+            if position == len(ranks):
+                break
+        return results
+    
+    def summary(self) -> Dict[str, Any]:
+        """Count and p50/p95/p99/max in milliseconds"""
+        p50, p95, p99 = self.percentiles([50, 95, 99])
+        return {
+            "count": self.total,
+            "p50": round(p50, 3),
+            "p95": round(p95, 3),
+            "p99": round(p99, 3),
+            "max": round(self.max_micros / 1000, 3)
+        }
+
+class RouteLatencySeries:
+    """Whole-run histogram plus a ring of one-second histograms for one route"""
+    
+    __slots__ = ("run", "slots")
+    
+    def __init__(self, slots: int):
+        self.run = LatencyHistogram()
+        self.slots: List[Optional[LatencyHistogram]] = [None] * slots
+    
+    def record(self, seconds: float, now: float):
+        second = int(now)
+        position = second % len(self.slots)
+        slot = self.slots[position]
+        if slot is None or slot.second < second:
+            # Replace rather than reset, so a reader merging the old slot is unaffected
+            slot = self.slots[position] = LatencyHistogram(second)
+        if slot.second == second:
+            slot.record(seconds)
+        self.run.record(seconds)
+    
+    def window(self, seconds: int, now: float) -> LatencyHistogram:
+        """Merge the slots of the last ``seconds`` seconds, the current one included"""
+        merged = LatencyHistogram()
+        newest = int(now)
+        for slot in list(self.slots):
+            if slot is not None and newest - seconds < slot.second <= newest:
+                merged.merge(slot)
+        return merged
+
+class RouteLatency:
+    """Latency histograms per route template
+    
+    Keyed by route pattern (``GET /users/{id}``) rather than URL, so the
+    number of series is bounded by the loaded templates. One thread
+    records; any thread may read.
+    """
+    
+    def __init__(self, window: int = max(WINDOWS.values())):
+        self.slots = window
+        self.routes: Dict[str, RouteLatencySeries] = {}
+    
+    def record(self, route: str, seconds: float, now: float):
+        """Record a request's latency against its route"""
+        series = self.routes.get(route)
+        if series is None:
+            series = self.routes[route] = RouteLatencySeries(self.slots)
+        series.record(seconds, now)
+    
+    def summary(self, now: float) -> Dict[str, Dict[str, Any]]:
+        """Per-route percentiles for each window and the whole run, busiest first"""
+        report = {}
+        for route, series in sorted(list(self.routes.items()), key=lambda item: -item[1].run.total):
+            windows = {name: series.window(seconds, now).summary() for name, seconds in WINDOWS.items()}
+            windows["run"] = series.run.summary()
+            report[route] = windows
+        return report
+    
+    def clear(self):
+        """Forget all routes"""
+        self.routes = {}
\ No newline at end of file
@@ -0,0 +1,404 @@
+"""
+Persistent request journal for SimuServer
+"""
+
+import bisect
+import heapq
+import itertools
+import mmap
+import os
+import struct
+import threading
+from collections import deque
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Any, Optional, Callable, Tuple
+
+# Fixed part of a journal record: record length, request id, timestamp,
+# response time, simulated delay, status, method and url lengths; followed
+# by the method, the url and "key: value" headers joined by CRLF
+RECORD = struct.Struct("<IQdffHHI")
+# One index record per journal entry: request id, timestamp, data offset
+INDEX = struct.Struct("<QdQ")
+# Entries queued for the writer before the oldest are dropped
+QUEUE_CAPACITY = 100000
+# Write buffer of the segment files
+BUFFER_SIZE = 1 << 20
+# Segments each journal keeps before deleting its oldest
+MAX_SEGMENTS = 10
+
+class RequestJournal:
+    """Append-only, segmented binary journal of served requests
+    
+    The request path only appends a tuple to a bounded deque; a background
+    thread wakes every ``flush_interval`` seconds, packs the batch into
+    length-prefixed records and writes it with one buffered write per file.
+    Each segment ``<prefix>-<first id>.jnl`` has a ``.idx`` file of
+    fixed-size (id, timestamp, offset) records, written after the data they
+    point to, so readers can binary search it through mmap and never see a
+    torn record. Segments rotate once they reach ``max_segment_bytes``, and
+    the oldest is deleted once the journal has more than ``max_segments``.
+    
+    Records are packed rather than JSON-encoded because the writer shares
+    the GIL with the event loop: packing is several times cheaper, which
+    keeps the journal's cost off the request path under load.
+    
+    Pool workers each write their own journal (``prefix`` names it) into
+    the same directory. Ids are strided like SharedMetrics ids, worker
+    ``worker_id`` of ``workers`` taking every id congruent to
+    ``worker_id + 1``, and continue above the newest id of any journal in
+    the directory, so they are unique across workers and restarts. Reads
+    cover every journal in the directory. Timestamps are taken when a
+    request is recorded, so they are nondecreasing within one journal
+    unless the system clock steps back; ``range`` merges the journals by
+    timestamp.
+    """
+    
+    def __init__(self, directory: Path, max_segment_bytes: int = 100 * 1024 * 1024,
+                 prefix: str = "requests", flush_interval: float = 0.2,
+                 capacity: int = QUEUE_CAPACITY, worker_id: Optional[int] = None,
+                 workers: int = 1, max_segments: int = MAX_SEGMENTS,
+                 log_callback: Optional[Callable[[str], None]] = None):
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.max_segment_bytes = max(INDEX.size, max_segment_bytes)
+        self.prefix = prefix
+        self.flush_interval = flush_interval
+        self.max_segments = max(1, max_segments)
+        self.log_callback = log_callback
+        
+        self._queue: deque = deque(maxlen=capacity)
+        self._segments: List[Tuple[int, Path]] = self._scan_segments().get(prefix, [])
+        self.stride = max(1, workers)
+        self._prune()
+        last_id = self._last_id()
+        first_id = last_id + 1 + ((worker_id or 0) - last_id) % self.stride
+        self._ids = itertools.count(first_id, self.stride)
+        self._last_seen = first_id - self.stride
+        
+        self._data_file = None
+        self._index_file = None
+        self._segment_size = 0
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        
+        self.written = 0
+        self.dropped = 0
+        self.bytes_written = 0
+        self.write_errors = 0
+        self.last_error: Optional[str] = None
+    
+    def append(self, method: str, url: str, headers: Any, status_code: int,
+               response_time: float, timestamp: float, simulated_delay: float = 0.0):
+        """Queue a request for the writer; safe to call from any thread"""
+        self._queue.append((next(self._ids), method, url, headers, status_code,
+                            response_time, timestamp, simulated_delay))
+    
+    def start(self):
+        """Start the background writer"""
+        if self._thread is not None:
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="request-journal", daemon=True)
+        self._thread.start()
+    
+    def close(self, timeout: float = 5.0):
+        """Write out everything queued, then close the segment files"""
+        if self._thread is not None:
+            self._stop.set()
+            self._thread.join(timeout)
+            self._thread = None
+        else:
+            self._write_batch()
+        self._close_segment()
+    
+    def _run(self):
+        """Writer thread: flush a batch every interval until stopped"""
+        while not self._stop.wait(self.flush_interval):
+            self._write_batch()
+        self._write_batch()
+    
+    def _write_batch(self):
+        """Write whatever is queued; a failed write loses that batch, not the writer"""
+        written = self.written
+        taken = [0]
+        try:
+            self._write_queued(taken)
+        except OSError as e:
+            # Entries taken off the queue but not written are lost
+            self.dropped += taken[0] - (self.written - written)
+            self.write_errors += 1
+            self.last_error = str(e)
+            # Start a fresh segment at the next interval
+            self._close_segment()
+            if self.log_callback:
+                self.log_callback(f"Request journal write failed: {e}")
+    
+    def _write_queued(self, taken: List[int]):
+        """Serialize and write whatever is queued, counting entries taken in ``taken[0]``"""
+        queue = self._queue
+        count = len(queue)
+        if not count:
+            return
+        
+        data: List[bytes] = []
+        index: List[bytes] = []
+        for _ in range(count):
+            try:
+                entry = queue.popleft()
+            except IndexError:
+                break
+            taken[0] += 1
+            request_id = entry[0]
+            # The deque drops the oldest entries when the writer falls behind
+            if request_id > self._last_seen:
+                self.dropped += (request_id - self._last_seen) // self.stride - 1
+                self._last_seen = request_id
+            
+            if self._data_file is None or self._segment_size >= self.max_segment_bytes:
+                self._flush(data, index)
+                self._open_segment(request_id)
+            
+            record = self._encode(entry)
+            index.append(INDEX.pack(request_id, entry[6], self._segment_size))
+            data.append(record)
+            self._segment_size += len(record)
+        
+        self._flush(data, index)
+    
+    def _flush(self, data: List[bytes], index: List[bytes]):
+        """Write data before the index entries that point into it"""
+        if not data:
+            return
+        chunk = b"".join(data)
+        self._data_file.write(chunk)
+        self._data_file.flush()
+        self._index_file.write(b"".join(index))
+        self._index_file.flush()
+        self.written += len(data)
+        self.bytes_written += len(chunk)
+        data.clear()
+        index.clear()
+    
+    @staticmethod
+    def _encode(entry: Tuple) -> bytes:
+        """Pack one request into a journal record"""
+        request_id, method, url, headers, status_code, response_time, timestamp, delay = entry
+        if isinstance(headers, dict):
+            headers = [(str(key).encode("latin-1", "replace"), str(value).encode("latin-1", "replace"))
+                       for key, value in headers.items()]
+        method = method.encode("latin-1", "replace")
+        # Lengths, not separators: a decoded path may contain any character
+        url = url.encode("utf-8", "replace")
+        payload = method + url + b"\r\n".join([key + b": " + value for key, value in headers or ()])
+        return RECORD.pack(RECORD.size + len(payload), request_id, timestamp,
+                           response_time, delay, status_code, len(method), len(url)) + payload
+    
+    def _open_segment(self, first_id: int):
+        """Close the current segment and start a new one at ``first_id``"""
+        self._close_segment()
+        base = self.directory / f"{self.prefix}-{first_id:012d}"
+        self._data_file = open(base.with_suffix(".jnl"), "wb", buffering=BUFFER_SIZE)
+        self._index_file = open(base.with_suffix(".idx"), "wb", buffering=BUFFER_SIZE)
+        self._segment_size = 0
+        # Replace rather than mutate so readers can iterate without a lock
+        self._segments = self._segments + [(first_id, base)]
+        self._prune()
+    
+    def _prune(self):
+        """Delete the oldest segments beyond ``max_segments``"""
+        while len(self._segments) > self.max_segments:
+            base = self._segments[0][1]
+            try:
+                for suffix in (".idx", ".jnl"):
+                    base.with_suffix(suffix).unlink(missing_ok=True)
+            except OSError:
+                # Still mapped by a reader on a platform that forbids deleting it; retry next rotation
+                return
+            self._segments = self._segments[1:]
+    
+    def _close_segment(self):
+        """Close the files of the current segment"""
+        for handle in (self._data_file, self._index_file):
+            if handle is not None:
+                try:
+                    handle.close()
+                except OSError:
+                    # Buffered data that cannot be written now is lost either way
+                    pass
+        self._data_file = None
+        self._index_file = None
+    
+    def _scan_segments(self) -> Dict[str, List[Tuple[int, Path]]]:
+        """Segments on disk of every journal in the directory, by prefix, oldest first"""
+        journals: Dict[str, List[Tuple[int, Path]]] = {}
+        for path in self.directory.glob("*.idx"):
+            prefix, _, first_id = path.stem.rpartition("-")
+            if prefix and first_id.isdigit():
+                journals.setdefault(prefix, []).append((int(first_id), path.with_suffix("")))
+        for segments in journals.values():
+            segments.sort()
+        return journals
+    
+    def _journals(self) -> List[List[Tuple[int, Path]]]:
+        """Segments of every journal, this one's as known to the writer"""
+        journals = self._scan_segments()
+        journals[self.prefix] = self._segments
+        return list(journals.values())
+    
+    def _last_id(self) -> int:
+        """Newest id in any journal of the directory, 0 if there is none"""
+        last_id = 0
+        for segments in self._scan_segments().values():
+            for _, base in reversed(segments):
+                with _IndexView(base) as view:
+                    if len(view):
+                        last_id = max(last_id, view.record(len(view) - 1)[0])
+                        break
+        return last_id
+    
+    def get(self, request_id: int) -> Optional[Dict[str, Any]]:
+        """Look up one journalled request by id"""
+        for segments in self._journals():
+            position = bisect.bisect_right([first_id for first_id, _ in segments], request_id) - 1
+            if position < 0:
+                continue
+            
+            with _IndexView(segments[position][1]) as view:
+                i = view.bisect(0, request_id)
+                if i < len(view):
+                    found_id, _, offset = view.record(i)
+                    if found_id == request_id:
+                        return view.entry(offset)
+        return None
+    
+    def range(self, start: Optional[float] = None, end: Optional[float] = None,
+              limit: int = 1000) -> List[Dict[str, Any]]:
+        """Journalled requests with ``start <= timestamp < end`` from every journal, oldest first"""
+        start = float("-inf") if start is None else start
+        end = float("inf") if end is None else end
+        entries: List[Dict[str, Any]] = []
+        
+        streams = [self._scan_range(segments, start, end) for segments in self._journals()]
+        try:
+            for _, _, view, offset in heapq.merge(*streams):
+                entries.append(view.entry(offset))
+                if len(entries) >= limit:
+                    break
+        finally:
+            for stream in streams:
+                stream.close()
+        return entries
+    
+    @staticmethod
+    def _scan_range(segments: List[Tuple[int, Path]], start: float, end: float):
+        """(timestamp, id, view, offset) of one journal's entries in range, oldest first
+        
+        Each view stays open until the stream moves past its segment.
+        """
+        for _, base in segments:
+            with _IndexView(base) as view:
+                count = len(view)
+                if not count or view.record(count - 1)[1] < start or view.record(0)[1] >= end:
+                    continue
+                for i in range(view.bisect(1, start), count):
+                    request_id, timestamp, offset = view.record(i)
+                    if timestamp >= end:
+                        break
+                    yield timestamp, request_id, view, offset
+    
+    def get_stats(self) -> Dict[str, Any]:
+        """Get writer counters"""
+        return {
+            "directory": str(self.directory),
+            "segments": len(self._segments),
+            "written": self.written,
+            "dropped": self.dropped,
+            "pending": len(self._queue),
+            "bytes_written": self.bytes_written,
+            "write_errors": self.write_errors,
+            "last_error": self.last_error
+        }
+
+class _IndexView:
+    """Read-only mmap of one segment's index and data, sized when opened"""
+    
+    def __init__(self, base: Path):
+        self.base = base
+        self._maps: List[mmap.mmap] = []
+        self.index = self._map(base.with_suffix(".idx"))
+        self.data = None
+        self.count = len(self.index) // INDEX.size if self.index is not None else 0
+    
+    def _map(self, path: Path) -> Optional[mmap.mmap]:
+        try:
+            with open(path, "rb") as handle:
+                size = os.fstat(handle.fileno()).st_size
+                if not size:
+                    return None
+                view = mmap.mmap(handle.fileno(), size, access=mmap.ACCESS_READ)
+        except OSError:
+            return None
+        self._maps.append(view)
+        return view
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, *exc):
+        for view in self._maps:
+            view.close()
+        self._maps.clear()
+    
+    def __len__(self) -> int:
+        return self.count
+    
+    def record(self, i: int) -> Tuple[int, float, int]:
+        return INDEX.unpack_from(self.index, i * INDEX.size)
+    
+    def bisect(self, field: int, value: Any) -> int:
+        """First record whose ``field`` (0 id, 1 timestamp) is not below ``value``"""
+        low, high = 0, self.count
+        while low < high:
+            middle = (low + high) // 2
+            if self.record(middle)[field] < value:
+                low = middle + 1
+            else:
+                high = middle
+        return low
+    
+    def entry(self, offset: int) -> Optional[Dict[str, Any]]:
+        """Decode the record at ``offset`` into a RequestLogger-style dict"""
+        if self.data is None:
+            self.data = self._map(self.base.with_suffix(".jnl"))
+            if self.data is None:
+                return None
+        if offset + RECORD.size > len(self.data):
+            return None
+        (length, request_id, timestamp, response_time, delay, status_code,
+         method_length, url_length) = RECORD.unpack_from(self.data, offset)
+        if offset + length > len(self.data):
+            return None
+        start = offset + RECORD.size
+        method = self.data[start:start + method_length]
+        start += method_length
+        url = self.data[start:start + url_length]
+        raw_headers = self.data[start + url_length:offset + length]
+        headers = {}
+        for line in raw_headers.split(b"\r\n"):
+            if line:
+                key, _, value = line.partition(b": ")
+                headers[key.decode("latin-1")] = value.decode("latin-1")
+        
+        return {
+            "id": request_id,
+            "method": method.decode("latin-1"),
+            "url": url.decode("utf-8", "replace"),
+            "headers": headers,
+            "status_code": status_code,
+            "response_time_ms": round(response_time * 1000, 2),
+            "simulated_delay_ms": round(delay * 1000, 2),
+            "timestamp": datetime.fromtimestamp(timestamp).isoformat(),
+            "request_body": None,
+            "response_body": None
+        }
\ No newline at end of file
@@ -0,0 +1,205 @@
+"""
+Latency models and delay scheduling for SimuServer
+"""
+
+import asyncio
+import bisect
+import math
+import random
+from typing import Dict, List, Any, Optional
+
+class LatencyModel:
+    """Base class for per-route latency distributions (values in seconds)"""
+    
+    name = "base"
+    
+    def sample(self, rng: random.Random) -> float:
+        raise NotImplementedError
+    
+    def describe(self) -> Dict[str, Any]:
+        """Describe the model for status output"""
+        return {"model": self.name}
+
+class FixedLatency(LatencyModel):
+    """Every request waits the same time"""
+    
+    name = "fixed"
+    
+    def __init__(self, ms: float):
+        self.seconds = max(0.0, ms) / 1000
+    
+    def sample(self, rng: random.Random) -> float:
+        return self.seconds
+    
+    def describe(self) -> Dict[str, Any]:
+        return {"model": self.name, "ms": self.seconds * 1000}
+
+class UniformLatency(LatencyModel):
+    """Latency drawn uniformly between min_ms and max_ms"""
+    
+    name = "uniform"
+    
+    def __init__(self, min_ms: float, max_ms: float):
+        if max_ms < min_ms:
+            raise ValueError("uniform latency needs min_ms <= max_ms")
+        self.low = max(0.0, min_ms) / 1000
+        self.high = max(0.0, max_ms) / 1000
+    
+    def sample(self, rng: random.Random) -> float:
+        return rng.uniform(self.low, self.high)
+    
+    def describe(self) -> Dict[str, Any]:
+        return {"model": self.name, "min_ms": self.low * 1000, "max_ms": self.high * 1000}
+
+class NormalLatency(LatencyModel):
+    """Normally distributed latency, clamped to [0, max_ms]"""
+    
+    name = "normal"
+    
+    def __init__(self, mean_ms: float, stddev_ms: float, max_ms: Optional[float] = None):
+        self.mean = mean_ms / 1000
+        self.stddev = max(0.0, stddev_ms) / 1000
+        self.cap = max_ms / 1000 if max_ms is not None else math.inf
+    
+    def sample(self, rng: random.Random) -> float:
+        return min(self.cap, max(0.0, rng.gauss(self.mean, self.stddev)))
+    
+    def describe(self) -> Dict[str, Any]:
+        return {"model": self.name, "mean_ms": self.mean * 1000, "stddev_ms": self.stddev * 1000}
+
+class LognormalLatency(LatencyModel):
+    """Long-tailed latency: exp(N(ln(median), sigma)), optionally capped"""
+    
+    name = "lognormal"
+    
+    def __init__(self, median_ms: float, sigma: float, max_ms: Optional[float] = None):
+        if median_ms <= 0:
+            raise ValueError("lognormal latency needs median_ms > 0")
+        self.mu = math.log(median_ms / 1000)
+        self.sigma = max(0.0, sigma)
+        self.cap = max_ms / 1000 if max_ms is not None else math.inf
+    
+    def sample(self, rng: random.Random) -> float:
+        return min(self.cap, rng.lognormvariate(self.mu, self.sigma))
+    
+    def describe(self) -> Dict[str, Any]:
+        return {"model": self.name, "median_ms": math.exp(self.mu) * 1000, "sigma": self.sigma}
+
+class PercentileLatency(LatencyModel):
+    """Empirical distribution from a percentile table, e.g. p50=20, p99=400
+    
+    Samples by inverse-CDF with linear interpolation between the given
+    points; p0 defaults to 0 ms and values above the highest percentile are
+    clamped to it.
+    """
+    
+    name = "percentiles"
+    
+    def __init__(self, points: Dict[float, float]):
+        table = sorted(points.items())
+        if not table:
+            raise ValueError("percentile latency needs at least one pNN entry")
+        if table[0][0] > 0:
+            table.insert(0, (0.0, 0.0))
+        for (_, low), (_, high) in zip(table, table[1:]):
+            if high < low:
+                raise ValueError("percentile latencies must not decrease")
+        self.percentiles = [p for p, _ in table]
+        self.values = [ms / 1000 for _, ms in table]
+    
+    def sample(self, rng: random.Random) -> float:
+        p = rng.random() * 100
+        i = bisect.bisect_right(self.percentiles, p)
+        if i >= len(self.percentiles):
+            return self.values[-1]
+        p0, p1 = self.percentiles[i - 1], self.percentiles[i]
+        v0, v1 = self.values[i - 1], self.values[i]
+        return v0 + (v1 - v0) * (p - p0) / (p1 - p0)
+    
+    def describe(self) -> Dict[str, Any]:
+        return {
+            "model": self.name,
+            **{f"p{p:g}": v * 1000 for p, v in zip(self.percentiles, self.values)}
+        }
+
+def parse_latency_model(spec: Any) -> Optional[LatencyModel]:
+    """Build a latency model from a template's ``latency`` entry
+    
+    Accepts a number (fixed milliseconds) or a dict such as
+    ``{"model": "lognormal", "median_ms": 30, "sigma": 0.8}`` or
+    ``{"model": "percentiles", "p50": 20, "p99": 400}``.
+    """
+    if spec is None:
+        return None
+    if isinstance(spec, (int, float)):
+        return FixedLatency(spec)
+    if not isinstance(spec, dict):
+        raise ValueError(f"Invalid latency spec: {spec!r}")
+    
+    model = spec.get("model", "fixed")
+    try:
+        if model == "fixed":
+            return FixedLatency(spec["ms"])
+        if model == "uniform":
+            return UniformLatency(spec["min_ms"], spec["max_ms"])
+        if model == "normal":
+            return NormalLatency(spec["mean_ms"], spec["stddev_ms"], spec.get("max_ms"))
+        if model == "lognormal":
+            return LognormalLatency(spec["median_ms"], spec["sigma"], spec.get("max_ms"))
+    except KeyError as e:
+        raise ValueError(f"{model} latency is missing {e.args[0]!r}")
+    if model in ("percentiles", "empirical"):
+        points = {float(key[1:]): float(value) for key, value in spec.items()
+                  if key.startswith("p") and key[1:].replace(".", "", 1).isdigit()}
+        return PercentileLatency(points)
+    raise ValueError(f"Unknown latency model: {model}")
+
+class DelayScheduler:
+    """Coalescing timer for simulated delays
+    
+    ``asyncio.sleep`` puts one TimerHandle per request on the loop's heap.
+    This scheduler rounds deadlines up to ``resolution`` and keeps one loop
+    timer per tick, waking every waiter in that tick at once, so tens of
+    thousands of concurrently delayed requests cost a handful of timers.
+    """
+    
+    def __init__(self, resolution: float = 0.001):
+        self.resolution = resolution
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._buckets: Dict[int, List[asyncio.Future]] = {}
+        self.pending = 0
+    
+    async def sleep(self, delay: float):
+        """Wait for roughly ``delay`` seconds (never less)"""
+        if delay <= 0:
+            return
+        
+        loop = asyncio.get_running_loop()
+        if loop is not self._loop:
+            # Server restarted on a new loop: old timers are gone with it
+            self._loop = loop
+            self._buckets = {}
+            self.pending = 0
+        
+        tick = math.ceil((loop.time() + delay) / self.resolution)
+        bucket = self._buckets.get(tick)
+        if bucket is None:
+            bucket = self._buckets[tick] = []
+            loop.call_at(tick * self.resolution, self._fire, tick)
+        
+        future = loop.create_future()
+        bucket.append(future)
+        self.pending += 1
+        try:
+            await future
+        finally:
+            self.pending -= 1
+    
+    def _fire(self, tick: int):
+        for future in self._buckets.pop(tick, ()):
+            if not future.done():
+                future.set_result(None)
+    
+    def get_stats(self) -> Dict[str, int]:
+        """Get the number of waiting requests and armed timers"""
+        return {"pending": self.pending, "timers": len(self._buckets)}
\ No newline at end of file
@@ -0,0 +1,305 @@
+"""
+HTTP load generator for benchmarking SimuServer
+"""
+
+import asyncio
+import re
+import time
+from typing import Dict, List, Any, NamedTuple, Optional, Tuple
+
+from .histogram import LatencyHistogram
+
+# Path parameters are filled with this value, e.g. /users/{id} -> /users/1
+PARAM_VALUE = "1"
+PATH_PARAM = re.compile(r"\{\w+(?::\w+)?\}")
+BODY_METHODS = ("POST", "PUT", "PATCH")
+PERCENTILES = (50, 90, 99, 99.9)
+REPORT_VERSION = 1
+# Report fields compared between runs, and whether higher is better
+COMPARED = (
+    ("throughput_rps", True),
+    ("latency_ms.p50", False),
+    ("latency_ms.p90", False),
+    ("latency_ms.p99", False),
+    ("latency_ms.p99.9", False),
+    ("latency_ms.max", False),
+    ("error_rate", False),
+)
+
+class Target(NamedTuple):
+    """One route to request: its template label and a prebuilt HTTP/1.1 request"""
+    label: str
+    method: str
+    path: str
+    request: bytes
+
+class HTTPError(Exception):
+    """The connection failed or the response could not be read"""
+
+def build_targets(routes: List[Tuple[str, str]], host: str, port: int) -> List[Target]:
+    """Targets for (method, path pattern) pairs, with path parameters filled in"""
+    targets = []
+    for method, pattern in routes:
+        path = PATH_PARAM.sub(PARAM_VALUE, pattern)
+        body = b"{}" if method in BODY_METHODS else b""
+        head = (f"{method} {path} HTTP/1.1\r\nHost: {host}:{port}\r\n"
+                f"User-Agent: simuserver-bench\r\nContent-Length: {len(body)}\r\n")
+        if body:
+            head += "Content-Type: application/json\r\n"
+        targets.append(Target(f"{method} {pattern}", method, path, head.encode("latin-1") + b"\r\n" + body))
+    return targets
+
+def routes_from_engine(engine) -> List[Tuple[str, str]]:
+    """(method, path) of every HTTP route in the engine's active templates"""
+    routes = []
+    for template_name in engine.active_templates:
+        for route in engine.template_data.get(template_name, {}).get("routes", []):
+            routes.append((route["method"].upper(), route["path"]))
+    return routes
+
+class Connection:
+    """One keep-alive HTTP/1.1 connection, reopened after any failure"""
+    
+    def __init__(self, host: str, port: int):
+        self.host = host
+        self.port = port
+        self.reader: Optional[asyncio.StreamReader] = None
+        self.writer: Optional[asyncio.StreamWriter] = None
+    
+    async def request(self, target: Target) -> int:
+        """Send one request and read the whole response; returns the status code"""
+        try:
+            if self.writer is None:
+                self.reader, self.writer = await asyncio.open_connection(self.host, self.port)
+            self.writer.write(target.request)
+            await self.writer.drain()
+            return await self._read_response(target.method == "HEAD")
+        except (OSError, asyncio.IncompleteReadError, ValueError, IndexError) as e:
+            self.close()
+            raise HTTPError(str(e) or type(e).__name__)
+    
+    async def _read_response(self, head_only: bool) -> int:
+        reader = self.reader
+        status = int((await reader.readuntil(b"\r\n")).split(None, 2)[1])
+        length = 0
+        chunked = False
+        keep_alive = True
+        while True:
+            line = await reader.readuntil(b"\r\n")
+            if line == b"\r\n":
+                break
+            name, _, value = line.partition(b":")
+            name = name.strip().lower()
+            if name == b"content-length":
+                length = int(value)
+            elif name == b"transfer-encoding":
+                chunked = b"chunked" in value.lower()
+            elif name == b"connection":
+                keep_alive = b"close" not in value.lower()
+        
+        if head_only or status in (204, 304):
+            pass
+        elif chunked:
+            while True:
+                size = int((await reader.readuntil(b"\r\n")).split(b";")[0], 16)
+                await reader.readexactly(size + 2)
+                if size == 0:
+                    break
+        elif length:
+            await reader.readexactly(length)
+        
+        if not keep_alive:
+            self.close()
+        return status
+    
+    def close(self):
+        if self.writer is not None:
+            self.writer.close()
+        self.reader = self.writer = None
+
+class RunStats:
+    """Latency histograms and status counts of one run, overall and per route"""
+    
+    def __init__(self):
+        self.latency = LatencyHistogram()
+        self.routes: Dict[str, LatencyHistogram] = {}
+        self.route_errors: Dict[str, int] = {}
+        self.status_codes: Dict[str, int] = {}
+        self.errors = 0
+    
+    def record(self, target: Target, status: int, seconds: float):
+        """Record a response; status 0 means the request failed outright"""
+        self.latency.record(seconds)
+        histogram = self.routes.get(target.label)
+        if histogram is None:
+            histogram = self.routes[target.label] = LatencyHistogram()
+        histogram.record(seconds)
+        key = str(status) if status else "failed"
+        self.status_codes[key] = self.status_codes.get(key, 0) + 1
+        if status == 0 or status >= 500:
+            self.errors += 1
+            self.route_errors[target.label] = self.route_errors.get(target.label, 0) + 1
+
+def _latency_report(histogram: LatencyHistogram) -> Dict[str, float]:
+    values = histogram.percentiles(list(PERCENTILES))
+    report = {f"p{p:g}": round(value, 3) for p, value in zip(PERCENTILES, values)}
+    report["max"] = round(histogram.max_micros / 1000, 3)
+    report["mean"] = round(histogram.sum / histogram.total * 1000, 3) if histogram.total else 0.0
+    return report
+
+class LoadGenerator:
+    """Drives targets over keep-alive connections, closed- or open-loop
+    
+    Closed loop: each connection sends its next request as soon as the
+    previous response arrives. Open loop: requests are due on a fixed
+    schedule of ``rate`` per second, queue for a free connection if all are
+    busy, and their latency is counted from when they were due, so a
+    stalled server cannot hide its stall by slowing the client down
+    (coordinated omission).
+    """
+    
+    def __init__(self, host: str, port: int, targets: List[Target], connections: int = 16,
+                 rate: Optional[float] = None, timeout: float = 10.0):
+        if not targets:
+            raise ValueError("No routes to benchmark")
+        self.host = host
+        self.port = port
+        self.targets = targets
+        self.connections = max(1, connections)
+        self.rate = rate
+        self.timeout = timeout
+    
+    async def run(self, duration: float, warmup: float = 0.0) -> Dict[str, Any]:
+        """Warm up, then measure for ``duration`` seconds; returns the JSON report"""
+        connections = [Connection(self.host, self.port) for _ in range(self.connections)]
+        try:
+            if warmup > 0:
+                await self._phase(connections, warmup, RunStats())
+            stats = RunStats()
+            cpu_start = time.process_time()
+            elapsed, backlog = await self._phase(connections, duration, stats)
+            cpu = time.process_time() - cpu_start
+        finally:
+            for connection in connections:
+                connection.close()
+        return self._report(stats, elapsed, duration, backlog, cpu)
+    
+    async def _send(self, connection: Connection, target: Target, stats: RunStats, started: float):
+        try:
+            status = await asyncio.wait_for(connection.request(target), self.timeout)
+        except (HTTPError, asyncio.TimeoutError):
+            connection.close()
+            status = 0
+        stats.record(target, status, time.perf_counter() - started)
+    
+    async def _phase(self, connections: List[Connection], duration: float,
+                     stats: RunStats) -> Tuple[float, int]:
+        """Run one phase; returns (elapsed seconds, largest open-loop backlog)"""
+        start = time.perf_counter()
+        end = start + duration
+        targets = self.targets
+        
+        if self.rate is None:
+            async def closed_loop(connection: Connection, offset: int):
+                i = offset
+                while time.perf_counter() < end:
+                    target = targets[i % len(targets)]
+                    i += 1
+                    await self._send(connection, target, stats, time.perf_counter())
+            
+            await asyncio.gather(*(closed_loop(c, i) for i, c in enumerate(connections)))
+            return time.perf_counter() - start, 0
+        
+        queue: asyncio.Queue = asyncio.Queue()
+        interval = 1.0 / self.rate
+        backlog = 0
+        
+        async def schedule():
+            nonlocal backlog
+            n = 0
+            while True:
+                due = start + n * interval
+                if due >= end:
+                    break
+                delay = due - time.perf_counter()
+                if delay > 0:
+                    await asyncio.sleep(delay)
+                queue.put_nowait((due, targets[n % len(targets)]))
+                backlog = max(backlog, queue.qsize())
+                n += 1
+            for _ in connections:
+                queue.put_nowait(None)
+        
+        async def open_loop(connection: Connection):
+            while True:
+                item = await queue.get()
+                if item is None:
+                    return
+                due, target = item
+                await self._send(connection, target, stats, due)
+        
+        await asyncio.gather(schedule(), *(open_loop(c) for c in connections))
+        return time.perf_counter() - start, backlog
+    
+    def _report(self, stats: RunStats, elapsed: float, duration: float,
+                backlog: int, cpu: float) -> Dict[str, Any]:
+        requests = stats.latency.total
+        by_route = {}
+        for label, histogram in sorted(stats.routes.items()):
+            p50, p99 = histogram.percentiles([50, 99])
+            by_route[label] = {
+                "requests": histogram.total,
+                "errors": stats.route_errors.get(label, 0),
+                "p50_ms": round(p50, 3),
+                "p99_ms": round(p99, 3)
+            }
+        return {
+            "version": REPORT_VERSION,
+            "started_at": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "target": f"http://{self.host}:{self.port}",
+            "mode": "closed" if self.rate is None else "open",
+            "connections": self.connections,
+            "rate": self.rate,
+            "duration": duration,
+            "elapsed": round(elapsed, 3),
+            "routes": len(self.targets),
+            "requests": requests,
+            "errors": stats.errors,
+            "error_rate": round(stats.errors / requests, 6) if requests else 0.0,
+            "throughput_rps": round(requests / elapsed, 2) if elapsed else 0.0,
+            "latency_ms": _latency_report(stats.latency),
+            "status_codes": dict(sorted(stats.status_codes.items())),
+            "by_route": by_route,
+            # Open loop only: most requests ever waiting for a connection
+            "max_backlog": backlog,
+            # Near 100 means the client, not the server, was the bottleneck
+            "client_cpu_percent": round(cpu / elapsed * 100, 1) if elapsed else 0.0
+        }
+
+def _field(report: Dict[str, Any], path: str) -> Optional[float]:
+    value: Any = report
+    for key in path.split(".", 1):
+        if not isinstance(value, dict) or key not in value:
+            return None
+        value = value[key]
+    return value
+
+def compare_reports(base: Dict[str, Any], new: Dict[str, Any]) -> List[Dict[str, Any]]:
+    """Per-metric change from ``base`` to ``new``; ``better`` is None when unchanged"""
+    rows = []
+    for path, higher_is_better in COMPARED:
+        old_value, new_value = _field(base, path), _field(new, path)
+        if old_value is None or new_value is None:
+            continue
+        change = (new_value - old_value) / old_value * 100 if old_value else None
+        better = None
+        if new_value != old_value:
+            better = (new_value > old_value) == higher_is_better
+        rows.append({
+            "metric": path,
+            "base": old_value,
+            "new": new_value,
+            "change_percent": round(change, 1) if change is not None else None,
+            "better": better
+        })
+    return rows
\ No newline at end of file
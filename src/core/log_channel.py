@@ -0,0 +1,55 @@
+"""
+Lock-free log hand-off from server threads to the GUI
+"""
+
+import itertools
+import time
+from collections import deque
+from typing import List, Tuple
+
+class LogChannel:
+    """Bounded queue of log messages with a single consumer
+    
+    Producers only append to a ``deque(maxlen=...)`` and take a number from
+    an ``itertools.count``; both are atomic in CPython, so the server thread
+    never waits on the GUI. When the consumer falls behind, the oldest
+    messages are discarded and the gap in sequence numbers tells the
+    consumer how many were lost.
+    """
+    
+    def __init__(self, capacity: int = 10000):
+        self.capacity = capacity
+        self._queue: deque = deque(maxlen=capacity)
+        self._sequence = itertools.count(1)
+        self._last_seen = 0
+        self.dropped = 0
+    
+    def put(self, message: str):
+        """Queue a message; safe to call from any thread"""
+        self._queue.append((next(self._sequence), time.time(), message))
+    
+    def drain(self, limit: int = 0) -> Tuple[List[Tuple[float, str]], int]:
+        """Take up to ``limit`` queued messages (all if 0)
+        
+        Returns ([(timestamp, message), ...], dropped) where dropped counts
+        messages lost to overflow since the previous drain.
+        """
+        queue = self._queue
+        count = len(queue) if not limit else min(limit, len(queue))
+        batch = []
+        dropped = 0
+        for _ in range(count):
+            try:
+                sequence, timestamp, message = queue.popleft()
+            except IndexError:
+                break
+            # Concurrent producers can interleave numbering and appending by one slot
+            if sequence > self._last_seen:
+                dropped += sequence - self._last_seen - 1
+                self._last_seen = sequence
+            batch.append((timestamp, message))
+        self.dropped += dropped
+        return batch, dropped
+    
+    def __len__(self) -> int:
+        return len(self._queue)
\ No newline at end of file
@@ -0,0 +1,171 @@
+"""
+Event-loop health instrumentation for SimuServer
+"""
+
+import asyncio
+import gc
+import sys
+import threading
+import time
+from collections import deque
+from typing import Dict, Any, Optional, Tuple
+
+from .histogram import LatencyHistogram
+from .middleware import RequestPipelineMiddleware
+
+# The heartbeat sleeps this long per beat; loop lag is how late it wakes up
+HEARTBEAT_INTERVAL = 0.05
+# A beat overdue by this long means one callback is holding the loop
+SLOW_CALLBACK = 0.1
+SLOW_CALLBACK_HISTORY = 50
+
+_PIPELINE_CODE = RequestPipelineMiddleware.__call__.__code__
+
+class LoopHealth:
+    """Loop lag, slow callbacks and GC pauses of the server's event loop
+    
+    A heartbeat task on the loop records how late each beat wakes. A
+    watchdog thread notices when a beat is overdue by SLOW_CALLBACK and
+    samples the loop thread's stack once per stall, naming the request
+    pipeline's route and the innermost frame holding the loop. GC pauses are
+    timed with ``gc.callbacks``. Works the same with asyncio and uvloop, as
+    nothing hooks the loop itself.
+    """
+    
+    def __init__(self):
+        # Lag since the monitor last took a window, and over the whole run
+        self.lag = LatencyHistogram()
+        self.lag_run = LatencyHistogram()
+        self.slow_callbacks: deque = deque(maxlen=SLOW_CALLBACK_HISTORY)
+        self.slow_callback_count = 0
+        
+        self.gc_collections = [0, 0, 0]
+        self.gc_pause_total = 0.0
+        self.gc_pause_max = 0.0
+        self._gc_started = 0.0
+        
+        self._last_beat = 0.0
+        self._stall: Optional[Dict[str, Any]] = None
+        self._loop_thread: Optional[int] = None
+        self._task: Optional[asyncio.Task] = None
+        self._watchdog: Optional[threading.Thread] = None
+        self._stop = threading.Event()
+    
+    @property
+    def attached(self) -> bool:
+        return self._task is not None
+    
+    def attach(self):
+        """Start watching the running loop; call from the loop's thread"""
+        if self._task is not None:
+            return
+        self._loop_thread = threading.get_ident()
+        self._last_beat = time.perf_counter()
+        self._task = asyncio.get_running_loop().create_task(self._heartbeat())
+        
+        self._stop.clear()
+        self._watchdog = threading.Thread(target=self._watch, name="loop-watchdog", daemon=True)
+        self._watchdog.start()
+        gc.callbacks.append(self._on_gc)
+    
+    def detach(self):
+        """Stop the heartbeat, the watchdog and GC timing"""
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
+        self._stop.set()
+        if self._watchdog is not None:
+            self._watchdog.join(timeout=1.0)
+            self._watchdog = None
+        if self._on_gc in gc.callbacks:
+            gc.callbacks.remove(self._on_gc)
+    
+    async def _heartbeat(self):
+        while True:
+            expected = time.perf_counter() + HEARTBEAT_INTERVAL
+            await asyncio.sleep(HEARTBEAT_INTERVAL)
+            now = time.perf_counter()
+            self._last_beat = now
+            lag = max(0.0, now - expected)
+            self.lag.record(lag)
+            self.lag_run.record(lag)
+            
+            stall = self._stall
+            if stall is not None:
+                stall["duration_ms"] = round(lag * 1000, 1)
+                self._stall = None
+    
+    def _watch(self):
+        """Sample the loop thread's stack once when a beat is overdue"""
+        while not self._stop.wait(SLOW_CALLBACK / 4):
+            beat = self._last_beat
+            if self._stall is not None or time.perf_counter() - beat - HEARTBEAT_INTERVAL < SLOW_CALLBACK:
+                continue
+            frame = sys._current_frames().get(self._loop_thread)
+            if frame is None or self._last_beat != beat:
+                continue
+            route, location = self._describe(frame)
+            stall = {
+                "timestamp": time.time(),
+                "route": route,
+                "location": location,
+                "duration_ms": None
+            }
+            self._stall = stall
+            self.slow_callbacks.append(stall)
+            self.slow_callback_count += 1
+    
+    @staticmethod
+    def _describe(frame) -> Tuple[Optional[str], str]:
+        """Route of the request pipeline on the stack, and the innermost frame"""
+        code = frame.f_code
+        location = f"{code.co_name} ({code.co_filename}:{frame.f_lineno})"
+        route = None
+        while frame is not None:
+            if frame.f_code is _PIPELINE_CODE:
+                local = frame.f_locals
+                template_route = local.get("route")
+                scope = local.get("scope") or {}
+                if template_route is not None:
+                    route = template_route.label
+                else:
+                    route = f"{scope.get('method', '')} {scope.get('path', '')}".strip()
+                break
+            frame = frame.f_back
+        return route, location
+    
+    def _on_gc(self, phase: str, info: Dict[str, int]):
+        if phase == "start":
+            self._gc_started = time.perf_counter()
+            return
+        pause = time.perf_counter() - self._gc_started
+        self.gc_collections[info["generation"]] += 1
+        self.gc_pause_total += pause
+        if pause > self.gc_pause_max:
+            self.gc_pause_max = pause
+    
+    def take_summary(self) -> Dict[str, Any]:
+        """Lag since the previous call plus run-wide slow-callback and GC totals"""
+        window, self.lag = self.lag, LatencyHistogram()
+        return {
+            "attached": self.attached,
+            "lag_ms": window.summary(),
+            "lag_max_ms": round(self.lag_run.max_micros / 1000, 3),
+            "slow_callbacks": self.slow_callback_count,
+            "recent_slow_callbacks": [dict(stall) for stall in list(self.slow_callbacks)[-5:]],
+            "gc": {
+                "collections": list(self.gc_collections),
+                "pause_total_ms": round(self.gc_pause_total * 1000, 2),
+                "pause_max_ms": round(self.gc_pause_max * 1000, 2)
+            }
+        }
+    
+    def clear(self):
+        """Forget lag, slow callbacks and GC totals"""
+        self.lag = LatencyHistogram()
+        self.lag_run = LatencyHistogram()
+        self.slow_callbacks.clear()
+        self.slow_callback_count = 0
+        self.gc_collections = [0, 0, 0]
+        self.gc_pause_total = 0.0
+        self.gc_pause_max = 0.0
\ No newline at end of file
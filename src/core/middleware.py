@@ -0,0 +1,105 @@
+"""
+Pure ASGI request pipeline for SimuServer
+"""
+
+import time
+
+from starlette.datastructures import URL
+
+from .histogram import UNMATCHED_ROUTE
+
+class RequestPipelineMiddleware:
+    """Applies delay, fault injection, logging, metrics and GUI notification
+    
+    Runs as a plain ASGI callable instead of BaseHTTPMiddleware, so there is
+    no extra task or body stream per request; the response status is captured
+    by wrapping ``send``.
+    """
+    
+    def __init__(self, app, engine):
+        self.app = app
+        self.engine = engine
+    
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        
+        start_time = time.time()
+        engine = self.engine
+        # One snapshot per request: settings applied mid-request cannot tear
+        settings = engine.config.settings
+        
+        # Resolve the template route up front; the dispatcher reuses the match
+        method = scope["method"]
+        match = engine.route_table.match("GET" if method == "HEAD" else method, scope["path"])
+        scope["simuserver.match"] = match
+        route = match[0]
+        
+        # Per-route latency model, else the global delay
+        if route is not None and route.latency is not None:
+            delay = route.latency.sample(engine.latency_rng)
+        else:
+            delay = settings.default_delay_ms / 1000
+        if delay > 0:
+            await engine.delay_scheduler.sleep(delay)
+        
+        # Inject faults: the route's rule, else the global error rate
+        faults = engine.fault_injector
+        if route is not None and route.faults is not None:
+            rule = route.faults
+        else:
+            rule = faults.global_rule(settings.error_rate)
+        if rule is not None:
+            fault = faults.check(rule, route.label if route is not None else "*")
+            if fault is not None:
+                await fault.send_to(send, scope["headers"], conditional=False)
+                self._record(scope, route, fault.status_code, time.time() - start_time, delay)
+                return
+        
+        status_code = 500
+        
+        async def send_wrapper(message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+        
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            self._record(scope, route, status_code, time.time() - start_time, delay)
+    
+    def _record(self, scope, route, status_code: int, process_time: float, delay: float = 0.0):
+        """Log the request, update metrics and notify the GUI"""
+        engine = self.engine
+        method = scope["method"]
+        url = str(URL(scope=scope))
+        now = time.time()
+        route_id = route.route_id if route is not None else 0
+        
+        # Raw headers are stored by reference and only decoded when inspected
+        engine.request_logger.log_request(
+            method=method,
+            url=url,
+            headers=scope["headers"],
+            status_code=status_code,
+            response_time=process_time,
+            timestamp=now,
+            simulated_delay=delay,
+            route_id=route_id
+        )
+        
+        # Read once: stop_server may close the journal concurrently
+        journal = engine.journal
+        if journal is not None:
+            journal.append(method, url, scope["headers"], status_code, process_time, now, delay)
+        
+        engine.performance_monitor.record_request(route.label if route is not None else UNMATCHED_ROUTE,
+                                                  method, status_code, process_time, now)
+        if engine.shared_metrics is not None:
+            engine.shared_metrics.record(engine.worker_id, method, url, status_code, process_time,
+                                         now, delay, route_id)
+        
+        if engine.log_callback:
+            engine.log_callback(f"{method} {scope['path']} - {status_code} ({process_time:.3f}s)")
\ No newline at end of file
@@ -2,33 +2,97 @@
 Performance monitoring system for SimuServer
 """
 
+import os
 import psutil
 import threading
 import time
 from datetime import datetime
-from typing import Dict, List, Any
+from pathlib import Path
+from typing import Dict, List, Any, Callable, NamedTuple, Optional, Tuple
 from collections import deque
 
+from .histogram import RouteLatency
+from .loop_health import LoopHealth
+from .rate_counter import RATE_WINDOWS, RateCounter
+
+# Sampling runs at update_interval * FAST_FACTOR while requests are flowing
+# or CPU is moving, and backs off towards update_interval * IDLE_FACTOR
+FAST_FACTOR = 0.25
+IDLE_FACTOR = 5.0
+# CPU swing, in percentage points, that counts as activity
+CPU_CHANGE = 5.0
+# Disk usage and socket counts change slowly and cost more to read (socket
+# counts walk the process's fds); sample them at most this often, in seconds
+SLOW_SAMPLE_INTERVAL = 10.0
+
+class MetricsSnapshot(NamedTuple):
+    """One sample of system metrics, published whole by the monitor thread"""
+    cpu_percent: float
+    memory_percent: float
+    memory_used_mb: float
+    memory_available_mb: float
+    memory_total_mb: float
+    disk_percent: float
+    disk_used_gb: float
+    disk_free_gb: float
+    disk_path: str
+    # This process rather than the machine
+    process_rss_mb: float
+    process_cpu_percent: float
+    process_cpu_seconds: float
+    process_threads: int
+    process_fds: int
+    process_sockets: int
+    # LoopHealth.take_summary() for the interval ending at this sample
+    event_loop: Dict[str, Any]
+    sampled_at: float
+    interval: float
+
 class PerformanceMonitor:
-    """Monitors system performance metrics"""
+    """Monitors system performance metrics
     
-    def __init__(self, update_interval: float = 1.0, history_size: int = 100):
+    All psutil calls happen on the monitor thread. Each tick builds a
+    ``MetricsSnapshot`` and swaps it in as one reference; readers such as
+    ``/api/status`` and the GUI only format the latest snapshot. A reader
+    finding it older than ``update_interval`` wakes the thread instead of
+    sampling inline.
+    """
+    
+    def __init__(self, update_interval: float = 1.0, history_size: int = 100,
+                 data_directory: Optional[Callable[[], Any]] = None):
         self.update_interval = update_interval
         self.history_size = history_size
+        # Where disk usage is measured, resolved on every disk sample so it follows the config
+        self.data_directory = data_directory
+        self.cpu_count = psutil.cpu_count()
+        self.process = psutil.Process()
+        
+        # Latest sample, replaced whole by the monitor thread
+        self.snapshot: Optional[MetricsSnapshot] = None
+        self._slow_sampled_at = 0.0
+        
+        # Heartbeat lag, slow callbacks and GC pauses; attached by the server's loop
+        self.loop_health = LoopHealth()
         
         # Performance data storage
         self.cpu_history: deque = deque(maxlen=history_size)
         self.memory_history: deque = deque(maxlen=history_size)
         self.network_history: deque = deque(maxlen=history_size)
+        self.process_history: deque = deque(maxlen=history_size)
+        
+        # Request tracking: per-second buckets written only by the server thread
+        self.request_rate = RateCounter(max(RATE_WINDOWS))
+        # Optional external rate over a window in seconds (e.g. shared worker-pool metrics)
+        self.rate_source: Optional[Callable[[int], float]] = None
         
-        # Request tracking
-        self.request_count = 0
-        self.requests_per_second = 0
-        self.last_request_time = time.time()
+        # Latency histograms and request counts per route template
+        self.route_latency = RouteLatency()
+        self.request_totals: Dict[Tuple[str, str, int], int] = {}
         
-        # Monitoring thread
+        # Monitoring thread, woken early by stop() and by readers of a stale snapshot
         self.monitoring_thread = None
         self.is_monitoring = False
+        self._wake = threading.Event()
         
         # Initial network stats for delta calculation
         self.last_network_stats = psutil.net_io_counters()
@@ -39,27 +103,33 @@ class PerformanceMonitor:
             return
         
         self.is_monitoring = True
+        self._wake.clear()
+        # Readers get a snapshot from the start; the thread takes it from there
+        try:
+            self._sample(self.update_interval)
+        except Exception as e:
+            print(f"Performance monitoring error: {e}")
         self.monitoring_thread = threading.Thread(target=self._monitor_loop, daemon=True)
         self.monitoring_thread.start()
     
     def stop(self):
         """Stop performance monitoring"""
         self.is_monitoring = False
+        self._wake.set()
         if self.monitoring_thread:
             self.monitoring_thread.join(timeout=1.0)
     
     def _monitor_loop(self):
         """Main monitoring loop"""
-        while self.is_monitoring:
+        interval = self.update_interval
+        while True:
+            self._wake.wait(interval)
+            self._wake.clear()
+            if not self.is_monitoring:
+                break
             try:
-                # CPU usage
-                cpu_percent = psutil.cpu_percent(interval=None)
-                
-                # Memory usage
-                memory = psutil.virtual_memory()
-                memory_percent = memory.percent
-                memory_used_mb = memory.used / (1024 * 1024)
-                memory_available_mb = memory.available / (1024 * 1024)
+                previous = self.snapshot
+                snapshot = self._sample(interval)
                 
                 # Network I/O
                 current_network = psutil.net_io_counters()
@@ -67,93 +137,201 @@ class PerformanceMonitor:
                 network_recv_delta = current_network.bytes_recv - self.last_network_stats.bytes_recv
                 self.last_network_stats = current_network
                 
-                # Calculate requests per second
-                current_time = time.time()
-                time_delta = current_time - self.last_request_time
-                if time_delta >= 1.0:
-                    self.requests_per_second = self.request_count / time_delta
-                    self.request_count = 0
-                    self.last_request_time = current_time
-                
                 # Store data with timestamp
-                timestamp = datetime.now()
+                timestamp = datetime.fromtimestamp(snapshot.sampled_at)
                 
                 self.cpu_history.append({
                     "timestamp": timestamp.isoformat(),
-                    "value": cpu_percent
+                    "value": snapshot.cpu_percent
                 })
                 
                 self.memory_history.append({
                     "timestamp": timestamp.isoformat(),
-                    "percent": memory_percent,
-                    "used_mb": memory_used_mb,
-                    "available_mb": memory_available_mb
+                    "percent": snapshot.memory_percent,
+                    "used_mb": snapshot.memory_used_mb,
+                    "available_mb": snapshot.memory_available_mb
                 })
                 
                 self.network_history.append({
                     "timestamp": timestamp.isoformat(),
                     "sent_bytes_delta": network_sent_delta,
-                    "recv_bytes_delta": network_recv_delta
+                    "recv_bytes_delta": network_recv_delta,
+                    "requests_per_second": self.get_request_rates()["1s"]
+                })
+                
+                event_loop = snapshot.event_loop
+                self.process_history.append({
+                    "timestamp": timestamp.isoformat(),
+                    "rss_mb": snapshot.process_rss_mb,
+                    "cpu_percent": snapshot.process_cpu_percent,
+                    "threads": snapshot.process_threads,
+                    "fds": snapshot.process_fds,
+                    "sockets": snapshot.process_sockets,
+                    "loop_lag_p99_ms": event_loop["lag_ms"]["p99"],
+                    "loop_lag_max_ms": event_loop["lag_ms"]["max"],
+                    "slow_callbacks": event_loop["slow_callbacks"],
+                    "gc_pause_total_ms": event_loop["gc"]["pause_total_ms"]
                 })
                 
+                interval = self._next_interval(interval, previous, snapshot)
+                
             except Exception as e:
                 print(f"Performance monitoring error: {e}")
-            
-            time.sleep(self.update_interval)
+    
+    def _sample(self, interval: float) -> MetricsSnapshot:
+        """Take one sample and publish it as the current snapshot"""
+        now = time.time()
+        memory = psutil.virtual_memory()
+        previous = self.snapshot
+        process = self.process
+        
+        with process.oneshot():
+            process_memory = process.memory_info()
+            process_cpu = process.cpu_times()
+            process_cpu_percent = process.cpu_percent(interval=None)
+            process_threads = process.num_threads()
+            process_fds = process.num_fds() if hasattr(process, "num_fds") else process.num_handles()
+        
+        if previous is None or now - self._slow_sampled_at >= SLOW_SAMPLE_INTERVAL:
+            path = self._disk_path()
+            disk = psutil.disk_usage(path)
+            disk_percent = disk.percent
+            disk_used_gb = round(disk.used / (1024 * 1024 * 1024), 2)
+            disk_free_gb = round(disk.free / (1024 * 1024 * 1024), 2)
+            try:
+                process_sockets = len(process.connections(kind="inet"))
+            except psutil.Error:
+                process_sockets = -1
+            self._slow_sampled_at = now
+        else:
+            path = previous.disk_path
+            disk_percent, disk_used_gb, disk_free_gb = previous.disk_percent, previous.disk_used_gb, previous.disk_free_gb
+            process_sockets = previous.process_sockets
+        
+        snapshot = MetricsSnapshot(
+            cpu_percent=psutil.cpu_percent(interval=None),
+            memory_percent=memory.percent,
+            memory_used_mb=round(memory.used / (1024 * 1024), 2),
+            memory_available_mb=round(memory.available / (1024 * 1024), 2),
+            memory_total_mb=round(memory.total / (1024 * 1024), 2),
+            disk_percent=disk_percent,
+            disk_used_gb=disk_used_gb,
+            disk_free_gb=disk_free_gb,
+            disk_path=path,
+            process_rss_mb=round(process_memory.rss / (1024 * 1024), 2),
+            process_cpu_percent=process_cpu_percent,
+            process_cpu_seconds=round(process_cpu.user + process_cpu.system, 2),
+            process_threads=process_threads,
+            process_fds=process_fds,
+            process_sockets=process_sockets,
+            event_loop=self.loop_health.take_summary(),
+            sampled_at=now,
+            interval=interval
+        )
+        self.snapshot = snapshot
+        return snapshot
+    
+    def _disk_path(self) -> str:
+        """The data directory, or its nearest existing parent"""
+        path = Path(self.data_directory() if self.data_directory else os.getcwd()).resolve()
+        while not path.exists() and path.parent != path:
+            path = path.parent
+        return str(path)
+    
+    def _next_interval(self, interval: float, previous: Optional[MetricsSnapshot],
+                       snapshot: MetricsSnapshot) -> float:
+        """Sample faster while busy, slower while idle"""
+        busy = self.get_request_rates()["1s"] > 0 or (
+            previous is not None and abs(snapshot.cpu_percent - previous.cpu_percent) >= CPU_CHANGE
+        )
+        if busy:
+            return max(self.update_interval * FAST_FACTOR, interval / 2)
+        return min(self.update_interval * IDLE_FACTOR, interval * 1.5)
     
     def update_request_count(self):
         """Update request count for RPS calculation"""
-        self.request_count += 1
+        self.request_rate.add(time.time())
+    
+    def record_request(self, route: str, method: str, status_code: int,
+                       response_time: float, timestamp: float):
+        """Count a request and record its latency against its route"""
+        self.request_rate.add(timestamp)
+        key = (route, method, status_code)
+        self.request_totals[key] = self.request_totals.get(key, 0) + 1
+        self.route_latency.record(route, response_time, timestamp)
+    
+    def get_request_rates(self) -> Dict[str, float]:
+        """Requests per second averaged over the last 1s, 10s and 60s complete seconds"""
+        if self.rate_source:
+            return {f"{seconds}s": round(self.rate_source(seconds), 2) for seconds in RATE_WINDOWS}
+        return {window: round(rate, 2) for window, rate in self.request_rate.rates(time.time()).items()}
+    
+    def get_route_latency(self) -> Dict[str, Dict[str, Any]]:
+        """Latency percentiles per route over the last 10s, 1m and the whole run"""
+        return self.route_latency.summary(time.time())
     
     def get_current_metrics(self) -> Dict[str, Any]:
-        """Get current performance metrics"""
-        try:
-            # Current CPU
-            cpu_percent = psutil.cpu_percent(interval=None)
-            
-            # Current Memory
-            memory = psutil.virtual_memory()
-            
-            # Disk usage for data directory
-            disk = psutil.disk_usage('/')
-            
+        """Get current performance metrics from the latest snapshot"""
+        snapshot = self.snapshot
+        if snapshot is None:
             return {
-                "cpu": {
-                    "percent": cpu_percent,
-                    "count": psutil.cpu_count()
-                },
-                "memory": {
-                    "percent": memory.percent,
-                    "used_mb": round(memory.used / (1024 * 1024), 2),
-                    "available_mb": round(memory.available / (1024 * 1024), 2),
-                    "total_mb": round(memory.total / (1024 * 1024), 2)
-                },
-                "disk": {
-                    "percent": disk.percent,
-                    "used_gb": round(disk.used / (1024 * 1024 * 1024), 2),
-                    "free_gb": round(disk.free / (1024 * 1024 * 1024), 2)
-                },
-                "network": {
-                    "requests_per_second": round(self.requests_per_second, 2)
-                },
-                "timestamp": datetime.now().isoformat()
-            }
-        except Exception as e:
-            return {
-                "error": str(e),
+                "error": "No metrics sampled yet",
                 "timestamp": datetime.now().isoformat()
             }
+        if time.time() - snapshot.sampled_at > self.update_interval:
+            self._wake.set()
+        
+        rates = self.get_request_rates()
+        
+        return {
+            "cpu": {
+                "percent": snapshot.cpu_percent,
+                "count": self.cpu_count
+            },
+            "memory": {
+                "percent": snapshot.memory_percent,
+                "used_mb": snapshot.memory_used_mb,
+                "available_mb": snapshot.memory_available_mb,
+                "total_mb": snapshot.memory_total_mb
+            },
+            "disk": {
+                "path": snapshot.disk_path,
+                "percent": snapshot.disk_percent,
+                "used_gb": snapshot.disk_used_gb,
+                "free_gb": snapshot.disk_free_gb
+            },
+            "network": {
+                "requests_per_second": rates["1s"],
+                "request_rates": rates
+            },
+            "process": {
+                "rss_mb": snapshot.process_rss_mb,
+                "cpu_percent": snapshot.process_cpu_percent,
+                "cpu_seconds": snapshot.process_cpu_seconds,
+                "threads": snapshot.process_threads,
+                "fds": snapshot.process_fds,
+                "sockets": snapshot.process_sockets
+            },
+            "event_loop": snapshot.event_loop,
+            "sample_interval": round(snapshot.interval, 3),
+            "timestamp": datetime.fromtimestamp(snapshot.sampled_at).isoformat()
+        }
     
     def get_history_data(self) -> Dict[str, List[Dict[str, Any]]]:
         """Get historical performance data"""
         return {
             "cpu": list(self.cpu_history),
             "memory": list(self.memory_history),
-            "network": list(self.network_history)
+            "network": list(self.network_history),
+            "process": list(self.process_history)
         }
     
     def clear_history(self):
         """Clear all historical data"""
         self.cpu_history.clear()
         self.memory_history.clear()
-        self.network_history.clear() 
\ No newline at end of file
+        self.network_history.clear()
+        self.process_history.clear()
+        self.loop_health.clear()
+        self.route_latency.clear()
+        self.request_rate.clear() 
\ No newline at end of file
@@ -0,0 +1,223 @@
+"""
+Prometheus text exposition for SimuServer
+"""
+
+import bisect
+import json
+import os
+import threading
+import time
+from pathlib import Path
+from typing import Dict, List, Any, Optional, Tuple
+
+import psutil
+
+from .histogram import UNMATCHED_ROUTE, bucket_value
+
+# Latency histogram boundaries in seconds, as exposed to Prometheus
+LATENCY_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+# Scrapes within this many seconds get the previously rendered text
+CACHE_SECONDS = 0.5
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+# name: (type, help)
+FAMILIES = {
+    "simuserver_requests_total": ("counter", "Requests served, by route template, method and status"),
+    "simuserver_request_duration_seconds": ("histogram", "Request latency by route template"),
+    "simuserver_faults_injected_total": ("counter", "Simulated faults injected, by status"),
+    "simuserver_websocket_connections": ("gauge", "Open WebSocket connections"),
+    "process_resident_memory_bytes": ("gauge", "Resident memory size in bytes"),
+    "process_cpu_seconds_total": ("counter", "User and system CPU time spent in seconds"),
+}
+
+Labels = Tuple[Tuple[str, str], ...]
+Samples = Dict[Tuple[str, Labels], float]
+
+def _split_route(route: str) -> Tuple[str, str]:
+    """("GET /users/{id}") -> ("GET", "/users/{id}")"""
+    if route == UNMATCHED_ROUTE:
+        return "", route
+    method, _, path = route.partition(" ")
+    return method, path
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+def _format_value(value: float) -> str:
+    if value == int(value) and abs(value) < 1e15:
+        return str(int(value))
+    return repr(float(value))
+
+class MetricsExporter:
+    """Renders the engine's in-memory counters in Prometheus text format
+    
+    Nothing is measured at scrape time except the process's own RSS and CPU
+    time. Histogram buckets for a route are only re-derived from its latency
+    histogram when that route has served new requests, and the rendered text
+    is reused for scrapes less than ``cache_seconds`` apart.
+    
+    In worker-pool mode each worker also publishes its samples to a shared
+    directory every ``interval`` seconds; whichever worker is scraped sums
+    all workers' samples, labelling process metrics by worker.
+    """
+    
+    def __init__(self, engine, cache_seconds: float = CACHE_SECONDS):
+        self.engine = engine
+        self.cache_seconds = cache_seconds
+        self.process = psutil.Process()
+        self._histogram_cache: Dict[str, Tuple[Any, int, Samples]] = {}
+        # Family and "name{labels}" text per series, which only changes for new series
+        self._series_cache: Dict[Tuple[str, Labels], Tuple[str, str]] = {}
+        self._rendered = b""
+        self._rendered_at = 0.0
+        
+        self.share_directory: Optional[Path] = None
+        self.worker_id: Optional[int] = None
+        self._share_stop = threading.Event()
+        self._share_thread: Optional[threading.Thread] = None
+    
+    def collect(self) -> Samples:
+        """Current samples of this process"""
+        engine = self.engine
+        monitor = engine.performance_monitor
+        samples: Samples = {}
+        
+        for (route, method, status_code), count in list(monitor.request_totals.items()):
+            _, path = _split_route(route)
+            labels = (("route", path), ("method", method), ("status", str(status_code)))
+            samples[("simuserver_requests_total", labels)] = count
+        
+        for route, series in list(monitor.route_latency.routes.items()):
+            samples.update(self._histogram_samples(route, series.run))
+        
+        for status_code, count in list(engine.fault_injector.by_status.items()):
+            samples[("simuserver_faults_injected_total", (("status", str(status_code)),))] = count
+        
+        samples[("simuserver_websocket_connections", ())] = len(engine.websocket_hub)
+        
+        process_labels: Labels = (("worker", str(self.worker_id)),) if self.worker_id is not None else ()
+        try:
+            cpu = self.process.cpu_times()
+            samples[("process_resident_memory_bytes", process_labels)] = self.process.memory_info().rss
+            samples[("process_cpu_seconds_total", process_labels)] = cpu.user + cpu.system
+        except psutil.Error:
+            pass
+        return samples
+    
+    def _histogram_samples(self, route: str, histogram) -> Samples:
+        """Prometheus buckets for one route, re-derived only when it has new requests"""
+        cached = self._histogram_cache.get(route)
+        total = histogram.total
+        if cached is not None and cached[0] is histogram and cached[1] == total:
+            return cached[2]
+        
+        # Each log bucket is counted under the first boundary above its midpoint
+        bounds = [le * 1e6 for le in LATENCY_BUCKETS]
+        counts = [0] * (len(bounds) + 1)
+        for index, count in dict(histogram.counts).items():
+            counts[bisect.bisect_left(bounds, bucket_value(index))] += count
+        
+        method, path = _split_route(route)
+        base: Labels = (("route", path),) if not method else (("route", path), ("method", method))
+        samples: Samples = {}
+        cumulative = 0
+        for le, count in zip(LATENCY_BUCKETS, counts):
+            cumulative += count
+            samples[("simuserver_request_duration_seconds_bucket", base + (("le", repr(le)),))] = cumulative
+        samples[("simuserver_request_duration_seconds_bucket", base + (("le", "+Inf"),))] = cumulative + counts[-1]
+        samples[("simuserver_request_duration_seconds_sum", base)] = histogram.sum
+        samples[("simuserver_request_duration_seconds_count", base)] = cumulative + counts[-1]
+        
+        self._histogram_cache[route] = (histogram, total, samples)
+        return samples
+    
+    def render(self) -> bytes:
+        """Exposition text for a scrape, reused within ``cache_seconds``"""
+        now = time.monotonic()
+        if self._rendered and now - self._rendered_at < self.cache_seconds:
+            return self._rendered
+        
+        samples = self.collect()
+        if self.share_directory is not None:
+            samples = self._merge_workers(samples)
+        self._rendered = self._format(samples)
+        self._rendered_at = now
+        return self._rendered
+    
+    def _series(self, key: Tuple[str, Labels]) -> Tuple[str, str]:
+        """Family name and rendered series name of a sample"""
+        name, labels = key
+        family = name
+        for suffix in ("_bucket", "_sum", "_count"):
+            if name.endswith(suffix) and name[:-len(suffix)] in FAMILIES:
+                family = name[:-len(suffix)]
+        label_text = ",".join(f'{label}="{_escape(value)}"' for label, value in labels)
+        series = self._series_cache[key] = (family, f"{name}{{{label_text}}}" if label_text else name)
+        return series
+    
+    def _format(self, samples: Samples) -> bytes:
+        """Group samples by family and write HELP/TYPE headers, keeping bucket order"""
+        families: Dict[str, List[str]] = {name: [] for name in FAMILIES}
+        series_cache = self._series_cache
+        for key, value in samples.items():
+            family, series = series_cache.get(key) or self._series(key)
+            families.setdefault(family, []).append(f"{series} {_format_value(value)}")
+        
+        lines = []
+        for family, family_lines in families.items():
+            if not family_lines:
+                continue
+            kind, help_text = FAMILIES.get(family, ("untyped", family))
+            lines.append(f"# HELP {family} {help_text}")
+            lines.append(f"# TYPE {family} {kind}")
+            lines.extend(family_lines)
+        return ("\n".join(lines) + "\n").encode("utf-8")
+    
+    def share(self, directory: Path, worker_id: int, interval: float = 1.0):
+        """Publish this worker's samples for the other workers to merge"""
+        self.share_directory = Path(directory)
+        self.worker_id = worker_id
+        self._share_stop.clear()
+        
+        def publish_loop():
+            while not self._share_stop.wait(interval):
+                self._publish()
+        
+        self._share_thread = threading.Thread(target=publish_loop, name="metrics-share", daemon=True)
+        self._share_thread.start()
+    
+    def stop_sharing(self):
+        """Stop publishing samples"""
+        self._share_stop.set()
+        if self._share_thread is not None:
+            self._share_thread.join(timeout=1.0)
+            self._share_thread = None
+    
+    def _worker_file(self, worker_id: int) -> Path:
+        return self.share_directory / f"worker-{worker_id}.json"
+    
+    def _publish(self):
+        """Write this worker's samples atomically"""
+        try:
+            payload = [[name, list(labels), value] for (name, labels), value in self.collect().items()]
+            path = self._worker_file(self.worker_id)
+            temporary = path.with_suffix(".tmp")
+            temporary.write_text(json.dumps(payload), encoding="utf-8")
+            os.replace(temporary, path)
+        except (OSError, RuntimeError):
+            pass
+    
+    def _merge_workers(self, own: Samples) -> Samples:
+        """Sum this worker's live samples with the last published samples of the others"""
+        merged: Samples = dict(own)
+        for path in self.share_directory.glob("worker-*.json"):
+            if path == self._worker_file(self.worker_id):
+                continue
+            try:
+                payload = json.loads(path.read_text(encoding="utf-8"))
+            except (OSError, ValueError):
+                continue
+            for name, labels, value in payload:
+                key = (name, tuple(tuple(pair) for pair in labels))
+                merged[key] = merged.get(key, 0) + value
+        return merged
\ No newline at end of file
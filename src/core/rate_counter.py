@@ -0,0 +1,64 @@
+"""
+Sliding-window request rate counter for SimuServer
+"""
+
+from typing import Dict, List
+
+# Rate windows reported by the performance monitor, in seconds
+RATE_WINDOWS = (1, 10, 60)
+
+class RateCounter:
+    """Counts events in a ring of per-second buckets
+    
+    One thread adds (the server's event loop); any thread may read. Nothing
+    is ever reset by a reader, so no increment can be lost, and ``total`` is
+    exact. A bucket is reused only once it is older than the longest
+    window, so a reader never mixes a reused bucket into a rate.
+    
+    Rates are averages over complete seconds: ``rate(10)`` is the number of
+    events in the ten seconds before the current one, divided by ten.
+    """
+    
+    def __init__(self, window: int = max(RATE_WINDOWS)):
+        self.window = window
+        # Two spare buckets: the current second and one being recycled
+        self.size = window + 2
+        self._seconds: List[int] = [-1] * self.size
+        self._counts: List[int] = [0] * self.size
+        self.total = 0
+    
+    def add(self, now: float, count: int = 1):
+        """Count ``count`` events at time ``now``"""
+        second = int(now)
+        position = second % self.size
+        if self._seconds[position] != second:
+            self._counts[position] = 0
+            self._seconds[position] = second
+        self._counts[position] += count
+        self.total += count
+    
+    def count(self, seconds: int, now: float) -> int:
+        """Events in the ``seconds`` complete seconds before ``now``"""
+        seconds = min(seconds, self.window)
+        current = int(now)
+        total = 0
+        for second in range(current - seconds, current):
+            position = second % self.size
+            if self._seconds[position] == second:
+                total += self._counts[position]
+        return total
+    
+    def rate(self, seconds: int, now: float) -> float:
+        """Average events per second over the ``seconds`` complete seconds before ``now``"""
+        seconds = max(1, min(seconds, self.window))
+        return self.count(seconds, now) / seconds
+    
+    def rates(self, now: float) -> Dict[str, float]:
+        """Rates over each of RATE_WINDOWS, keyed like "10s\""""
+        return {f"{seconds}s": self.rate(seconds, now) for seconds in RATE_WINDOWS}
+    
+    def clear(self):
+        """Forget all counts"""
+        self._seconds = [-1] * self.size
+        self._counts = [0] * self.size
+        self.total = 0
\ No newline at end of file
@@ -2,45 +2,165 @@
 Request logging system for SimuServer
 """
 
-import time
+from array import array
 from datetime import datetime
-from typing import Dict, List, Any, Optional
-from collections import deque
+from typing import Dict, List, Any, Optional, Tuple, Union
+
+# Raw headers are kept for at most this many of the most recent requests
+HEADER_ENTRIES = 10000
+# Distinct URLs remembered for interning before the table starts over
+INTERN_LIMIT = 65536
 
 class RequestLogger:
-    """Logs and manages HTTP request/response data"""
+    """Logs and manages HTTP request/response data
+    
+    Requests are stored in a preallocated ring of parallel arrays (float
+    timestamps and times, small-int method codes and status codes, interned
+    URLs), so a million entries take tens of megabytes. Raw ASGI headers are
+    kept by reference for the most recent requests only and decoded when a
+    consumer asks for them. Dicts are only built on read.
+    
+    One thread writes; an entry is published by bumping ``total_requests``
+    after its slot is written, so readers never see a half-written entry.
+    The rings have one slot more than they show, the one the writer fills
+    next, so all ``max_entries`` entries stay readable while it does.
+    """
     
-    def __init__(self, max_entries: int = 1000):
-        self.max_entries = max_entries
-        self.requests: deque = deque(maxlen=max_entries)
+    def __init__(self, max_entries: int = 1000, header_entries: int = HEADER_ENTRIES):
+        self.max_entries = max(1, max_entries)
+        self.header_entries = max(1, min(self.max_entries, header_entries))
+        
+        size = self.ring_size = self.max_entries + 1
+        self._header_slots = self.header_entries + 1
+        self._timestamps = array("d", bytes(8 * size))
+        self._response_times = array("f", bytes(4 * size))
+        self._delays = array("f", bytes(4 * size))
+        self._methods = array("B", bytes(size))
+        self._statuses = array("H", bytes(2 * size))
+        self._routes = array("I", bytes(4 * size))
+        self._urls: List[Optional[str]] = [None] * size
+        self._headers: List[Any] = [None] * self._header_slots
+        self._bodies: Dict[int, Tuple[Optional[str], Optional[str]]] = {}
+        
+        self._interned: Dict[str, str] = {}
+        self._method_names: List[str] = ["GET", "POST", "PUT", "DELETE", "PATCH", "HEAD", "OPTIONS"]
+        self._method_codes: Dict[str, int] = {name: code for code, name in enumerate(self._method_names)}
+        
         self.total_requests = 0
     
-    def log_request(self, method: str, url: str, headers: Dict[str, str], 
-                   status_code: int, response_time: float, timestamp: datetime,
-                   request_body: Optional[str] = None, response_body: Optional[str] = None):
-        """Log a request/response pair"""
+    def log_request(self, method: str, url: str, headers: Any,
+                   status_code: int, response_time: float, timestamp: Union[float, datetime],
+                   request_body: Optional[str] = None, response_body: Optional[str] = None,
+                   simulated_delay: float = 0.0, route_id: int = 0):
+        """Log a request/response pair
+        
+        ``headers`` may be a dict or the raw ASGI header list; either is kept
+        as-is and only decoded on read. ``route_id`` identifies the matched
+        template route (0 for none) for analytics.
+        """
+        seq = self.total_requests
+        slot = seq % self.ring_size
+        
+        code = self._method_codes.get(method)
+        if code is None:
+            code = self._method_code(method)
+        url = self._interned.get(url) or self._intern(url)
+        
+        self._timestamps[slot] = timestamp.timestamp() if isinstance(timestamp, datetime) else timestamp
+        self._response_times[slot] = response_time
+        self._delays[slot] = simulated_delay
+        self._methods[slot] = code
+        self._statuses[slot] = status_code
+        self._routes[slot] = route_id
+        self._urls[slot] = url
+        self._headers[seq % self._header_slots] = headers
+        
+        if self._bodies:
+            self._bodies.pop(seq - self.max_entries, None)
+        if request_body is not None or response_body is not None:
+            self._bodies[seq] = (request_body, response_body)
+        
+        # Publish the entry
+        self.total_requests = seq + 1
+    
+    def _method_code(self, method: str) -> int:
+        """Assign a code to a method not seen before"""
+        method = method.upper()
+        if method not in self._method_codes:
+            if len(self._method_names) >= 255:
+                return self._method_codes.get("GET", 0)
+            self._method_codes[method] = len(self._method_names)
+            self._method_names.append(method)
+        return self._method_codes[method]
+    
+    def _intern(self, url: str) -> str:
+        """Share one string per distinct URL, bounded by INTERN_LIMIT"""
+        if len(self._interned) >= INTERN_LIMIT:
+            self._interned = {}
+        self._interned[url] = url
+        return url
+    
+    def _visible_range(self, total: int) -> range:
+        """Sequence numbers that can be read safely when ``total`` entries are published"""
+        if total <= self.max_entries:
+            return range(0, total)
+        # The spare slot, the one the writer may be overwriting right now, is not among these
+        return range(total - self.max_entries, total)
+    
+    def _materialize(self, seq: int, total: int) -> Dict[str, Any]:
+        """Build the request dict for one entry"""
+        slot = seq % self.ring_size
+        headers: Any = {}
+        if seq >= total - self.header_entries:
+            raw = self._headers[seq % self._header_slots]
+            if isinstance(raw, dict):
+                headers = dict(raw)
+            elif raw:
+                headers = {key.decode("latin-1"): value.decode("latin-1") for key, value in raw}
+        request_body, response_body = self._bodies.get(seq, (None, None))
         
-        request_data = {
-            "id": self.total_requests + 1,
-            "method": method,
-            "url": url,
+        return {
+            "id": seq + 1,
+            "method": self._method_names[self._methods[slot]],
+            "url": self._urls[slot],
             "headers": headers,
-            "status_code": status_code,
-            "response_time_ms": round(response_time * 1000, 2),
-            "timestamp": timestamp.isoformat(),
+            "status_code": self._statuses[slot],
+            "response_time_ms": round(self._response_times[slot] * 1000, 2),
+            "simulated_delay_ms": round(self._delays[slot] * 1000, 2),
+            "timestamp": datetime.fromtimestamp(self._timestamps[slot]).isoformat(),
             "request_body": request_body,
             "response_body": response_body
         }
-        
-        self.requests.append(request_data)
-        self.total_requests += 1
+    
+    def _read(self, seqs: range) -> List[Dict[str, Any]]:
+        """Materialize entries, dropping any the writer overwrote while we read"""
+        entries = [self._materialize(seq, seqs.stop) for seq in seqs]
+        oldest = self._visible_range(self.total_requests).start
+        if seqs and seqs.start < oldest:
+            entries = entries[oldest - seqs.start:]
+        return entries
     
     def get_recent_requests(self, limit: Optional[int] = None) -> List[Dict[str, Any]]:
         """Get recent requests, optionally limited"""
-        requests_list = list(self.requests)
+        visible = self._visible_range(self.total_requests)
         if limit:
-            return requests_list[-limit:]
-        return requests_list
+            visible = visible[-limit:]
+        return self._read(visible)
+    
+    def since(self, cursor: int = 0, limit: Optional[int] = None) -> Tuple[List[Dict[str, Any]], int]:
+        """Get requests logged after ``cursor`` and the cursor for the next call
+        
+        Cost depends on the number of new entries, not on the buffer size.
+        Entries that dropped out of the ring before being read are skipped,
+        and a cursor from before ``clear_logs`` starts over.
+        """
+        total = self.total_requests
+        if cursor > total:
+            cursor = 0
+        seqs = range(max(cursor, self._visible_range(total).start), total)
+        if limit:
+            seqs = seqs[:limit]
+        return self._read(seqs), seqs.stop
     
     def get_total_requests(self) -> int:
         """Get total number of requests processed"""
@@ -48,21 +168,29 @@ class RequestLogger:
     
     def get_requests_by_method(self, method: str) -> List[Dict[str, Any]]:
         """Get requests filtered by HTTP method"""
-        return [req for req in self.requests if req["method"].upper() == method.upper()]
+        code = self._method_codes.get(method.upper())
+        if code is None:
+            return []
+        visible = self._visible_range(self.total_requests)
+        return [self._materialize(seq, visible.stop) for seq in visible
+                if self._methods[seq % self.ring_size] == code]
     
     def get_requests_by_status(self, status_code: int) -> List[Dict[str, Any]]:
         """Get requests filtered by status code"""
-        return [req for req in self.requests if req["status_code"] == status_code]
+        visible = self._visible_range(self.total_requests)
+        return [self._materialize(seq, visible.stop) for seq in visible
+                if self._statuses[seq % self.ring_size] == status_code]
     
     def get_average_response_time(self) -> float:
         """Get average response time in milliseconds"""
-        if not self.requests:
-            return 0.0
-        
-        total_time = sum(req["response_time_ms"] for req in self.requests)
-        return total_time / len(self.requests)
+        total = self.total_requests
+        if total <= self.max_entries:
+            return sum(self._response_times[:total]) / total * 1000 if total else 0.0
+        # Every slot but the spare one
+        return (sum(self._response_times) - self._response_times[total % self.ring_size]) / self.max_entries * 1000
     
     def clear_logs(self):
         """Clear all logged requests"""
-        self.requests.clear()
-        self.total_requests = 0 
\ No newline at end of file
+        self.total_requests = 0
+        self._headers = [None] * self._header_slots
+        self._bodies.clear()
\ No newline at end of file
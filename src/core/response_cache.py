@@ -0,0 +1,248 @@
+"""
+Pre-serialized response cache for SimuServer template routes
+"""
+
+import gzip
+import hashlib
+import json
+from typing import Any, Dict, FrozenSet, Iterable, List, NamedTuple, Optional, Tuple
+
+from starlette.responses import Response
+
+try:
+    import brotli
+except ImportError:  # optional: brotli variants are skipped without it
+    brotli = None
+
+JSON_MEDIA_TYPE = "application/json"
+
+# Bodies smaller than this are not worth compressing
+MIN_COMPRESS_SIZE = 256
+
+RawHeaders = Tuple[Tuple[bytes, bytes], ...]
+
+def encode_json(content: Any) -> bytes:
+    """Encode content exactly like Starlette's JSONResponse.render"""
+    return json.dumps(
+        content,
+        ensure_ascii=False,
+        allow_nan=False,
+        indent=None,
+        separators=(",", ":"),
+    ).encode("utf-8")
+
+_accept_encoding_cache: Dict[bytes, Tuple[FrozenSet[bytes], FrozenSet[bytes]]] = {}
+
+def parse_accept_encoding(value: bytes) -> Tuple[FrozenSet[bytes], FrozenSet[bytes]]:
+    """Get the content codings a client accepts (q > 0) and rejects (q = 0), memoized per header value"""
+    parsed = _accept_encoding_cache.get(value)
+    if parsed is not None:
+        return parsed
+    
+    codings = set()
+    rejected = set()
+    for item in value.lower().split(b","):
+        coding, _, params = item.partition(b";")
+        quality = 1.0
+        for param in params.split(b";"):
+            name, _, number = param.strip().partition(b"=")
+            if name == b"q":
+                try:
+                    quality = float(number)
+                except ValueError:
+                    quality = 0.0
+        if quality > 0:
+            codings.add(coding.strip())
+        else:
+            rejected.add(coding.strip())
+    
+    parsed = (frozenset(codings), frozenset(rejected))
+    # Clients send a handful of distinct values; bound the memo anyway
+    if len(_accept_encoding_cache) < 256:
+        _accept_encoding_cache[value] = parsed
+    return parsed
+
+def etag_matches(if_none_match: bytes, etag: bytes) -> bool:
+    """Weak comparison of an If-None-Match header against an ETag"""
+    if if_none_match.strip() == b"*":
+        return True
+    for candidate in if_none_match.split(b","):
+        candidate = candidate.strip()
+        if candidate.startswith(b"W/"):
+            candidate = candidate[2:]
+        if candidate == etag:
+            return True
+    return False
+
+class Representation(NamedTuple):
+    """A precompressed encoding of a compiled response"""
+    encoding: bytes
+    body: bytes
+    raw_headers: RawHeaders
+    etag: bytes
+    not_modified_headers: RawHeaders
+
+class CompiledResponse(NamedTuple):
+    """Immutable pre-encoded response with precomputed headers"""
+    status_code: int
+    body: bytes
+    raw_headers: RawHeaders
+    etag: bytes = b""
+    not_modified_headers: RawHeaders = ()
+    variants: Tuple[Representation, ...] = ()
+    
+    def select(self, request_headers: List[Tuple[bytes, bytes]],
+               conditional: bool = True) -> Tuple[int, bytes, RawHeaders]:
+        """Pick status, body and headers for a request
+        
+        Chooses a precompressed variant from Accept-Encoding and answers
+        304 when If-None-Match matches the chosen representation's ETag.
+        """
+        if not self.etag:
+            return self.status_code, self.body, self.raw_headers
+        
+        accept_encoding = if_none_match = None
+        for name, value in request_headers:
+            if name == b"accept-encoding":
+                accept_encoding = value
+            elif name == b"if-none-match":
+                if_none_match = value
+        
+        body, raw_headers, etag, not_modified_headers = (
+            self.body, self.raw_headers, self.etag, self.not_modified_headers
+        )
+        if accept_encoding and self.variants:
+            accepted, rejected = parse_accept_encoding(accept_encoding)
+            for variant in self.variants:
+                # "*" covers codings not listed, not ones refused with q=0
+                if variant.encoding in accepted or (b"*" in accepted and variant.encoding not in rejected):
+                    body, raw_headers, etag, not_modified_headers = (
+                        variant.body, variant.raw_headers, variant.etag, variant.not_modified_headers
+                    )
+                    break
+        
+        if conditional and if_none_match and etag_matches(if_none_match, etag):
+            return 304, b"", not_modified_headers
+        return self.status_code, body, raw_headers
+    
+    async def send_to(self, send, request_headers: Optional[List[Tuple[bytes, bytes]]] = None,
+                      conditional: bool = True):
+        """Send this response over a raw ASGI send channel"""
+        if request_headers is None:
+            status_code, body, raw_headers = self.status_code, self.body, self.raw_headers
+        else:
+            status_code, body, raw_headers = self.select(request_headers, conditional)
+        await send({
+            "type": "http.response.start",
+            "status": status_code,
+            "headers": list(raw_headers)
+        })
+        await send({"type": "http.response.body", "body": body})
+
+class PrecompiledResponse(Response):
+    """Starlette response that replays a CompiledResponse without re-rendering"""
+    
+    def __init__(self, compiled: CompiledResponse):
+        # Skip Response.__init__: body and headers are already rendered
+        self.status_code = compiled.status_code
+        self.body = compiled.body
+        self.background = None
+        # Downstream middleware may mutate the header list, so hand out a copy
+        self.raw_headers = list(compiled.raw_headers)
+
+def _content_length(body: bytes) -> Tuple[bytes, bytes]:
+    return (b"content-length", str(len(body)).encode("latin-1"))
+
+class ResponseCache:
+    """Compiles template responses once and interns identical payloads"""
+    
+    def __init__(self):
+        self._bodies: Dict[bytes, bytes] = {}
+        self._responses: Dict[Tuple[int, str, bytes], CompiledResponse] = {}
+        self.hits = 0
+    
+    def compile(self, content: Any, status_code: int = 200,
+                media_type: str = JSON_MEDIA_TYPE) -> CompiledResponse:
+        """Compile content into an immutable, shared CompiledResponse"""
+        body = encode_json(content)
+        body = self._bodies.setdefault(body, body)
+        
+        key = (status_code, media_type, body)
+        compiled = self._responses.get(key)
+        if compiled is not None:
+            self.hits += 1
+            return compiled
+        
+        content_type = (b"content-type", media_type.encode("latin-1"))
+        if not 200 <= status_code < 300:
+            compiled = CompiledResponse(status_code, body, (_content_length(body), content_type))
+            self._responses[key] = compiled
+            return compiled
+        
+        # Strong ETag per representation, computed once
+        digest = hashlib.blake2b(body, digest_size=12).hexdigest().encode("ascii")
+        etag = b'"' + digest + b'"'
+        variants = tuple(self._compress(body, digest, content_type))
+        vary = ((b"vary", b"Accept-Encoding"),) if variants else ()
+        
+        compiled = CompiledResponse(
+            status_code,
+            body,
+            (_content_length(body), content_type, (b"etag", etag)) + vary,
+            etag,
+            ((b"etag", etag),) + vary,
+            variants
+        )
+        self._responses[key] = compiled
+        return compiled
+    
+    def _compress(self, body: bytes, digest: bytes, content_type: Tuple[bytes, bytes]):
+        """Build precompressed variants, most preferred first"""
+        if len(body) < MIN_COMPRESS_SIZE:
+            return
+        
+        encoders = []
+        if brotli is not None:
+            encoders.append((b"br", lambda data: brotli.compress(data, quality=11)))
+        encoders.append((b"gzip", lambda data: gzip.compress(data, compresslevel=9, mtime=0)))
+        
+        for encoding, compress in encoders:
+            compressed = compress(body)
+            if len(compressed) >= len(body):
+                continue
+            etag = b'"' + digest + b"-" + encoding + b'"'
+            common = ((b"etag", etag), (b"vary", b"Accept-Encoding"))
+            yield Representation(
+                encoding,
+                compressed,
+                (_content_length(compressed), content_type, (b"content-encoding", encoding)) + common,
+                etag,
+                common
+            )
+    
+    def get_stats(self) -> Dict[str, int]:
+        """Get cache size and interning statistics"""
+        return {
+            "responses": len(self._responses),
+            "unique_bodies": len(self._bodies),
+            "body_bytes": sum(len(body) for body in self._bodies),
+            "compressed_bytes": sum(
+                len(variant.body) for compiled in self._responses.values() for variant in compiled.variants
+            ),
+            "interned_hits": self.hits
+        }
+    
+    def retain(self, responses: Iterable[CompiledResponse]):
+        """Evict every compiled response, and its body, not in ``responses``
+        
+        Responses stay valid after eviction; only their interning is lost.
+        """
+        live = {id(compiled) for compiled in responses}
+        self._responses = {key: compiled for key, compiled in self._responses.items() if id(compiled) in live}
+        self._bodies = {compiled.body: compiled.body for compiled in self._responses.values()}
+    
+    def clear(self):
+        """Drop all compiled responses"""
+        self._bodies.clear()
+        self._responses.clear()
+        self.hits = 0
\ No newline at end of file
@@ -0,0 +1,281 @@
+"""
+Compiled route index and dispatcher for SimuServer template routes
+"""
+
+import re
+import zlib
+from typing import Dict, Iterator, List, Any, Optional, Tuple
+
+from .faults import FaultRule
+from .latency import LatencyModel
+from .response_cache import CompiledResponse, ResponseCache
+
+PARAM_SEGMENT = re.compile(r"^\{(\w+)(?::\w+)?\}$")
+
+class TemplateRoute:
+    """A template route compiled for dispatch"""
+    
+    __slots__ = ("method", "path", "template_name", "response", "param_names", "latency", "faults",
+                 "label", "route_id")
+    
+    def __init__(self, method: str, path: str, response: CompiledResponse,
+                 template_name: Optional[str] = None, latency: Optional[LatencyModel] = None,
+                 faults: Optional[FaultRule] = None):
+        self.method = method.upper()
+        self.path = path
+        self.template_name = template_name
+        self.response = response
+        self.latency = latency
+        self.faults = faults
+        self.param_names = tuple(
+            match.group(1) for match in map(PARAM_SEGMENT.match, split_path(path)) if match
+        )
+        # Bounded-cardinality key for metrics, the same in every worker process
+        self.label = f"{self.method} {path}"
+        self.route_id = route_id(self.label)
+
+def route_id(label: str) -> int:
+    """Stable 32-bit id of a route label; 0 is reserved for unmatched requests"""
+    return zlib.crc32(label.encode("utf-8")) or 1
+
+class RouteNode:
+    """Trie node: literal children, one wildcard child and routes by method"""
+    
+    __slots__ = ("children", "param_child", "routes")
+    
+    def __init__(self):
+        self.children: Dict[str, "RouteNode"] = {}
+        self.param_child: Optional["RouteNode"] = None
+        self.routes: Dict[str, TemplateRoute] = {}
+
+def split_path(path: str) -> List[str]:
+    """Split a URL path into segments, ignoring leading/trailing slashes"""
+    path = path.strip("/")
+    return path.split("/") if path else []
+
+class RouteIndex:
+    """Radix-style trie of template routes keyed by literal path segments
+    
+    ``{param}`` segments become a single wildcard child per node, so lookup
+    cost depends on path depth rather than on the number of routes. Paths
+    with placeholders inside a segment (``/files/{name}.json``) fall back to
+    a regex list that is only scanned when the trie misses.
+    """
+    
+    def __init__(self):
+        self.root = RouteNode()
+        self.regex_routes: List[Tuple[Any, TemplateRoute]] = []
+        self.route_count = 0
+    
+    def add(self, route: TemplateRoute) -> bool:
+        """Add a route; returns False if method and path are already taken"""
+        segments = split_path(route.path)
+        if any("{" in segment and not PARAM_SEGMENT.match(segment) for segment in segments):
+            return self._add_regex(route)
+        
+        node = self.root
+        for segment in segments:
+            if PARAM_SEGMENT.match(segment):
+                if node.param_child is None:
+                    node.param_child = RouteNode()
+                node = node.param_child
+            else:
+                child = node.children.get(segment)
+                if child is None:
+                    child = node.children[segment] = RouteNode()
+                node = child
+        
+        if route.method in node.routes:
+            return False
+        node.routes[route.method] = route
+        self.route_count += 1
+        return True
+    
+    def _add_regex(self, route: TemplateRoute) -> bool:
+        """Add a route whose placeholders do not span whole segments"""
+        for pattern, existing in self.regex_routes:
+            if existing.method == route.method and existing.path == route.path:
+                return False
+        
+        regex = "^/" + "/".join(
+            re.sub(r"\\\{(\w+)(?::\w+)?\\\}", r"(?P<\1>[^/]+)", re.escape(segment))
+            for segment in split_path(route.path)
+        ) + "$"
+        self.regex_routes.append((re.compile(regex), route))
+        self.route_count += 1
+        return True
+    
+    def match(self, method: str, path: str) -> Tuple[Optional[TemplateRoute], Dict[str, str], bool]:
+        """Match a request to a route
+        
+        Returns (route, path_params, path_matched); path_matched is True when
+        some route exists for the path, even if not for this method.
+        """
+        segments = split_path(path)
+        values: List[str] = []
+        node = self._walk(self.root, segments, 0, method, values)
+        if node is not None:
+            route = node.routes[method]
+            return route, dict(zip(route.param_names, values)), True
+        
+        for regex, route in self.regex_routes:
+            if route.method == method:
+                match = regex.match("/" + "/".join(segments))
+                if match:
+                    return route, match.groupdict(), True
+        
+        path_matched = self._walk(self.root, segments, 0, None, []) is not None or any(
+            regex.match("/" + "/".join(segments)) for regex, _ in self.regex_routes
+        )
+        return None, {}, path_matched
+    
+    def _walk(self, node: RouteNode, segments: List[str], depth: int,
+              method: Optional[str], values: List[str]) -> Optional[RouteNode]:
+        """Depth-first lookup preferring literal segments over wildcards"""
+        if depth == len(segments):
+            if method is None:
+                return node if node.routes else None
+            return node if method in node.routes else None
+        
+        segment = segments[depth]
+        child = node.children.get(segment)
+        if child is not None:
+            found = self._walk(child, segments, depth + 1, method, values)
+            if found is not None:
+                return found
+        
+        if node.param_child is not None:
+            values.append(segment)
+            found = self._walk(node.param_child, segments, depth + 1, method, values)
+            if found is not None:
+                return found
+            values.pop()
+        
+        return None
+    
+    def __len__(self) -> int:
+        return self.route_count
+
+class RouteConflictError(Exception):
+    """Raised when a template route collides with an existing route"""
+
+def route_key(method: str, path: str) -> Tuple[str, str]:
+    """Key identifying a route regardless of placeholder names"""
+    segments = [re.sub(r"\{\w+(?::\w+)?\}", "{}", segment) for segment in split_path(path)]
+    return method.upper(), "/" + "/".join(segments)
+
+class RouteTable:
+    """Immutable, versioned snapshot of the loaded template routes
+    
+    Changes never mutate a published table: they build a new one and the
+    engine swaps the reference, so requests already dispatched finish on
+    the table they started with.
+    
+    ``builtins`` are the server's own routes, which the router serves before
+    any template: templates may not redefine them, and requests they serve
+    never match a template route, even one with a wildcard that covers them.
+    """
+    
+    def __init__(self, templates: Optional[Dict[str, Tuple[TemplateRoute, ...]]] = None,
+                 version: int = 0, builtins: Tuple[TemplateRoute, ...] = ()):
+        self.version = version
+        self.templates: Dict[str, Tuple[TemplateRoute, ...]] = dict(templates or {})
+        self.builtins = builtins
+        self.reserved = {route_key(route.method, route.path): route.template_name for route in builtins}
+        self.builtin_index = RouteIndex()
+        for route in builtins:
+            self.builtin_index.add(route)
+        self.index = RouteIndex()
+        for routes in self.templates.values():
+            for route in routes:
+                self.index.add(route)
+    
+    def match(self, method: str, path: str) -> Tuple[Optional[TemplateRoute], Dict[str, str], bool]:
+        """Match a request against this snapshot"""
+        match = self.index.match(method, path)
+        if match[0] is not None and self.builtin_index.match(method, path)[0] is not None:
+            return None, {}, False
+        return match
+    
+    def responses(self) -> Iterator[CompiledResponse]:
+        """Compiled responses, fault responses included, that this table can serve"""
+        for routes in self.templates.values():
+            for route in routes:
+                yield route.response
+                if route.faults is not None:
+                    yield from route.faults.responses
+    
+    def route_labels(self) -> Dict[int, str]:
+        """Map route ids to labels for every route in the table"""
+        return {route.route_id: route.label for routes in self.templates.values() for route in routes}
+    
+    def find_conflicts(self, template_name: str, routes: Tuple[TemplateRoute, ...]) -> List[str]:
+        """Describe routes that collide with built-ins, other templates or each other"""
+        owners: Dict[Tuple[str, str], str] = dict(self.reserved)
+        for name, existing in self.templates.items():
+            if name != template_name:
+                for route in existing:
+                    owners[route_key(route.method, route.path)] = name
+        
+        conflicts = []
+        seen = set()
+        for route in routes:
+            key = route_key(route.method, route.path)
+            if key in seen:
+                conflicts.append(f"{route.method} {route.path} is defined twice")
+            elif key in owners:
+                conflicts.append(f"{route.method} {route.path} is already served by {owners[key]}")
+            seen.add(key)
+        return conflicts
+    
+    def with_template(self, template_name: str, routes: Tuple[TemplateRoute, ...]) -> "RouteTable":
+        """Return a new table with the template added or replaced"""
+        conflicts = self.find_conflicts(template_name, routes)
+        if conflicts:
+            raise RouteConflictError("; ".join(conflicts))
+        
+        templates = dict(self.templates)
+        templates[template_name] = routes
+        return RouteTable(templates, self.version + 1, self.builtins)
+    
+    def without_template(self, template_name: str) -> "RouteTable":
+        """Return a new table without the template"""
+        templates = dict(self.templates)
+        templates.pop(template_name, None)
+        return RouteTable(templates, self.version + 1, self.builtins)
+    
+    def cleared(self) -> "RouteTable":
+        """Return a new, empty table"""
+        return RouteTable({}, self.version + 1, self.builtins)
+
+class TemplateDispatcher:
+    """Single ASGI handler serving all template routes from the engine's RouteTable"""
+    
+    def __init__(self, engine):
+        self.engine = engine
+        cache: ResponseCache = engine.response_cache
+        self.not_found = cache.compile({"detail": "Not Found"}, status_code=404)
+        self.method_not_allowed = cache.compile({"detail": "Method Not Allowed"}, status_code=405)
+    
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            if scope["type"] == "websocket":
+                await send({"type": "websocket.close", "code": 1000})
+            return
+        
+        # HEAD is served by GET routes, like Starlette does
+        method = "GET" if scope["method"] == "HEAD" else scope["method"]
+        # Reuse the pipeline's lookup so the request stays on the table it was matched against;
+        # otherwise read the published table once, a concurrent swap does not affect this request
+        match = scope.get("simuserver.match")
+        if match is None:
+            match = self.engine.route_table.match(method, scope["path"])
+        route, path_params, path_matched = match
+        if route is None:
+            await (self.method_not_allowed if path_matched else self.not_found).send_to(send)
+            return
+        
+        scope["path_params"] = path_params
+        scope["simuserver.route"] = route
+        # Conditional GET only applies to safe methods; encoding negotiation to all
+        await route.response.send_to(send, scope["headers"], conditional=method == "GET")
\ No newline at end of file
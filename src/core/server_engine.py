@@ -3,21 +3,32 @@ Server engine for SimuServer - FastAPI-based HTTP and WebSocket server
 """
 
 import asyncio
+import itertools
+import random
 import threading
 import time
-import uvicorn
 from datetime import datetime
-from typing import Dict, List, Any, Optional, Callable
-from pathlib import Path
+from typing import Dict, List, Any, Optional, Callable, Tuple
 
-from fastapi import FastAPI, Request, Response, WebSocket, HTTPException
+from fastapi import FastAPI, Response, WebSocket, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.staticfiles import StaticFiles
-from fastapi.responses import JSONResponse, FileResponse
-import psutil
+from fastapi.routing import APIRoute
 
+from .config import Settings, SETTINGS_KEYS
 from .request_logger import RequestLogger
 from .performance_monitor import PerformanceMonitor
+from .response_cache import ResponseCache
+from .middleware import RequestPipelineMiddleware
+from .worker_pool import WorkerPool
+from .route_index import RouteTable, TemplateDispatcher, TemplateRoute
+from .latency import DelayScheduler, parse_latency_model
+from .faults import FaultInjector, parse_fault_rule
+from .journal import RequestJournal
+from .prometheus import MetricsExporter, CONTENT_TYPE
+from .websocket_hub import WebSocketHub
+
+# How long stop_server waits for in-flight requests before closing the journal
+SERVER_STOP_TIMEOUT = 5.0
 
 class ServerEngine:
     """Main server engine using FastAPI"""
@@ -30,28 +41,55 @@ class ServerEngine:
         self.server_thread = None
         self.is_running = False
         self.start_time = None
+        # uvicorn's own logging, access log included; the headless --quiet turns it down
+        self.server_log_level = "info"
         
         # Components
-        self.request_logger = RequestLogger(max_entries=config.get("logging.max_entries", 1000))
-        self.performance_monitor = PerformanceMonitor(
-            update_interval=config.get("performance.update_interval", 1.0)
-        )
+        settings = config.settings
+        self.request_logger = RequestLogger(max_entries=settings.max_log_entries)
+        self.performance_monitor = PerformanceMonitor(update_interval=settings.update_interval,
+                                                      data_directory=config.get_data_directory)
+        self.journal: Optional[RequestJournal] = None
+        self.metrics_exporter = MetricsExporter(self)
         
-        # WebSocket connections
-        self.websocket_connections: List[WebSocket] = []
+        # WebSocket connections, each with its own outbound queue
+        self.websocket_hub = WebSocketHub(config)
+        # Worker mode: forwards broadcasts to the other workers' clients
+        self.websocket_relay: Optional[Callable[[Any], None]] = None
         
         # Templates and routes
         self.active_templates: List[str] = []
         self.custom_routes: Dict[str, Any] = {}
+        self.response_cache = ResponseCache()
+        self.route_table = RouteTable()
+        # Every route id ever served, so analytics can still name unloaded routes
+        self.route_labels: Dict[int, str] = {}
+        # Worker mode: (computed at, report) of the last whole-server route latency
+        self._shared_route_latency: Optional[Tuple[float, Dict[str, Dict[str, Any]]]] = None
+        self._route_table_lock = threading.Lock()
+        self.template_data: Dict[str, Dict[str, Any]] = {}
+        
+        # Simulated latency and faults; a fixed simulation.seed makes runs replayable
+        self.delay_scheduler = DelayScheduler()
+        self.latency_rng = random.Random(settings.seed)
+        self.fault_injector = FaultInjector(self.response_cache, settings.seed)
+        
+        # Multi-process worker mode
+        self.worker_pool: Optional[WorkerPool] = None
+        self.shared_metrics = None
+        self.worker_id: Optional[int] = None
         
         self._setup_middleware()
         self._setup_default_routes()
         self._setup_websocket_routes()
+        self._setup_template_dispatcher()
+        
+        config.subscribe(self._on_settings_changed)
     
     def _setup_middleware(self):
         """Setup FastAPI middleware"""
         # CORS middleware
-        if self.config.get("simulation.enable_cors", True):
+        if self.config.settings.enable_cors:
             self.app.add_middleware(
                 CORSMiddleware,
                 allow_origins=["*"],
@@ -60,45 +98,13 @@ class ServerEngine:
                 allow_headers=["*"],
             )
         
-        # Request logging middleware
-        @self.app.middleware("http")
-        async def log_requests(request: Request, call_next):
-            start_time = time.time()
-            
-            # Add artificial delay if configured
-            delay = self.config.get("simulation.default_delay_ms", 0)
-            if delay > 0:
-                await asyncio.sleep(delay / 1000)
-            
-            # Simulate errors if configured
-            error_rate = self.config.get("simulation.error_rate", 0.0)
-            if error_rate > 0 and time.time() % 1 < error_rate:
-                return JSONResponse(
-                    status_code=500,
-                    content={"error": "Simulated server error"}
-                )
-            
-            response = await call_next(request)
-            process_time = time.time() - start_time
-            
-            # Log the request
-            self.request_logger.log_request(
-                method=request.method,
-                url=str(request.url),
-                headers=dict(request.headers),
-                status_code=response.status_code,
-                response_time=process_time,
-                timestamp=datetime.now()
-            )
-            
-            # Update performance metrics
-            self.performance_monitor.update_request_count()
-            
-            # Notify GUI if callback provided
-            if self.log_callback:
-                self.log_callback(f"{request.method} {request.url.path} - {response.status_code} ({process_time:.3f}s)")
-            
-            return response
+        # Request pipeline: delay, error injection, logging and metrics
+        self.app.add_middleware(RequestPipelineMiddleware, engine=self)
+        
+        # Loop health is measured on the loop that serves requests
+        loop_health = self.performance_monitor.loop_health
+        self.app.add_event_handler("startup", loop_health.attach)
+        self.app.add_event_handler("shutdown", loop_health.detach)
     
     def _setup_default_routes(self):
         """Setup default API routes"""
@@ -129,14 +135,53 @@ class ServerEngine:
                 "uptime": time.time() - self.start_time if self.start_time else 0,
                 "performance": metrics,
                 "active_templates": self.active_templates,
-                "total_requests": self.request_logger.get_total_requests(),
-                "connected_websockets": len(self.websocket_connections)
+                "total_requests": self.get_total_requests(),
+                "connected_websockets": self.get_websocket_connections(),
+                "websockets": {**self.websocket_hub.get_stats(), "worker": self.worker_id},
+                "route_latency": self.get_route_latency(),
+                "faults": self.fault_injector.get_stats(),
+                "journal": self.journal.get_stats() if self.journal else None
             }
         
         @self.app.get("/api/requests")
-        async def get_requests():
-            """Get recent requests for inspection"""
-            return self.request_logger.get_recent_requests()
+        async def get_requests(since: Optional[str] = None):
+            """Get recent requests for inspection, or only those after a cursor"""
+            if since is None:
+                return self.get_request_history()
+            requests, cursor = self.get_requests_since(since)
+            return {"cursor": cursor, "requests": requests}
+        
+        @self.app.get("/metrics")
+        async def metrics():
+            """Prometheus text exposition of request, fault and process metrics"""
+            return Response(content=self.metrics_exporter.render(), media_type=CONTENT_TYPE)
+        
+        @self.app.get("/api/analytics")
+        async def get_analytics(window: Optional[float] = None, bucket: float = 1.0):
+            """Per-route percentiles, status counts and a timeline over the request log"""
+            return self.get_analytics(window, bucket)
+        
+        @self.app.get("/api/journal")
+        async def get_journal(start: Optional[float] = None, end: Optional[float] = None,
+                              limit: int = 1000):
+            """Get journalled requests in a time range (Unix timestamps)"""
+            if self.journal is None:
+                raise HTTPException(status_code=404, detail="Request journal is disabled")
+            return self.journal.range(start, end, max(1, min(limit, 10000)))
+        
+        @self.app.get("/api/journal/{request_id}")
+        async def get_journal_entry(request_id: int):
+            """Get one journalled request by id"""
+            entry = self.journal.get(request_id) if self.journal else None
+            if entry is None:
+                raise HTTPException(status_code=404, detail="Request not found in journal")
+            return entry
+        
+        @self.app.post("/api/faults/reset")
+        async def reset_faults(seed: Optional[int] = None):
+            """Reseed latency and fault injection and clear the fault counters"""
+            self.reseed(seed if seed is not None else self.config.settings.seed)
+            return self.fault_injector.get_stats()
         
         @self.app.post("/api/simulate/error")
         async def simulate_error(error_code: int = 500):
@@ -149,7 +194,7 @@ class ServerEngine:
         @self.app.websocket("/ws")
         async def websocket_endpoint(websocket: WebSocket):
             await websocket.accept()
-            self.websocket_connections.append(websocket)
+            client = self._add_websocket(websocket)
             
             try:
                 while True:
@@ -160,14 +205,13 @@ class ServerEngine:
                 if self.log_callback:
                     self.log_callback(f"WebSocket disconnected: {str(e)}")
             finally:
-                if websocket in self.websocket_connections:
-                    self.websocket_connections.remove(websocket)
+                self._remove_websocket(client)
         
         @self.app.websocket("/ws/chat")
         async def chat_websocket(websocket: WebSocket):
             """Simple chat WebSocket for testing messaging apps"""
             await websocket.accept()
-            self.websocket_connections.append(websocket)
+            client = self._add_websocket(websocket)
             
             try:
                 while True:
@@ -182,78 +226,204 @@ class ServerEngine:
             except Exception:
                 pass
             finally:
-                if websocket in self.websocket_connections:
-                    self.websocket_connections.remove(websocket)
+                self._remove_websocket(client)
+    
+    def _add_websocket(self, websocket: WebSocket):
+        """Register a connection with the hub and publish the new count"""
+        client = self.websocket_hub.add(websocket)
+        self._publish_websocket_count()
+        return client
+    
+    def _remove_websocket(self, client):
+        """Unregister a connection and publish the new count"""
+        self.websocket_hub.remove(client)
+        self._publish_websocket_count()
+    
+    def _publish_websocket_count(self):
+        if self.shared_metrics is not None:
+            self.shared_metrics.set_websocket_connections(self.worker_id, len(self.websocket_hub))
+    
+    def _setup_template_dispatcher(self):
+        """Mount the single handler that serves every template route"""
+        # Built-in routes win over templates, so templates may not reuse or shadow them
+        builtins = tuple(
+            TemplateRoute(method, route.path, None, "SimuServer")
+            for route in self.app.routes if isinstance(route, APIRoute)
+            for method in route.methods
+        )
+        self.route_table = RouteTable(builtins=builtins)
+        
+        # Mounted last so the built-in routes above keep precedence
+        self.template_dispatcher = TemplateDispatcher(self)
+        self.app.mount("/", self.template_dispatcher)
     
     async def _broadcast_message(self, message: Any):
         """Broadcast message to all connected WebSocket clients"""
-        if not self.websocket_connections:
-            return
-        
-        disconnected = []
-        for websocket in self.websocket_connections:
-            try:
-                if isinstance(message, str):
-                    await websocket.send_text(message)
-                else:
-                    await websocket.send_json(message)
-            except Exception:
-                disconnected.append(websocket)
-        
-        # Remove disconnected clients
-        for ws in disconnected:
-            if ws in self.websocket_connections:
-                self.websocket_connections.remove(ws)
+        # Only queues the message; each client's writer task sends it
+        self.websocket_hub.broadcast(message)
+        if self.websocket_relay is not None:
+            self.websocket_relay(message)
     
-    def load_template(self, template_name: str, template_data: Dict[str, Any]):
-        """Load an API template"""
+    def load_template(self, template_name: str, template_data: Dict[str, Any]) -> bool:
+        """Load an API template, atomically replacing one with the same name"""
         try:
-            routes = template_data.get("routes", [])
-            for route in routes:
-                self._add_dynamic_route(
-                    method=route["method"],
-                    path=route["path"],
-                    response=route["response"],
-                    status_code=route.get("status_code", 200)
-                )
+            # Template-level "latency" and "faults" apply to routes without their own
+            defaults = {key: template_data[key] for key in ("latency", "faults") if key in template_data}
+            routes = tuple(
+                self._compile_route(route, template_name, defaults)
+                for route in template_data.get("routes", [])
+            )
+            
+            with self._route_table_lock:
+                reloaded = template_name in self.route_table.templates
+                self._publish_route_table(self.route_table.with_template(template_name, routes))
+                self.template_data[template_name] = template_data
             
-            self.active_templates.append(template_name)
+            if self.worker_pool:
+                self.worker_pool.broadcast("load_template", template_name, template_data)
             if self.log_callback:
-                self.log_callback(f"Loaded template: {template_name}")
+                action = "Reloaded" if reloaded else "Loaded"
+                self.log_callback(f"{action} template: {template_name}")
+            return True
             
         except Exception as e:
             if self.log_callback:
                 self.log_callback(f"Error loading template {template_name}: {str(e)}")
+            return False
+    
+    def unload_template(self, template_name: str) -> bool:
+        """Remove a template's routes while the server keeps running"""
+        with self._route_table_lock:
+            if template_name not in self.route_table.templates:
+                return False
+            self._publish_route_table(self.route_table.without_template(template_name))
+            self.template_data.pop(template_name, None)
+        
+        if self.worker_pool:
+            self.worker_pool.broadcast("unload_template", template_name)
+        if self.log_callback:
+            self.log_callback(f"Unloaded template: {template_name}")
+        return True
+    
+    def clear_templates(self):
+        """Remove all template routes while the server keeps running"""
+        with self._route_table_lock:
+            self._publish_route_table(self.route_table.cleared())
+            self.template_data.clear()
+        
+        if self.worker_pool:
+            self.worker_pool.broadcast("clear_templates")
+        if self.log_callback:
+            self.log_callback("Cleared all templates")
+    
+    def _publish_route_table(self, route_table: RouteTable):
+        """Swap in a new route table; in-flight requests keep the old one"""
+        self.route_table = route_table
+        self.active_templates = list(route_table.templates)
+        self.route_labels = {**self.route_labels, **route_table.route_labels()}
+        self._evict_responses()
     
-    def _add_dynamic_route(self, method: str, path: str, response: Any, status_code: int = 200):
-        """Add a dynamic route to the FastAPI app"""
-        async def dynamic_handler(request: Request):
-            return JSONResponse(content=response, status_code=status_code)
-        
-        # Add route based on method
-        if method.upper() == "GET":
-            self.app.get(path)(dynamic_handler)
-        elif method.upper() == "POST":
-            self.app.post(path)(dynamic_handler)
-        elif method.upper() == "PUT":
-            self.app.put(path)(dynamic_handler)
-        elif method.upper() == "DELETE":
-            self.app.delete(path)(dynamic_handler)
+    def _evict_responses(self):
+        """Drop cached responses that no longer back a route, e.g. after a reload"""
+        dispatcher = self.template_dispatcher
+        self.response_cache.retain(itertools.chain(
+            self.route_table.responses(),
+            (dispatcher.not_found, dispatcher.method_not_allowed),
+            self.fault_injector.responses()
+        ))
+    
+    def _compile_route(self, route: Dict[str, Any], template_name: str,
+                       defaults: Optional[Dict[str, Any]] = None) -> TemplateRoute:
+        """Compile a template route definition for dispatch"""
+        defaults = defaults or {}
+        # Encode the static payload once; every hit replays the same bytes
+        compiled = self.response_cache.compile(route["response"], route.get("status_code", 200))
+        latency = parse_latency_model(route.get("latency", defaults.get("latency")))
+        faults = parse_fault_rule(route.get("faults", defaults.get("faults")), self.response_cache)
+        return TemplateRoute(route["method"], route["path"], compiled, template_name, latency, faults)
+    
+    def reseed(self, seed: Optional[int] = None):
+        """Restart the latency and fault random streams, e.g. to replay a run"""
+        self.latency_rng.seed(seed)
+        self.fault_injector.reset(seed)
+    
+    def _on_settings_changed(self, old: Settings, new: Settings):
+        """React to a new settings snapshot published by Config"""
+        if new.seed != old.seed:
+            # Pool workers offset the seed by their id, see _worker_main
+            offset = self.worker_id or 0
+            self.reseed(new.seed + offset if new.seed is not None else None)
+        
+        # Worker processes have their own Config; forward what changed
+        if self.worker_pool:
+            changed = {
+                SETTINGS_KEYS[field][0]: value
+                for field, value in new._asdict().items()
+                if getattr(old, field) != value
+            }
+            self.worker_pool.broadcast("update_config", changed)
+    
+    def attach_shared_metrics(self, shared_metrics, worker_id: int):
+        """Report requests into shared memory when running as a pool worker"""
+        self.shared_metrics = shared_metrics
+        self.worker_id = worker_id
+        self.performance_monitor.rate_source = shared_metrics.get_requests_per_second
+    
+    def _get_shared_metrics(self):
+        """Get whole-server metrics if running in (or managing) a worker pool"""
+        if self.shared_metrics is not None:
+            return self.shared_metrics
+        if self.worker_pool and self.worker_pool.metrics:
+            return self.worker_pool.metrics
+        return None
+    
+    def open_journal(self, worker_id: Optional[int] = None, workers: int = 1):
+        """Start journalling requests to the data directory, if enabled"""
+        if self.journal is not None or not self.config.get("storage.journal_enabled", False):
+            return
+        try:
+            max_bytes = int(self.config.get("storage.max_file_size_mb", 100) * 1024 * 1024)
+            prefix = "requests" if worker_id is None else f"requests-w{worker_id}"
+            self.journal = RequestJournal(self.config.get_data_directory() / "journal",
+                                          max_bytes, prefix, worker_id=worker_id, workers=workers,
+                                          max_segments=int(self.config.get("storage.journal_max_segments", 10)),
+                                          log_callback=self.log_callback)
+            self.journal.start()
+        except OSError as e:
+            self.journal = None
+            if self.log_callback:
+                self.log_callback(f"Request journal disabled: {str(e)}")
+    
+    def close_journal(self):
+        """Flush and close the request journal"""
+        journal, self.journal = self.journal, None
+        if journal is not None:
+            journal.close()
     
     def start_server(self):
-        """Start the server in a separate thread"""
+        """Start the server in a separate thread, or as a pool of worker processes"""
         if self.is_running:
             return False
         
+        settings = self.config.settings
+        workers = max(1, settings.workers)
+        if workers > 1:
+            return self._start_worker_pool(workers)
+        
+        # Imported lazily to keep headless cold start fast
+        import uvicorn
+        
+        self.open_journal()
+        
         def run_server():
             self.start_time = time.time()
             self.performance_monitor.start()
             
             config = uvicorn.Config(
                 self.app,
-                host=self.config.get("server.host", "127.0.0.1"),
-                port=self.config.get("server.port", 8000),
-                log_level="info"
+                host=settings.host,
+                port=settings.port,
+                log_level=self.server_log_level
             )
             self.server = uvicorn.Server(config)
             asyncio.run(self.server.serve())
@@ -263,16 +433,41 @@ class ServerEngine:
         self.is_running = True
         
         if self.log_callback:
-            self.log_callback(f"Server started on {self.config.get('server.host')}:{self.config.get('server.port')}")
+            self.log_callback(f"Server started on {settings.host}:{settings.port}")
+        
+        return True
+    
+    def _start_worker_pool(self, workers: int):
+        """Start N worker processes sharing one listening socket"""
+        self.worker_pool = WorkerPool(self.config, workers, self.template_data)
+        self.worker_pool.start()
+        self.start_time = time.time()
+        
+        self.performance_monitor.rate_source = self.worker_pool.metrics.get_requests_per_second
+        self.performance_monitor.start()
+        self.is_running = True
+        
+        if self.log_callback:
+            settings = self.config.settings
+            self.log_callback(f"Server started on {settings.host}:{settings.port} with {workers} workers")
         
         return True
     
     def stop_server(self):
         """Stop the server"""
-        if not self.is_running or not self.server:
+        if not self.is_running or not (self.server or self.worker_pool):
             return False
         
-        self.server.should_exit = True
+        if self.worker_pool:
+            self.worker_pool.stop()
+            self.worker_pool = None
+            self.performance_monitor.rate_source = None
+        else:
+            self.server.should_exit = True
+            # Requests still in flight append to the journal until the server exits
+            if self.server_thread is not None:
+                self.server_thread.join(timeout=SERVER_STOP_TIMEOUT)
+            self.close_journal()
         self.performance_monitor.stop()
         self.is_running = False
         
@@ -281,10 +476,74 @@ class ServerEngine:
         
         return True
     
+    def is_serving(self) -> bool:
+        """Whether the server thread, or a pool worker, is still running"""
+        if self.worker_pool:
+            return self.worker_pool.alive()
+        return self.server_thread is not None and self.server_thread.is_alive()
+    
     def get_performance_data(self):
         """Get current performance metrics"""
         return self.performance_monitor.get_current_metrics()
     
     def get_request_history(self):
         """Get request history for inspection"""
-        return self.request_logger.get_recent_requests() 
\ No newline at end of file
+        shared_metrics = self._get_shared_metrics()
+        if shared_metrics is not None:
+            return shared_metrics.get_recent_requests()
+        return self.request_logger.get_recent_requests()
+    
+    def get_requests_since(self, cursor: Optional[str] = None) -> Tuple[List[Dict[str, Any]], str]:
+        """Get requests after an opaque cursor, plus the cursor to poll with next"""
+        shared_metrics = self._get_shared_metrics()
+        if shared_metrics is not None:
+            return shared_metrics.since(cursor)
+        
+        start = int(cursor) if cursor and cursor.isdigit() else 0
+        requests, next_cursor = self.request_logger.since(start)
+        return requests, str(next_cursor)
+    
+    def get_analytics(self, window: Optional[float] = None, bucket: float = 1.0) -> Dict[str, Any]:
+        """Summarize the request log, optionally only the last ``window`` seconds"""
+        # numpy is only needed once someone asks for a report
+        from .analytics import RequestAnalytics, columns_from_logger, columns_from_shared
+        
+        shared_metrics = self._get_shared_metrics()
+        if shared_metrics is not None:
+            columns = columns_from_shared(shared_metrics)
+        else:
+            columns = columns_from_logger(self.request_logger)
+        since = time.time() - window if window else None
+        return RequestAnalytics(columns, self.route_labels, since).summary(bucket)
+    
+    def get_route_latency(self) -> Dict[str, Dict[str, Any]]:
+        """Latency percentiles per route template over the last 10s, 1m and the run"""
+        shared_metrics = self._get_shared_metrics()
+        if shared_metrics is None:
+            return self.performance_monitor.get_route_latency()
+        
+        # Each worker only has its own histograms; derive whole-server numbers,
+        # at most once per monitor sampling interval
+        now = time.time()
+        cached = self._shared_route_latency
+        if cached is not None and now - cached[0] < self.config.settings.update_interval:
+            return cached[1]
+        
+        from .analytics import columns_from_shared, route_latency_windows
+        report = route_latency_windows(columns_from_shared(shared_metrics), self.route_labels, now)
+        self._shared_route_latency = (now, report)
+        return report
+    
+    def get_websocket_connections(self) -> int:
+        """Get open WebSocket connections, across all workers"""
+        shared_metrics = self._get_shared_metrics()
+        if shared_metrics is not None:
+            return shared_metrics.get_websocket_connections()
+        return len(self.websocket_hub)
+    
+    def get_total_requests(self) -> int:
+        """Get total number of requests served, across all workers"""
+        shared_metrics = self._get_shared_metrics()
+        if shared_metrics is not None:
+            return shared_metrics.get_total_requests()
+        return self.request_logger.get_total_requests() 
\ No newline at end of file
@@ -0,0 +1,167 @@
+"""
+WebSocket fan-out for SimuServer
+"""
+
+import asyncio
+import json
+import time
+from collections import deque
+from typing import Dict, List, Any, Optional, Set
+
+from .histogram import LatencyHistogram
+
+# What to do when a client's outbound queue is full
+OVERFLOW_POLICIES = ("drop_oldest", "drop_newest", "disconnect")
+# Close code sent to clients disconnected for falling behind (policy violation)
+OVERFLOW_CLOSE_CODE = 1008
+CLOSE_TIMEOUT = 1.0
+
+class WebSocketClient:
+    """One connection's bounded outbound queue and the task that drains it"""
+    
+    __slots__ = ("websocket", "pending", "wakeup", "task", "dropped")
+    
+    def __init__(self, websocket):
+        self.websocket = websocket
+        # (ASGI send event, perf_counter when queued)
+        self.pending: deque = deque()
+        self.wakeup = asyncio.Event()
+        self.task: Optional[asyncio.Task] = None
+        self.dropped = 0
+
+class WebSocketHub:
+    """Broadcasts to WebSocket clients without letting one client hold up the rest
+    
+    ``broadcast`` serializes a message once and appends the same send event
+    to every client's queue without awaiting anything; each client has its
+    own writer task, so a slow or stalled client only backs up its own
+    queue. When a queue holds ``server.websocket_queue_size`` messages,
+    ``server.websocket_overflow`` decides: drop the oldest queued message,
+    drop the new one, or disconnect the client.
+    
+    Fan-out latency, from broadcast to the send completing, is recorded per
+    delivery. Runs entirely on the server's event loop.
+    """
+    
+    def __init__(self, config):
+        self.config = config
+        self.clients: List[WebSocketClient] = []
+        self.fanout_latency = LatencyHistogram()
+        self.broadcasts = 0
+        self.delivered = 0
+        self.dropped = 0
+        self.disconnected = 0
+        # Close tasks of disconnected clients, kept referenced until they finish
+        self._closing: Set[asyncio.Task] = set()
+        # The loop clients were added on, for broadcasts from other threads
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+    
+    def __len__(self) -> int:
+        return len(self.clients)
+    
+    def add(self, websocket) -> WebSocketClient:
+        """Register an accepted connection and start its writer"""
+        client = WebSocketClient(websocket)
+        self._loop = asyncio.get_running_loop()
+        client.task = self._loop.create_task(self._writer(client))
+        self.clients = self.clients + [client]
+        return client
+    
+    def remove(self, client: WebSocketClient):
+        """Unregister a connection and stop its writer"""
+        if client in self.clients:
+            self.clients = [c for c in self.clients if c is not client]
+        if client.task is not None and client.task is not asyncio.current_task():
+            client.task.cancel()
+        client.task = None
+    
+    def broadcast(self, message: Any) -> int:
+        """Queue a text or JSON message for every client; returns how many accepted it"""
+        if isinstance(message, str):
+            text = message
+        else:
+            # Same encoding as WebSocket.send_json, done once for all clients
+            text = json.dumps(message, separators=(",", ":"), ensure_ascii=False)
+        item = ({"type": "websocket.send", "text": text}, time.perf_counter())
+        
+        settings = self.config.settings
+        limit = max(1, settings.websocket_queue_size)
+        policy = settings.websocket_overflow
+        self.broadcasts += 1
+        accepted = 0
+        for client in self.clients:
+            pending = client.pending
+            if len(pending) >= limit:
+                if policy == "disconnect":
+                    self._disconnect(client)
+                    continue
+                client.dropped += 1
+                self.dropped += 1
+                if policy == "drop_newest":
+                    continue
+                pending.popleft()
+            pending.append(item)
+            client.wakeup.set()
+            accepted += 1
+        return accepted
+    
+    def broadcast_threadsafe(self, message: Any):
+        """Broadcast from another thread, e.g. a message relayed by another worker"""
+        loop = self._loop
+        if loop is None or not self.clients:
+            return
+        try:
+            loop.call_soon_threadsafe(self.broadcast, message)
+        except RuntimeError:  # the loop has closed
+            pass
+    
+    async def _writer(self, client: WebSocketClient):
+        """Send a client's queued messages in order until it goes away"""
+        pending = client.pending
+        send = client.websocket.send
+        try:
+            while True:
+                while not pending:
+                    client.wakeup.clear()
+                    await client.wakeup.wait()
+                event, queued_at = pending.popleft()
+                await send(event)
+                self.fanout_latency.record(time.perf_counter() - queued_at)
+                self.delivered += 1
+        except asyncio.CancelledError:
+            pass
+        except Exception:
+            # The receive loop of the endpoint sees the disconnect and cleans up too
+            self.remove(client)
+    
+    def _disconnect(self, client: WebSocketClient):
+        """Drop a client that cannot keep up and close it in the background"""
+        self.remove(client)
+        client.pending.clear()
+        self.disconnected += 1
+        
+        async def close():
+            try:
+                await asyncio.wait_for(client.websocket.close(code=OVERFLOW_CLOSE_CODE), CLOSE_TIMEOUT)
+            except Exception:
+                pass
+        
+        task = asyncio.get_running_loop().create_task(close())
+        self._closing.add(task)
+        task.add_done_callback(self._closing.discard)
+    
+    def get_stats(self) -> Dict[str, Any]:
+        """Client count, delivery counters and fan-out latency in milliseconds"""
+        settings = self.config.settings
+        clients = list(self.clients)
+        return {
+            "clients": len(clients),
+            "queue_size": settings.websocket_queue_size,
+            "overflow": settings.websocket_overflow,
+            "queued": sum(len(client.pending) for client in clients),
+            "broadcasts": self.broadcasts,
+            "delivered": self.delivered,
+            "dropped": self.dropped,
+            "disconnected": self.disconnected,
+            "fanout_ms": self.fanout_latency.summary()
+        }
\ No newline at end of file
@@ -0,0 +1,334 @@
+"""
+Multi-process worker mode for SimuServer with shared-memory metrics
+"""
+
+import multiprocessing
+import shutil
+import socket
+import struct
+import tempfile
+import threading
+import time
+from datetime import datetime
+from multiprocessing import shared_memory
+from typing import Dict, List, Any, Optional, Tuple
+
+multiprocessing.allow_connection_pickling()
+spawn = multiprocessing.get_context("spawn")
+
+# Per-worker slot: header (total requests, ring write index, open WebSocket
+# connections), per-second rate buckets, then a ring of fixed-size request records.
+HEADER = struct.Struct("<QQQ")
+BUCKET = struct.Struct("<QQ")
+# One more than the longest rate window, plus the second being written
+RATE_BUCKETS = 62
+RECORD = struct.Struct("<dffHI8s230s")
+URL_BYTES = 230
+
+class SharedMetrics:
+    """Request counters and recent-request rings shared by all workers
+    
+    Each worker owns one slot and is its only writer, so no locks are needed:
+    a record is written first and published by bumping the ring index.
+    Readers merge every slot to get whole-server numbers.
+    """
+    
+    def __init__(self, workers: int, ring_size: int = 1000, name: Optional[str] = None):
+        self.workers = workers
+        self.ring_size = ring_size
+        self.slot_size = HEADER.size + RATE_BUCKETS * BUCKET.size + ring_size * RECORD.size
+        self._owner = name is None
+        if self._owner:
+            self.shm = shared_memory.SharedMemory(create=True, size=workers * self.slot_size)
+            self.shm.buf[:workers * self.slot_size] = bytes(workers * self.slot_size)
+        else:
+            self.shm = shared_memory.SharedMemory(name=name)
+        self.name = self.shm.name
+    
+    def _slot(self, worker_id: int) -> int:
+        return worker_id * self.slot_size
+    
+    def record(self, worker_id: int, method: str, url: str, status_code: int,
+               response_time: float, timestamp: float, simulated_delay: float = 0.0,
+               route_id: int = 0):
+        """Record one request in this worker's slot"""
+        buf = self.shm.buf
+        base = self._slot(worker_id)
+        total, index, websockets = HEADER.unpack_from(buf, base)
+        
+        # Per-second rate bucket
+        second = int(timestamp)
+        bucket_offset = base + HEADER.size + (second % RATE_BUCKETS) * BUCKET.size
+        bucket_second, bucket_count = BUCKET.unpack_from(buf, bucket_offset)
+        if bucket_second != second:
+            bucket_count = 0
+        BUCKET.pack_into(buf, bucket_offset, second, bucket_count + 1)
+        
+        # Ring record, published by the index update below
+        record_offset = (base + HEADER.size + RATE_BUCKETS * BUCKET.size
+                         + (index % self.ring_size) * RECORD.size)
+        RECORD.pack_into(
+            buf, record_offset,
+            timestamp, response_time, simulated_delay, status_code, route_id,
+            method.encode("ascii", "replace")[:8],
+            url.encode("utf-8")[:URL_BYTES]
+        )
+        HEADER.pack_into(buf, base, total + 1, index + 1, websockets)
+    
+    def set_websocket_connections(self, worker_id: int, count: int):
+        """Publish this worker's open WebSocket connection count"""
+        base = self._slot(worker_id)
+        total, index, _ = HEADER.unpack_from(self.shm.buf, base)
+        HEADER.pack_into(self.shm.buf, base, total, index, count)
+    
+    def get_websocket_connections(self) -> int:
+        """Get open WebSocket connections across all workers"""
+        buf = self.shm.buf
+        return sum(HEADER.unpack_from(buf, self._slot(w))[2] for w in range(self.workers))
+    
+    def get_total_requests(self) -> int:
+        """Get total requests across all workers"""
+        buf = self.shm.buf
+        return sum(HEADER.unpack_from(buf, self._slot(w))[0] for w in range(self.workers))
+    
+    def get_requests_per_second(self, window: int = 1) -> float:
+        """Get request rate over the last ``window`` complete seconds across all workers"""
+        buf = self.shm.buf
+        window = max(1, min(window, RATE_BUCKETS - 2))
+        current = int(time.time())
+        count = 0
+        for worker_id in range(self.workers):
+            buckets = self._slot(worker_id) + HEADER.size
+            for second in range(current - window, current):
+                bucket_second, bucket_count = BUCKET.unpack_from(buf, buckets + (second % RATE_BUCKETS) * BUCKET.size)
+                if bucket_second == second:
+                    count += bucket_count
+        return count / window
+    
+    def _read_worker(self, worker_id: int, start: int = 0) -> Tuple[List[Dict[str, Any]], int]:
+        """Read one worker's ring from sequence ``start``; returns (records, ring index)"""
+        buf = self.shm.buf
+        base = self._slot(worker_id)
+        _, index, _ = HEADER.unpack_from(buf, base)
+        if start > index:
+            start = 0
+        # Skip the oldest slot: the writer may be overwriting it right now
+        first = max(start, index - self.ring_size + 1)
+        ring_base = base + HEADER.size + RATE_BUCKETS * BUCKET.size
+        records = []
+        for seq in range(first, index):
+            timestamp, response_time, delay, status_code, _, method, url = RECORD.unpack_from(
+                buf, ring_base + (seq % self.ring_size) * RECORD.size
+            )
+            records.append({
+                "id": seq * self.workers + worker_id + 1,
+                "worker": worker_id,
+                "method": method.rstrip(b"\0").decode("ascii", "replace"),
+                "url": url.rstrip(b"\0").decode("utf-8", "replace"),
+                "headers": {},
+                "status_code": status_code,
+                "response_time_ms": round(response_time * 1000, 2),
+                "simulated_delay_ms": round(delay * 1000, 2),
+                "timestamp": datetime.fromtimestamp(timestamp).isoformat(),
+                "_ts": timestamp,
+                "request_body": None,
+                "response_body": None
+            })
+        
+        # Drop records the worker overwrote while we were reading
+        _, after, _ = HEADER.unpack_from(buf, base)
+        overwritten = after - self.ring_size + 1 - first
+        if overwritten > 0:
+            records = records[overwritten:]
+        return records, index
+    
+    @staticmethod
+    def _merge(records: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Order records from several workers by time"""
+        records.sort(key=lambda req: req["_ts"])
+        for req in records:
+            del req["_ts"]
+        return records
+    
+    def get_recent_requests(self, limit: Optional[int] = None) -> List[Dict[str, Any]]:
+        """Merge the recent-request rings of all workers, oldest first"""
+        merged = []
+        for worker_id in range(self.workers):
+            merged.extend(self._read_worker(worker_id)[0])
+        merged = self._merge(merged)
+        if limit:
+            return merged[-limit:]
+        return merged
+    
+    def since(self, cursor: Optional[str] = None) -> Tuple[List[Dict[str, Any]], str]:
+        """Get requests recorded after ``cursor`` and the cursor for the next call
+        
+        The cursor lists each worker's ring index, e.g. ``"120,98,131"``.
+        """
+        starts = [0] * self.workers
+        if cursor:
+            parts = cursor.split(",")
+            if len(parts) == self.workers and all(part.isdigit() for part in parts):
+                starts = [int(part) for part in parts]
+        
+        merged = []
+        indexes = []
+        for worker_id in range(self.workers):
+            records, index = self._read_worker(worker_id, starts[worker_id])
+            merged.extend(records)
+            indexes.append(str(index))
+        return self._merge(merged), ",".join(indexes)
+    
+    def close(self):
+        """Detach from (and, in the owning process, free) the shared block"""
+        self.shm.close()
+        if self._owner:
+            self.shm.unlink()
+
+def _worker_main(worker_id: int, config_file: str, config_data: Dict[str, Any],
+                 templates: Dict[str, Dict[str, Any]], sockets: List[socket.socket],
+                 metrics_name: str, ring_size: int, workers: int, commands,
+                 share_directory: Optional[str] = None, peers: Optional[List[Any]] = None):
+    """Entry point of a worker process"""
+    import uvicorn
+    
+    from .config import Config
+    from .server_engine import ServerEngine
+    
+    config = Config(config_file)
+    config.data = config_data
+    config.publish_settings()
+    
+    engine = ServerEngine(config)
+    engine.attach_shared_metrics(SharedMetrics(workers, ring_size, name=metrics_name), worker_id)
+    # Give each worker its own reproducible stream rather than N identical ones
+    seed = config.settings.seed
+    if seed is not None:
+        engine.reseed(seed + worker_id)
+    for template_name, template_data in templates.items():
+        engine.load_template(template_name, template_data)
+    
+    # Each worker has its own clients, so broadcasts are relayed to the others
+    def relay_broadcast(message):
+        for queue in peers or ():
+            queue.put(("websocket_broadcast", message))
+    
+    engine.websocket_relay = relay_broadcast
+    engine.start_time = time.time()
+    
+    server = uvicorn.Server(uvicorn.Config(engine.app, log_level="warning"))
+    
+    def command_loop():
+        while True:
+            command, *args = commands.get()
+            if command == "stop":
+                server.should_exit = True
+                return
+            if command == "load_template":
+                engine.load_template(*args)
+            elif command == "unload_template":
+                engine.unload_template(*args)
+            elif command == "clear_templates":
+                engine.clear_templates()
+            elif command == "update_config":
+                config.update(*args, save=False)
+            elif command == "websocket_broadcast":
+                engine.websocket_hub.broadcast_threadsafe(*args)
+    
+    threading.Thread(target=command_loop, daemon=True).start()
+    engine.open_journal(worker_id, workers)
+    engine.performance_monitor.start()
+    if share_directory:
+        engine.metrics_exporter.share(share_directory, worker_id)
+    try:
+        server.run(sockets=sockets)
+    finally:
+        engine.metrics_exporter.stop_sharing()
+        engine.performance_monitor.stop()
+        engine.close_journal()
+
+class WorkerPool:
+    """Runs N server processes sharing one listening socket"""
+    
+    def __init__(self, config, workers: int, templates: Dict[str, Dict[str, Any]]):
+        self.config = config
+        self.workers = workers
+        self.templates = templates
+        self.ring_size = config.settings.max_log_entries
+        self.metrics: Optional[SharedMetrics] = None
+        self.socket: Optional[socket.socket] = None
+        self.processes: List[Any] = []
+        self.command_queues: List[Any] = []
+        # Workers publish their Prometheus samples here for each other to merge
+        self.share_directory: Optional[str] = None
+    
+    def _bind_socket(self) -> socket.socket:
+        """Bind the listening socket once in the parent so workers share it"""
+        host = self.config.settings.host
+        port = self.config.settings.port
+        family = socket.AF_INET6 if ":" in host else socket.AF_INET
+        # An explicit IPPROTO_TCP, as asyncio only sets TCP_NODELAY on accepted
+        # connections of sockets whose proto says TCP
+        sock = socket.socket(family, socket.SOCK_STREAM, socket.IPPROTO_TCP)
+        sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        sock.bind((host, port))
+        sock.set_inheritable(True)
+        return sock
+    
+    def start(self):
+        """Bind the socket and spawn the worker processes"""
+        self.socket = self._bind_socket()
+        self.metrics = SharedMetrics(self.workers, self.ring_size)
+        self.share_directory = tempfile.mkdtemp(prefix="simuserver_metrics_")
+        
+        self.command_queues = [spawn.Queue() for _ in range(self.workers)]
+        for worker_id, commands in enumerate(self.command_queues):
+            process = spawn.Process(
+                target=_worker_main,
+                kwargs={
+                    "worker_id": worker_id,
+                    "config_file": str(self.config.config_file),
+                    "config_data": self.config.data,
+                    "templates": dict(self.templates),
+                    "sockets": [self.socket],
+                    "metrics_name": self.metrics.name,
+                    "ring_size": self.ring_size,
+                    "workers": self.workers,
+                    "commands": commands,
+                    "share_directory": self.share_directory,
+                    "peers": [queue for queue in self.command_queues if queue is not commands]
+                },
+                daemon=True
+            )
+            process.start()
+            self.processes.append(process)
+    
+    def broadcast(self, command: str, *args):
+        """Send a command to every worker"""
+        for commands in self.command_queues:
+            commands.put((command, *args))
+    
+    def alive(self) -> bool:
+        """Whether any worker process is still running"""
+        return any(process.is_alive() for process in self.processes)
+    
+    def stop(self, timeout: float = 5.0):
+        """Ask workers to exit, then release the socket and shared memory"""
+        self.broadcast("stop")
+        deadline = time.time() + timeout
+        for process in self.processes:
+            process.join(timeout=max(0.1, deadline - time.time()))
+            if process.is_alive():
+                process.terminate()
+        self.processes.clear()
+        self.command_queues.clear()
+        
+        if self.socket:
+            self.socket.close()
+            self.socket = None
+        if self.metrics:
+            self.metrics.close()
+            self.metrics = None
+        if self.share_directory:
+            shutil.rmtree(self.share_directory, ignore_errors=True)
+            self.share_directory = None
\ No newline at end of file
@@ -188,9 +188,11 @@ class APISimulatorTab:
         
         template_data = self.template_manager.get_template(template_name)
         if template_data:
-            self.server_engine.load_template(template_name, template_data)
-            self._update_active_templates()
-            self.log_callback(f"📋 Loaded template: {template_name}")
+            if self.server_engine.load_template(template_name, template_data):
+                self._update_active_templates()
+                self.log_callback(f"📋 Loaded template: {template_name}")
+            else:
+                messagebox.showerror("Error", f"Failed to load template: {template_name} (see logs)")
         else:
             messagebox.showerror("Error", f"Failed to load template: {template_name}")
     
@@ -211,9 +213,11 @@ class APISimulatorTab:
             template_name = template_data.get('name', Path(file_path).stem)
             
             if self.server_engine:
-                self.server_engine.load_template(template_name, template_data)
-                self._update_active_templates()
-                self.log_callback(f"📂 Loaded custom template: {template_name}")
+                if self.server_engine.load_template(template_name, template_data):
+                    self._update_active_templates()
+                    self.log_callback(f"📂 Loaded custom template: {template_name}")
+                else:
+                    messagebox.showerror("Error", f"Failed to load custom template: {template_name} (see logs)")
             else:
                 messagebox.showwarning("Warning", "Server engine not initialized")
                 
@@ -223,12 +227,18 @@ class APISimulatorTab:
     def _clear_all_templates(self):
         """Clear all active templates"""
         if messagebox.askyesno("Confirm", "Clear all active templates?"):
-            # This would require server restart in a real implementation
-            # For now, just clear the display
-            for widget in self.active_list.winfo_children():
-                widget.destroy()
+            # Routes are swapped out live; no server restart needed
+            if self.server_engine:
+                self.server_engine.clear_templates()
+            self._update_active_templates()
             
-            self.log_callback("🗑️ All templates cleared (restart server to apply)")
+            self.log_callback("🗑️ All templates cleared")
+    
+    def _unload_template(self, template_name: str):
+        """Unload a single active template"""
+        if self.server_engine and self.server_engine.unload_template(template_name):
+            self._update_active_templates()
+            self.log_callback(f"🗑️ Unloaded template: {template_name}")
     
     def _update_active_templates(self):
         """Update the active templates display"""
@@ -251,6 +261,15 @@ class APISimulatorTab:
                 # Status indicator
                 status_label = ctk.CTkLabel(template_frame, text="🟢 Active", text_color="green")
                 status_label.grid(row=0, column=1, padx=10, pady=5)
+                
+                # Unload button
+                unload_button = ctk.CTkButton(
+                    template_frame,
+                    text="Unload",
+                    command=lambda name=template_name: self._unload_template(name),
+                    width=70
+                )
+                unload_button.grid(row=0, column=2, padx=10, pady=5)
     
     def _apply_settings(self):
         """Apply simulation settings"""
@@ -261,8 +280,11 @@ class APISimulatorTab:
             if error_rate < 0.0 or error_rate > 1.0:
                 raise ValueError("Error rate must be between 0.0 and 1.0")
             
-            self.config.set("simulation.default_delay_ms", delay)
-            self.config.set("simulation.error_rate", error_rate)
+            # Both values go live in one snapshot
+            self.config.update({
+                "simulation.default_delay_ms": delay,
+                "simulation.error_rate": error_rate
+            })
             
             self.log_callback(f"⚙️ Settings applied: {delay}ms delay, {error_rate} error rate")
             
@@ -4,8 +4,12 @@ Logs tab for SimuServer GUI
 
 import tkinter as tk
 import customtkinter as ctk
+from collections import deque
 from datetime import datetime
-from typing import List
+from typing import List, Tuple
+
+# Pause after the last keystroke before the filter runs
+FILTER_DELAY_MS = 150
 
 class LogsTab:
     """Logs tab for displaying server and application logs"""
@@ -13,8 +17,13 @@ class LogsTab:
     def __init__(self, parent, config):
         self.parent = parent
         self.config = config
-        self.log_entries: List[str] = []
         self.max_entries = config.get("logging.max_entries", 1000)
+        # Entries, their lowercase form and whether each is shown, kept in step
+        self.log_entries: deque = deque(maxlen=self.max_entries)
+        self.lower_entries: deque = deque(maxlen=self.max_entries)
+        self.shown: deque = deque(maxlen=self.max_entries)
+        self.filter_text = ""
+        self.filter_job = None
         self.auto_scroll = config.get("logging.auto_scroll", True)
         
         # Configure grid
@@ -102,50 +111,88 @@ class LogsTab:
     
     def add_log_entry(self, message: str):
         """Add a new log entry"""
-        timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-        log_entry = f"[{timestamp}] {message}"
-        
-        # Add to internal list
-        self.log_entries.append(log_entry)
-        
-        # Limit entries
-        if len(self.log_entries) > self.max_entries:
-            self.log_entries = self.log_entries[-self.max_entries:]
-            self._refresh_display()
-        else:
-            # Just append to display
-            self.log_text.insert("end", log_entry + "\n")
-            
-            # Auto-scroll if enabled
-            if self.auto_scroll:
-                self.log_text.see("end")
+        self.add_log_entries([(datetime.now().timestamp(), message)])
+    
+    def add_log_entries(self, entries: List[Tuple[float, str]]):
+        """Add a batch of (timestamp, message) entries with a single widget update"""
+        if not entries:
+            return
+        
+        # Older entries of an oversized batch would be trimmed straight away
+        entries = entries[-self.max_entries:]
+        # One entry per Text line, so head-trimming can count lines
+        new_entries = [
+            f"[{datetime.fromtimestamp(timestamp).strftime('%Y-%m-%d %H:%M:%S')}] {message}".replace("\n", " ")
+            for timestamp, message in entries
+        ]
+        new_lower = [entry.lower() for entry in new_entries]
+        new_shown = [not self.filter_text or self.filter_text in entry for entry in new_lower]
+        
+        # Trim the head of the Text widget by the shown lines the deques are about to drop
+        evicted = len(self.log_entries) + len(new_entries) - self.max_entries
+        if evicted > 0:
+            trimmed_lines = sum(1 for _, shown in zip(range(evicted), self.shown) if shown)
+            if trimmed_lines:
+                self.log_text.delete("1.0", f"{trimmed_lines + 1}.0")
+        
+        self.log_entries.extend(new_entries)
+        self.lower_entries.extend(new_lower)
+        self.shown.extend(new_shown)
+        
+        # Append the new lines in one insert
+        visible = [entry for entry, shown in zip(new_entries, new_shown) if shown]
+        if visible:
+            self.log_text.insert("end", "\n".join(visible) + "\n")
+        
+        # Auto-scroll if enabled
+        if self.auto_scroll:
+            self.log_text.see("end")
         
         # Update entry count
         self._update_entry_count()
     
     def _refresh_display(self):
         """Refresh the entire log display"""
+        previous = self.filter_text
         filter_text = self.filter_entry.get().lower()
+        self.filter_text = filter_text
+        
+        # Typing more characters can only hide lines, so test just the shown ones
+        narrowing = previous in filter_text
+        self.shown = deque(
+            (
+                (was_shown or not narrowing) and (not filter_text or filter_text in lower)
+                for lower, was_shown in zip(self.lower_entries, self.shown)
+            ),
+            maxlen=self.max_entries
+        )
         
-        # Clear display
+        # Rebuild the display with a single insert
         self.log_text.delete("1.0", "end")
-        
-        # Add filtered entries
-        for entry in self.log_entries:
-            if not filter_text or filter_text in entry.lower():
-                self.log_text.insert("end", entry + "\n")
+        visible = [entry for entry, shown in zip(self.log_entries, self.shown) if shown]
+        if visible:
+            self.log_text.insert("end", "\n".join(visible) + "\n")
         
         # Auto-scroll if enabled
         if self.auto_scroll:
             self.log_text.see("end")
     
     def _filter_logs(self, event=None):
-        """Filter logs based on search text"""
+        """Filter logs once typing pauses"""
+        if self.filter_job is not None:
+            self.parent.after_cancel(self.filter_job)
+        self.filter_job = self.parent.after(FILTER_DELAY_MS, self._run_filter)
+    
+    def _run_filter(self):
+        """Apply the filter text"""
+        self.filter_job = None
         self._refresh_display()
     
     def _clear_logs(self):
         """Clear all log entries"""
         self.log_entries.clear()
+        self.lower_entries.clear()
+        self.shown.clear()
         self.log_text.delete("1.0", "end")
         self._update_entry_count()
         
@@ -188,7 +235,7 @@ class LogsTab:
     
     def get_logs(self) -> List[str]:
         """Get all log entries"""
-        return self.log_entries.copy()
+        return list(self.log_entries)
     
     def clear_logs(self):
         """Public method to clear logs"""
@@ -10,18 +10,28 @@ import time
 from pathlib import Path
 
 from ..core.server_engine import ServerEngine
+from ..core.log_channel import LogChannel
 from .performance_tab import PerformanceTab
 from .api_simulator_tab import APISimulatorTab
 from .logs_tab import LogsTab
 from .storage_tab import StorageTab
 from .request_inspector_tab import RequestInspectorTab
 
+# Log drain tick, and above how many messages per tick lines are sampled
+LOG_DRAIN_INTERVAL_MS = 100
+LOG_COALESCE_THRESHOLD = 50
+LOG_SAMPLE_LINES = 10
+# How often the request inspector fetches newly logged requests
+REQUEST_POLL_INTERVAL_MS = 1000
+
 class SimuServerGUI:
     """Main GUI application for SimuServer"""
     
     def __init__(self, config):
         self.config = config
         self.server_engine = None
+        # Server threads only queue log messages; the Tk thread drains them
+        self.log_channel = LogChannel()
         
         # Create main window
         self.root = ctk.CTk()
@@ -34,6 +44,12 @@ class SimuServerGUI:
         
         self._create_widgets()
         self._setup_server()
+        self.root.after(LOG_DRAIN_INTERVAL_MS, self._drain_logs)
+        self.root.after(REQUEST_POLL_INTERVAL_MS, self._poll_requests)
+        
+        # Start serving as soon as the main loop runs if configured
+        if config.get("server.auto_start", False):
+            self.root.after(0, self._start_server)
     
     def _create_widgets(self):
         """Create all GUI widgets"""
@@ -197,10 +213,6 @@ class SimuServerGUI:
                         # Update performance tab
                         metrics = self.server_engine.get_performance_data()
                         self.performance_tab.update_metrics(metrics)
-                        
-                        # Update request inspector
-                        requests = self.server_engine.get_request_history()
-                        self.request_inspector_tab.update_requests(requests)
                     
                     time.sleep(1.0)
                 except Exception as e:
@@ -215,13 +227,41 @@ class SimuServerGUI:
         self.performance_update_running = False
     
     def _log_message(self, message: str):
-        """Log a message to the status bar and logs tab"""
-        # Update status bar
-        self.status_bar.configure(text=message)
+        """Queue a message for the status bar and logs tab; safe from any thread"""
+        self.log_channel.put(message)
+    
+    def _drain_logs(self):
+        """Show queued log messages in one batch per tick"""
+        try:
+            batch, dropped = self.log_channel.drain()
+            if batch or dropped:
+                entries = batch
+                if len(batch) > LOG_COALESCE_THRESHOLD:
+                    # Too many to show: keep an even sample and summarize the burst
+                    step = len(batch) // LOG_SAMPLE_LINES
+                    entries = batch[::step][:LOG_SAMPLE_LINES]
+                    span = max(batch[-1][0] - batch[0][0], LOG_DRAIN_INTERVAL_MS / 1000)
+                    entries.append((batch[-1][0], f"⚡ {len(batch)} messages in {span:.1f}s "
+                                                  f"({len(batch) / span:.0f}/s), showing {len(entries)}"))
+                if dropped:
+                    entries.append((time.time(), f"⚠️ {dropped} log messages dropped under load"))
+                
+                self.status_bar.configure(text=entries[-1][1])
+                self.logs_tab.add_log_entries(entries)
+        except Exception as e:
+            print(f"Log drain error: {e}")
+        
+        self.root.after(LOG_DRAIN_INTERVAL_MS, self._drain_logs)
+    
+    def _poll_requests(self):
+        """Show newly logged requests in the inspector; runs on the Tk thread"""
+        try:
+            if self.server_engine and self.server_engine.is_running:
+                self.request_inspector_tab.poll_requests()
+        except Exception as e:
+            print(f"Request poll error: {e}")
         
-        # Add to logs tab
-        if hasattr(self, 'logs_tab'):
-            self.logs_tab.add_log_entry(message)
+        self.root.after(REQUEST_POLL_INTERVAL_MS, self._poll_requests)
     
     def run(self):
         """Run the GUI application"""
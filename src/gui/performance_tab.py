@@ -110,6 +110,34 @@ class PerformanceTab:
         self.memory_available_label = ctk.CTkLabel(left_metrics, text="Available: - MB")
         self.memory_available_label.pack(anchor="w", padx=20, pady=2)
         
+        # SimuServer's own process
+        ctk.CTkLabel(left_metrics, text="SimuServer Process", font=ctk.CTkFont(size=14, weight="bold")).pack(
+            anchor="w", padx=10, pady=(20, 5)
+        )
+        
+        self.process_memory_label = ctk.CTkLabel(left_metrics, text="RSS: - MB")
+        self.process_memory_label.pack(anchor="w", padx=20, pady=2)
+        
+        self.process_cpu_label = ctk.CTkLabel(left_metrics, text="CPU: -%")
+        self.process_cpu_label.pack(anchor="w", padx=20, pady=2)
+        
+        self.process_resources_label = ctk.CTkLabel(left_metrics, text="Threads: - | FDs: - | Sockets: -")
+        self.process_resources_label.pack(anchor="w", padx=20, pady=2)
+        
+        # Event loop health
+        ctk.CTkLabel(left_metrics, text="Event Loop", font=ctk.CTkFont(size=14, weight="bold")).pack(
+            anchor="w", padx=10, pady=(20, 5)
+        )
+        
+        self.loop_lag_label = ctk.CTkLabel(left_metrics, text="Lag: -")
+        self.loop_lag_label.pack(anchor="w", padx=20, pady=2)
+        
+        self.slow_callbacks_label = ctk.CTkLabel(left_metrics, text="Slow callbacks: 0")
+        self.slow_callbacks_label.pack(anchor="w", padx=20, pady=2)
+        
+        self.gc_label = ctk.CTkLabel(left_metrics, text="GC: -")
+        self.gc_label.pack(anchor="w", padx=20, pady=2)
+        
         # Right metrics column
         right_metrics = ctk.CTkScrollableFrame(metrics_frame)
         right_metrics.grid(row=1, column=1, sticky="nsew", padx=(5, 10), pady=(0, 10))
@@ -168,6 +196,21 @@ class PerformanceTab:
         # Last updated label
         self.last_updated_label = ctk.CTkLabel(control_frame, text="Last updated: Never")
         self.last_updated_label.pack(side="right", padx=10, pady=10)
+        
+        # Route latency
+        latency_frame = ctk.CTkFrame(self.parent)
+        latency_frame.grid(row=3, column=0, columnspan=2, sticky="nsew", padx=10, pady=(0, 10))
+        latency_frame.grid_columnconfigure(0, weight=1)
+        
+        ctk.CTkLabel(latency_frame, text="Route Latency (ms)", font=ctk.CTkFont(size=14, weight="bold")).grid(
+            row=0, column=0, sticky="w", padx=10, pady=(10, 5)
+        )
+        
+        self.route_latency_text = ctk.CTkTextbox(
+            latency_frame, height=140, font=ctk.CTkFont(family="Consolas", size=11)
+        )
+        self.route_latency_text.grid(row=1, column=0, sticky="nsew", padx=10, pady=(0, 10))
+        self.route_latency_text.insert("1.0", "No requests yet")
     
     def update_metrics(self, metrics):
         """Update the performance metrics display"""
@@ -197,13 +240,18 @@ class PerformanceTab:
             self.memory_used_label.configure(text=f"Used: {memory_used:.0f} MB")
             self.memory_available_label.configure(text=f"Available: {memory_available:.0f} MB")
             
+            # Update process and event loop health
+            self._update_process(metrics.get("process", {}), metrics.get("event_loop", {}))
+            
             # Update Network/Server info
-            rps = metrics.get("network", {}).get("requests_per_second", 0)
-            self.requests_per_second_label.configure(text=f"Requests/sec: {rps}")
+            rates = metrics.get("network", {}).get("request_rates", {})
+            self.requests_per_second_label.configure(
+                text="Requests/sec: " + " / ".join(f"{rates.get(w, 0)} ({w})" for w in ("1s", "10s", "60s"))
+            )
             
             # Get additional server info if available
             if self.server_engine:
-                total_requests = self.server_engine.request_logger.get_total_requests()
+                total_requests = self.server_engine.get_total_requests()
                 self.total_requests_label.configure(text=f"Total Requests: {total_requests}")
                 
                 # Calculate uptime
@@ -213,8 +261,10 @@ class PerformanceTab:
                     self.uptime_label.configure(text=f"Uptime: {uptime_str}")
                 
                 # WebSocket connections
-                ws_count = len(self.server_engine.websocket_connections)
+                ws_count = self.server_engine.get_websocket_connections()
                 self.websocket_connections_label.configure(text=f"WebSocket Connections: {ws_count}")
+                
+                self._update_route_latency(self.server_engine.get_route_latency())
             
             # Update Disk info
             disk_percent = metrics.get("disk", {}).get("percent", 0)
@@ -231,6 +281,53 @@ class PerformanceTab:
         except Exception as e:
             print(f"Error updating metrics: {e}")
     
+    def _update_process(self, process, event_loop):
+        """Show SimuServer's own resource use and event loop health"""
+        if process:
+            self.process_memory_label.configure(text=f"RSS: {process['rss_mb']:.0f} MB")
+            self.process_cpu_label.configure(
+                text=f"CPU: {process['cpu_percent']:.1f}% ({process['cpu_seconds']:.1f}s total)"
+            )
+            sockets = process["sockets"] if process["sockets"] >= 0 else "n/a"
+            self.process_resources_label.configure(
+                text=f"Threads: {process['threads']} | FDs: {process['fds']} | Sockets: {sockets}"
+            )
+        
+        if not event_loop.get("attached"):
+            self.loop_lag_label.configure(text="Lag: not measured")
+        else:
+            lag = event_loop["lag_ms"]
+            self.loop_lag_label.configure(
+                text=f"Lag: p50 {lag['p50']:.1f} / p99 {lag['p99']:.1f} / max {lag['max']:.1f} ms"
+            )
+        if event_loop:
+            text = f"Slow callbacks: {event_loop['slow_callbacks']}"
+            recent = event_loop["recent_slow_callbacks"]
+            if recent:
+                last = recent[-1]
+                text += f" (last: {last['route'] or last['location']})"
+            self.slow_callbacks_label.configure(text=text)
+            
+            gc_stats = event_loop["gc"]
+            self.gc_label.configure(
+                text=f"GC: {sum(gc_stats['collections'])} runs, {gc_stats['pause_total_ms']:.0f} ms total, "
+                     f"max {gc_stats['pause_max_ms']:.1f} ms"
+            )
+    
+    def _update_route_latency(self, route_latency):
+        """Show per-route percentiles for the 10s, 1m and whole-run windows"""
+        if not route_latency:
+            text = "No requests yet"
+        else:
+            text = f"{'Route':<36}{'10s n':>8}{'10s p50':>9}{'10s p99':>9}{'1m p95':>9}{'1m p99':>9}{'run p99':>9}\n"
+            for route, windows in route_latency.items():
+                recent, minute, run = windows["10s"], windows["1m"], windows["run"]
+                text += (f"{route[:35]:<36}{recent['count']:>8}{recent['p50']:>9.2f}{recent['p99']:>9.2f}"
+                         f"{minute['p95']:>9.2f}{minute['p99']:>9.2f}{run['p99']:>9.2f}\n")
+        
+        self.route_latency_text.delete("1.0", "end")
+        self.route_latency_text.insert("1.0", text)
+    
     def _format_uptime(self, seconds):
         """Format uptime in a readable format"""
         if seconds < 60:
@@ -2,11 +2,17 @@
 Request Inspector tab for SimuServer GUI
 """
 
+import bisect
 import tkinter as tk
 import customtkinter as ctk
 import json
 from datetime import datetime
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional, Tuple
+
+# Rows kept alive in the request list; they are rebound as the view scrolls
+ROW_POOL_SIZE = 15
+# Pause after the last keystroke before the filter runs
+FILTER_DELAY_MS = 150
 
 class RequestInspectorTab:
     """Request Inspector tab for viewing and analyzing API requests/responses"""
@@ -16,8 +22,20 @@ class RequestInspectorTab:
         self.config = config
         self.server_engine = None
         self.requests_data: List[Dict[str, Any]] = []
+        self.max_requests = config.get("logging.max_entries", 1000)
+        self.request_cursor = None
         self.selected_request = None
         
+        # Virtual list state: lowercase search keys parallel to requests_data,
+        # and the sequence numbers (trimmed + index) of requests passing the filters
+        self.search_keys: List[str] = []
+        self.trimmed = 0
+        self.filtered: List[int] = []
+        self.filter_state: Optional[Tuple[str, str, str]] = ("", "All", "All")
+        self.filter_job = None
+        self.view_offset = 0
+        self.follow_tail = True
+        
         # Configure grid
         parent.grid_columnconfigure(0, weight=1)
         parent.grid_rowconfigure(1, weight=1)
@@ -66,6 +84,14 @@ class RequestInspectorTab:
         )
         self.export_button.pack(side="left", padx=5)
         
+        self.analytics_button = ctk.CTkButton(
+            button_frame,
+            text="Analyze",
+            command=self._show_analytics,
+            width=80
+        )
+        self.analytics_button.pack(side="left", padx=5)
+        
         # Main content frame with splitter
         content_frame = ctk.CTkFrame(self.parent)
         content_frame.grid(row=1, column=0, sticky="nsew", padx=10, pady=(0, 10))
@@ -124,9 +150,17 @@ class RequestInspectorTab:
         )
         self.status_dropdown.pack(side="left", padx=2)
         
-        # Request list
-        self.request_list = ctk.CTkScrollableFrame(left_panel)
+        # Request list: a fixed pool of rows over a virtual list of requests
+        self.request_list = ctk.CTkFrame(left_panel)
         self.request_list.grid(row=1, column=0, sticky="nsew", padx=5, pady=5)
+        self.request_list.grid_columnconfigure(0, weight=1)
+        self._bind_mousewheel(self.request_list)
+        
+        self.list_scrollbar = ctk.CTkScrollbar(self.request_list, command=self._on_scrollbar)
+        self.list_scrollbar.grid(row=0, column=1, rowspan=ROW_POOL_SIZE, sticky="ns")
+        
+        self.row_requests: List[Optional[Dict[str, Any]]] = [None] * ROW_POOL_SIZE
+        self.row_widgets = [self._create_row(i) for i in range(ROW_POOL_SIZE)]
         
         # Right panel - Request details
         right_panel = ctk.CTkFrame(content_frame)
@@ -169,6 +203,11 @@ class RequestInspectorTab:
         self.response_text = ctk.CTkTextbox(response_tab, font=ctk.CTkFont(family="Consolas", size=11))
         self.response_text.pack(fill="both", expand=True, padx=10, pady=10)
         
+        # Analytics tab: report over the whole request log, not the selection
+        analytics_tab = self.details_tabview.add("Analytics")
+        self.analytics_text = ctk.CTkTextbox(analytics_tab, font=ctk.CTkFont(family="Consolas", size=11))
+        self.analytics_text.pack(fill="both", expand=True, padx=10, pady=10)
+        
         # Status frame
         status_frame = ctk.CTkFrame(self.parent)
         status_frame.grid(row=2, column=0, sticky="ew", padx=10, pady=(0, 10))
@@ -182,132 +221,232 @@ class RequestInspectorTab:
     
     def update_requests(self, requests: List[Dict[str, Any]]):
         """Update the requests list"""
-        self.requests_data = requests
-        self._display_requests()
+        self.requests_data = list(requests)
+        self.search_keys = [self._search_key(request) for request in self.requests_data]
+        self.trimmed = 0
+        self.filter_state = None
+        self.follow_tail = True
+        self._apply_filters()
         self._update_request_count()
     
-    def _display_requests(self):
-        """Display requests in the list"""
-        # Clear existing widgets
-        for widget in self.request_list.winfo_children():
-            widget.destroy()
-        
-        # Apply filters
-        filtered_requests = self._get_filtered_requests()
-        
-        # Display requests
-        for i, request in enumerate(filtered_requests[-50:]):  # Show last 50
-            self._create_request_item(i, request)
-    
-    def _get_filtered_requests(self) -> List[Dict[str, Any]]:
-        """Get filtered requests based on current filters"""
-        requests = self.requests_data
-        
-        # Filter by search text
-        filter_text = self.filter_var.get().lower()
-        if filter_text:
-            requests = [
-                req for req in requests
-                if (filter_text in req.get("method", "").lower() or
-                    filter_text in req.get("url", "").lower() or
-                    filter_text in str(req.get("status_code", "")))
-            ]
-        
-        # Filter by method
-        method_filter = self.method_var.get()
-        if method_filter != "All":
-            requests = [req for req in requests if req.get("method", "").upper() == method_filter]
-        
-        # Filter by status
-        status_filter = self.status_var.get()
-        if status_filter != "All":
-            if status_filter == "2xx":
-                requests = [req for req in requests if 200 <= req.get("status_code", 0) < 300]
-            elif status_filter == "3xx":
-                requests = [req for req in requests if 300 <= req.get("status_code", 0) < 400]
-            elif status_filter == "4xx":
-                requests = [req for req in requests if 400 <= req.get("status_code", 0) < 500]
-            elif status_filter == "5xx":
-                requests = [req for req in requests if 500 <= req.get("status_code", 0) < 600]
-        
-        return requests
-    
-    def _create_request_item(self, index: int, request: Dict[str, Any]):
-        """Create a request item widget"""
-        item_frame = ctk.CTkFrame(self.request_list)
-        item_frame.pack(fill="x", padx=2, pady=2)
-        item_frame.grid_columnconfigure(1, weight=1)
+    def poll_requests(self):
+        """Fetch only the requests logged since the last poll; call on the Tk thread"""
+        if not self.server_engine:
+            return
         
-        # Status color
-        status_code = request.get("status_code", 0)
-        if 200 <= status_code < 300:
-            status_color = "green"
-        elif 300 <= status_code < 400:
-            status_color = "orange"
-        elif 400 <= status_code < 500:
-            status_color = "red"
-        elif 500 <= status_code < 600:
-            status_color = "darkred"
+        new_requests, self.request_cursor = self.server_engine.get_requests_since(self.request_cursor)
+        if not new_requests:
+            return
+        
+        self._append_requests(new_requests)
+        self._render_rows()
+        self._update_request_count()
+    
+    def _append_requests(self, new_requests: List[Dict[str, Any]]):
+        """Add new requests, filtering only the new ones"""
+        start = self.trimmed + len(self.requests_data)
+        keys = [self._search_key(request) for request in new_requests]
+        self.requests_data.extend(new_requests)
+        self.search_keys.extend(keys)
+        
+        state = self.filter_state
+        self.filtered.extend(
+            start + i for i, (request, key) in enumerate(zip(new_requests, keys))
+            if self._matches(state, request, key)
+        )
+        
+        # Keep the history bounded; filtered holds sequence numbers so it only loses its head
+        overflow = len(self.requests_data) - self.max_requests
+        if overflow > 0:
+            del self.requests_data[:overflow]
+            del self.search_keys[:overflow]
+            self.trimmed += overflow
+            cut = bisect.bisect_left(self.filtered, self.trimmed)
+            if cut:
+                del self.filtered[:cut]
+                self.view_offset = max(0, self.view_offset - cut)
+    
+    @staticmethod
+    def _search_key(request: Dict[str, Any]) -> str:
+        """Lowercase text the filter box searches, computed once per request"""
+        return f"{request.get('method', '')}\n{request.get('url', '')}\n{request.get('status_code', '')}".lower()
+    
+    def _current_filter(self) -> Tuple[str, str, str]:
+        """Current (search text, method, status class) filter"""
+        return self.filter_var.get().lower(), self.method_var.get(), self.status_var.get()
+    
+    @staticmethod
+    def _matches(state: Tuple[str, str, str], request: Dict[str, Any], key: str) -> bool:
+        """Check one request against a filter"""
+        text, method, status = state
+        if text and text not in key:
+            return False
+        if method != "All" and request.get("method", "").upper() != method:
+            return False
+        if status != "All":
+            low = int(status[0]) * 100
+            if not low <= request.get("status_code", 0) < low + 100:
+                return False
+        return True
+    
+    def _apply_filters(self):
+        """Rebuild the filtered list, narrowing the previous result when possible"""
+        state = self._current_filter()
+        previous = self.filter_state
+        base = self.trimmed
+        
+        # Typing more characters only removes matches, so rescan the current result
+        if previous is not None and state[1:] == previous[1:] and previous[0] in state[0]:
+            candidates = self.filtered
         else:
-            status_color = "gray"
+            candidates = range(base, base + len(self.requests_data))
+        
+        data = self.requests_data
+        keys = self.search_keys
+        self.filtered = [
+            seq for seq in candidates
+            if self._matches(state, data[seq - base], keys[seq - base])
+        ]
+        self.filter_state = state
+        self.follow_tail = True
+        self._render_rows()
+    
+    def _create_row(self, index: int) -> Dict[str, Any]:
+        """Create one pooled row; rows are rebound, never destroyed"""
+        item_frame = ctk.CTkFrame(self.request_list)
+        item_frame.grid(row=index, column=0, sticky="ew", padx=2, pady=2)
+        item_frame.grid_columnconfigure(1, weight=1)
         
         # Method and status
-        method_status = f"{request.get('method', 'GET')} {status_code}"
-        ctk.CTkLabel(
-            item_frame, 
-            text=method_status, 
-            font=ctk.CTkFont(weight="bold"),
-            text_color=status_color,
-            width=80
-        ).grid(row=0, column=0, padx=5, pady=5, sticky="w")
+        method_label = ctk.CTkLabel(item_frame, text="", font=ctk.CTkFont(weight="bold"), width=80)
+        method_label.grid(row=0, column=0, padx=5, pady=5, sticky="w")
         
         # URL (truncated)
-        url = request.get("url", "")
-        if len(url) > 40:
-            url = url[:37] + "..."
-        
-        url_label = ctk.CTkLabel(
-            item_frame, 
-            text=url, 
-            font=ctk.CTkFont(family="Consolas", size=10)
-        )
+        url_label = ctk.CTkLabel(item_frame, text="", font=ctk.CTkFont(family="Consolas", size=10))
         url_label.grid(row=0, column=1, padx=5, pady=5, sticky="w")
         
         # Response time
-        response_time = request.get("response_time_ms", 0)
-        time_label = ctk.CTkLabel(
-            item_frame, 
-            text=f"{response_time}ms",
-            font=ctk.CTkFont(size=10)
-        )
+        time_label = ctk.CTkLabel(item_frame, text="", font=ctk.CTkFont(size=10))
         time_label.grid(row=0, column=2, padx=5, pady=5, sticky="e")
         
         # Timestamp
-        timestamp = request.get("timestamp", "")
-        if timestamp:
-            try:
-                dt = datetime.fromisoformat(timestamp.replace('Z', '+00:00'))
-                time_str = dt.strftime("%H:%M:%S")
-            except:
-                time_str = timestamp[-8:]  # Last 8 chars
-        else:
-            time_str = ""
-        
-        time_label = ctk.CTkLabel(
-            item_frame, 
-            text=time_str,
-            font=ctk.CTkFont(size=10)
-        )
-        time_label.grid(row=1, column=0, columnspan=3, padx=5, pady=(0, 5), sticky="e")
+        stamp_label = ctk.CTkLabel(item_frame, text="", font=ctk.CTkFont(size=10))
+        stamp_label.grid(row=1, column=0, columnspan=3, padx=5, pady=(0, 5), sticky="e")
+        
+        # Click and wheel bindings are made once and look up the row's current request
+        for widget in (item_frame, method_label, url_label, time_label, stamp_label):
+            widget.bind("<Button-1>", lambda event, i=index: self._on_row_click(i))
+            self._bind_mousewheel(widget)
+        
+        item_frame.grid_remove()
+        return {
+            "frame": item_frame,
+            "method": method_label,
+            "url": url_label,
+            "time": time_label,
+            "stamp": stamp_label
+        }
+    
+    def _bind_row(self, index: int, request: Optional[Dict[str, Any]]):
+        """Show a request in a pooled row, or hide the row"""
+        row = self.row_widgets[index]
+        self.row_requests[index] = request
+        if request is None:
+            row["frame"].grid_remove()
+            return
         
-        # Click handler
-        def on_click(event, req=request):
-            self._select_request(req)
+        status_code = request.get("status_code", 0)
+        url = request.get("url", "")
+        if len(url) > 40:
+            url = url[:37] + "..."
         
-        # Bind click events
-        item_frame.bind("<Button-1>", on_click)
-        for child in item_frame.winfo_children():
-            child.bind("<Button-1>", on_click)
+        row["method"].configure(text=f"{request.get('method', 'GET')} {status_code}",
+                                text_color=self._status_color(status_code))
+        row["url"].configure(text=url)
+        row["time"].configure(text=f"{request.get('response_time_ms', 0)}ms")
+        row["stamp"].configure(text=self._format_time(request.get("timestamp", "")))
+        row["frame"].grid()
+    
+    @staticmethod
+    def _status_color(status_code: int) -> str:
+        """Color for a status code"""
+        if 200 <= status_code < 300:
+            return "green"
+        elif 300 <= status_code < 400:
+            return "orange"
+        elif 400 <= status_code < 500:
+            return "red"
+        elif 500 <= status_code < 600:
+            return "darkred"
+        return "gray"
+    
+    @staticmethod
+    def _format_time(timestamp: str) -> str:
+        """Format an ISO timestamp as HH:MM:SS"""
+        if not timestamp:
+            return ""
+        try:
+            dt = datetime.fromisoformat(timestamp.replace('Z', '+00:00'))
+            return dt.strftime("%H:%M:%S")
+        except ValueError:
+            return timestamp[-8:]  # Last 8 chars
+    
+    def _render_rows(self):
+        """Rebind the row pool to the visible slice of the filtered requests"""
+        total = len(self.filtered)
+        last_offset = max(0, total - ROW_POOL_SIZE)
+        if self.follow_tail:
+            self.view_offset = last_offset
+        self.view_offset = min(self.view_offset, last_offset)
+        
+        base = self.trimmed
+        for i in range(ROW_POOL_SIZE):
+            position = self.view_offset + i
+            request = self.requests_data[self.filtered[position] - base] if position < total else None
+            # Only touch widgets whose request changed
+            if request is not self.row_requests[i]:
+                self._bind_row(i, request)
+        
+        if total:
+            self.list_scrollbar.set(self.view_offset / total,
+                                    min(1.0, (self.view_offset + ROW_POOL_SIZE) / total))
+        else:
+            self.list_scrollbar.set(0.0, 1.0)
+    
+    def _scroll_to(self, offset: int):
+        """Scroll the list so the filtered request at offset is the top row"""
+        last_offset = max(0, len(self.filtered) - ROW_POOL_SIZE)
+        self.view_offset = max(0, min(offset, last_offset))
+        # Follow new requests only while scrolled to the bottom
+        self.follow_tail = self.view_offset >= last_offset
+        self._render_rows()
+    
+    def _on_scrollbar(self, *args):
+        """Handle scrollbar drags ("moveto") and steps ("scroll")"""
+        if args[0] == "moveto":
+            self._scroll_to(int(float(args[1]) * len(self.filtered)))
+        elif args[0] == "scroll":
+            step = int(args[1]) * (ROW_POOL_SIZE if args[2] == "pages" else 1)
+            self._scroll_to(self.view_offset + step)
+    
+    def _bind_mousewheel(self, widget):
+        """Scroll the virtual list with the mouse wheel over a widget"""
+        widget.bind("<MouseWheel>", self._on_mousewheel)
+        widget.bind("<Button-4>", self._on_mousewheel)
+        widget.bind("<Button-5>", self._on_mousewheel)
+    
+    def _on_mousewheel(self, event):
+        """Scroll three rows per wheel step"""
+        if getattr(event, "num", None) == 4 or getattr(event, "delta", 0) > 0:
+            self._scroll_to(self.view_offset - 3)
+        else:
+            self._scroll_to(self.view_offset + 3)
+    
+    def _on_row_click(self, index: int):
+        """Select the request currently shown in a row"""
+        request = self.row_requests[index]
+        if request is not None:
+            self._select_request(request)
     
     def _select_request(self, request: Dict[str, Any]):
         """Select and display request details"""
@@ -349,6 +488,7 @@ class RequestInspectorTab:
         overview += f"URL: {request.get('url', 'N/A')}\n"
         overview += f"Status Code: {request.get('status_code', 'N/A')}\n"
         overview += f"Response Time: {request.get('response_time_ms', 0)}ms\n"
+        overview += f"Simulated Delay: {request.get('simulated_delay_ms', 0)}ms\n"
         overview += f"Timestamp: {request.get('timestamp', 'N/A')}\n"
         
         return overview
@@ -365,26 +505,34 @@ class RequestInspectorTab:
         return formatted
     
     def _filter_requests(self, event=None):
-        """Apply filters and refresh display"""
-        self._display_requests()
+        """Apply filters once typing pauses"""
+        if self.filter_job is not None:
+            self.parent.after_cancel(self.filter_job)
+        self.filter_job = self.parent.after(FILTER_DELAY_MS, self._run_filter)
+    
+    def _run_filter(self):
+        """Apply the current filters and refresh the display"""
+        self.filter_job = None
+        self._apply_filters()
+        self._update_request_count()
     
     def _refresh_requests(self):
         """Refresh requests from server"""
         if self.server_engine:
-            requests = self.server_engine.get_request_history()
-            self.update_requests(requests)
+            self.request_cursor = None
+            self.update_requests([])
+            self.poll_requests()
     
     def _clear_requests(self):
         """Clear all requests"""
         if self.server_engine and self.server_engine.request_logger:
             self.server_engine.request_logger.clear_logs()
         
-        self.requests_data.clear()
-        self._display_requests()
-        self._update_request_count()
+        self.request_cursor = None
+        self.update_requests([])
         
         # Clear details
-        for textbox in [self.overview_text, self.headers_text, self.body_text, self.response_text]:
+        for textbox in [self.overview_text, self.headers_text, self.body_text, self.response_text, self.analytics_text]:
             textbox.delete("1.0", "end")
         
         self.selected_info_label.configure(text="No request selected")
@@ -421,10 +569,44 @@ class RequestInspectorTab:
         except Exception as e:
             tk.messagebox.showerror("Error", f"Failed to export requests: {str(e)}")
     
+    def _show_analytics(self):
+        """Show per-route percentiles and status counts for the whole request log"""
+        if not self.server_engine:
+            return
+        
+        try:
+            report = self._format_analytics(self.server_engine.get_analytics())
+        except Exception as e:
+            report = f"Failed to analyze requests: {str(e)}"
+        
+        self.analytics_text.delete("1.0", "end")
+        self.analytics_text.insert("1.0", report)
+        self.details_tabview.set("Analytics")
+    
+    def _format_analytics(self, summary: Dict[str, Any]) -> str:
+        """Format an analytics summary as a text table"""
+        if not summary["requests"]:
+            return "No requests logged yet"
+        
+        latency = summary["latency_ms"]
+        report = f"Requests: {summary['requests']}\n"
+        report += f"Latency: p50 {latency['p50']}ms  p95 {latency['p95']}ms  p99 {latency['p99']}ms\n\n"
+        
+        report += f"{'Route':<40}{'Count':>8}{'Errors':>8}{'p50':>10}{'p95':>10}{'p99':>10}\n"
+        for route in summary["by_route"]:
+            report += (f"{route['route'][:39]:<40}{route['count']:>8}{route['errors']:>8}"
+                       f"{route['p50']:>10.2f}{route['p95']:>10.2f}{route['p99']:>10.2f}\n")
+        
+        report += "\nStatus codes:\n"
+        for status, count in summary["by_status"].items():
+            report += f"  {status}: {count}\n"
+        
+        return report
+    
     def _update_request_count(self):
         """Update request count display"""
         count = len(self.requests_data)
-        filtered_count = len(self._get_filtered_requests())
+        filtered_count = len(self.filtered)
         
         if count == filtered_count:
             self.request_count_label.configure(text=f"Requests: {count}")
@@ -150,6 +150,16 @@ class StorageTab:
         )
         self.auto_create_checkbox.pack(anchor="w", padx=20, pady=10)
         
+        # Request journal setting
+        self.journal_var = ctk.BooleanVar(value=self.config.get("storage.journal_enabled", False))
+        self.journal_checkbox = ctk.CTkCheckBox(
+            left_info,
+            text="Journal requests to disk (applies on next server start)",
+            variable=self.journal_var,
+            command=self._toggle_journal
+        )
+        self.journal_checkbox.pack(anchor="w", padx=20, pady=(0, 10))
+        
         # Right column - File management
         right_info = ctk.CTkFrame(info_frame)
         right_info.grid(row=1, column=1, sticky="nsew", padx=(5, 10), pady=(0, 10))
@@ -397,12 +407,17 @@ class StorageTab:
             max_size = int(self.max_size_var.get())
             self.config.set("storage.max_file_size_mb", max_size)
             self.config.set("storage.auto_create", self.auto_create_var.get())
+            self.config.set("storage.journal_enabled", self.journal_var.get())
             
             messagebox.showinfo("Success", "Settings saved successfully")
             
         except ValueError:
             messagebox.showerror("Error", "Invalid max file size value")
     
+    def _toggle_journal(self):
+        """Save the journal setting on its own, without a confirmation dialog"""
+        self.config.set("storage.journal_enabled", self.journal_var.get())
+    
     def _format_bytes(self, bytes_value):
         """Format bytes in human readable format"""
         for unit in ['B', 'KB', 'MB', 'GB']: